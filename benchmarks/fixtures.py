@@ -0,0 +1,299 @@
+# coding: utf-8
+"""Local HTML fixtures which copy the DOM of Google Forms and Microsoft Forms that the form models depend on.
+
+Each fixture is parameterized by the number of questions and pages, and the question types (``"radio"``, ``"checkbox"``, ``"text"`` and ``"other"`` (radio buttons with the "Other" option)), and is served by :class:`FixtureServer` so that the forms can be answered without network access.
+
+For the browserless ``"google-http"`` form model, :func:`google_http_page` embeds the same questions as ``FB_PUBLIC_LOAD_DATA_``, and :class:`FixtureServer` records the fields posted to ``formResponse``.
+"""
+import html
+import http.server
+import json
+import threading
+from typing import Any, Dict, List, Tuple
+from urllib.parse import parse_qsl
+
+QUESTION_TYPES: List[str] = ["radio", "checkbox", "text", "other"]
+NUM_OPTIONS: int = 4
+#: ``fbzx`` (the response token) of :func:`google_load_data`.
+GOOGLE_FBZX: int = -1234567890
+
+PAGE_TEMPLATE: str = """<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8"><title>{title}</title></head>
+<body>
+{body}
+<script>{script}</script>
+</body>
+</html>
+"""
+
+GOOGLE_SCRIPT: str = """
+document.addEventListener("click", function (event) {
+    var label = event.target.closest("label");
+    if (label === null) { return; }
+    var toggle = label.querySelector("[role=radio], [role=checkbox]");
+    if (toggle.getAttribute("role") === "radio") {
+        label.parentNode.querySelectorAll("[role=radio]").forEach(function (e) {
+            e.setAttribute("aria-checked", "false");
+        });
+        toggle.setAttribute("aria-checked", "true");
+    } else {
+        toggle.setAttribute("aria-checked", String(toggle.getAttribute("aria-checked") !== "true"));
+    }
+    if (label.hasAttribute("data-other")) {
+        var other = label.parentNode.querySelector("input[type=text]");
+        other.classList.add("isFocused");
+        other.focus();
+    }
+});
+"""
+
+
+def split_pages(num_questions: int, num_pages: int) -> List[List[int]]:
+    """Split question numbers (starting from 1) into ``num_pages`` pages as evenly as possible."""
+    pages: List[List[int]] = [[] for _ in range(num_pages)]
+    for no in range(1, num_questions + 1):
+        pages[(no - 1) * num_pages // max(num_questions, 1)].append(no)
+    return pages
+
+
+def question_type(no: int, types: List[str]) -> str:
+    """The type of the ``no`` th question. (``types`` are used in turn.)"""
+    return types[(no - 1) % len(types)]
+
+
+def google_question_html(no: int, qtype: str) -> str:
+    identifier: int = 1000 + no
+    title: str = f"Question {no} ({qtype})"
+    params: str = html.escape(f'%.@.[{identifier},"{title}",null,{2 if qtype != "text" else 0},[]]')
+    if qtype == "text":
+        inputs = '<input type="text" class="quantumWizTextinputPaperinputInput">'
+    else:
+        role: str = "checkbox" if qtype == "checkbox" else "radio"
+        inputs = f'<input type="hidden" name="entry.{identifier}">' + "".join(
+            [
+                f'<label><div role="{role}" aria-checked="false"></div><span>Option {i}</span></label>'
+                for i in range(1, NUM_OPTIONS + 1)
+            ]
+        )
+        if qtype == "other":
+            inputs += (
+                '<label data-other><div role="radio" aria-checked="false"></div><span>Other:</span></label>'
+                '<input type="text" class="freebirdFormviewerComponentsQuestionRadioOtherInputElement">'
+            )
+    return (
+        '<div class="freebirdFormviewerViewNumberedItemContainer">'
+        f'<div data-params="{params}"><div>{title}</div>{inputs}</div>'
+        "</div>"
+    )
+
+
+def office_question_html(no: int, qtype: str) -> str:
+    if qtype == "text":
+        inputs = '<input type="text" value="">'
+    else:
+        itype: str = "checkbox" if qtype == "checkbox" else "radio"
+        inputs = "".join(
+            [
+                f'<label><input type="{itype}" name="q{no}" value="Option {i}">Option {i}</label>'
+                for i in range(1, NUM_OPTIONS + 1)
+            ]
+        )
+        if qtype == "other":
+            inputs += f'<label><input type="text" name="q{no}-other" value=""></label>'
+    return (
+        '<div class="office-form-question">'
+        f'<span class="ordinal-number">{no}.</span>'
+        f'<div class="question-title-box">Question {no} ({qtype})</div>{inputs}'
+        "</div>"
+    )
+
+
+def google_load_data(num_questions: int, num_pages: int, types: List[str]) -> List[Any]:
+    """Create ``FB_PUBLIC_LOAD_DATA_`` of the questions in :func:`form_pages`. The entry identifier of the ``no`` th question is ``2000 + no``."""
+    items: List[List[Any]] = []
+    for i, numbers in enumerate(split_pages(num_questions, num_pages)):
+        if i > 0:
+            items.append([3000 + i, f"Page {i + 1}", None, 8])
+        for no in numbers:
+            qtype: str = question_type(no, types)
+            options: List[List[Any]] = []
+            if qtype != "text":
+                options = [[f"Option {k}", None, None, None, 0] for k in range(1, NUM_OPTIONS + 1)]
+                if qtype == "other":
+                    options.append(["", None, None, None, 1])
+            type_code: int = {"radio": 2, "checkbox": 4, "text": 0, "other": 2}[qtype]
+            title: str = f"Question {no} ({qtype})"
+            items.append([1000 + no, title, None, type_code, [[2000 + no, options or None, 1]]])
+    data: List[Any] = [None] * 15
+    data[1] = [None, items, None, None, None, None, None, None, "Benchmark Google HTTP Form"]
+    data[3] = "google-http"
+    data[14] = GOOGLE_FBZX
+    return data
+
+
+def google_http_page(num_questions: int, num_pages: int, types: List[str]) -> str:
+    """Create the HTML of a Google Form with ``FB_PUBLIC_LOAD_DATA_``. (Serve it at ``.../viewform`` so that the answers are posted to ``.../formResponse``.)"""
+    script: str = "var FB_PUBLIC_LOAD_DATA_ = {};".format(
+        json.dumps(google_load_data(num_questions, num_pages, types))
+    )
+    return PAGE_TEMPLATE.format(title="google-http", body="", script=script)
+
+
+def google_http_fields(num_questions: int, types: List[str]) -> List[Tuple[str, str]]:
+    """The ``entry.<id>`` fields which should be posted when :func:`google_http_page` is answered with :func:`form_data`."""
+    fields: List[Tuple[str, str]] = []
+    for no in range(1, num_questions + 1):
+        name: str = f"entry.{2000 + no}"
+        fields.extend(
+            {
+                "radio": [(name, "Option 2")],
+                "checkbox": [(name, "Option 1"), (name, "Option 3")],
+                "text": [(name, f"Answer {no}")],
+                "other": [
+                    (name, "__other_option__"),
+                    (f"{name}.other_option_response", f"Other {no}"),
+                ],
+            }[question_type(no, types)]
+        )
+    return fields
+
+
+def form_pages(form: str, num_questions: int, num_pages: int, types: List[str]) -> List[str]:
+    """Create the HTML of each page.
+
+    Args:
+        form (str)          : ``"google"`` or ``"office"``.
+        num_questions (int) : The number of questions.
+        num_pages (int)     : The number of pages.
+        types (List[str])   : Question types used in turn.
+
+    Returns:
+        List[str]: HTML of the pages. The next button of the last page goes to ``/done``.
+    """
+    pages: List[str] = []
+    for i, numbers in enumerate(split_pages(num_questions, num_pages)):
+        next_url: str = f"/{form}/{i + 1}" if i + 1 < num_pages else "/done"
+        if form == "google":
+            body = (
+                '<div class="freebirdFormviewerViewHeaderHeaderBody">Benchmark Google Form</div>'
+                + "".join([google_question_html(no, question_type(no, types)) for no in numbers])
+                + f'<div role="button" class="benchmarkNextButton" onclick="location.href=\'{next_url}\'">Next</div>'
+            )
+            script = GOOGLE_SCRIPT
+        else:
+            body = (
+                '<div class="office-form-title-content">Benchmark Office Form</div>'
+                + "".join([office_question_html(no, question_type(no, types)) for no in numbers])
+                + f'<button class="section-next-button" onclick="location.href=\'{next_url}\'">Next</button>'
+            )
+            script = ""
+        pages.append(PAGE_TEMPLATE.format(title=f"{form} {i}", body=body, script=script))
+    return pages
+
+
+def form_data(
+    form: str, url: str, num_questions: int, num_pages: int, types: List[str]
+) -> Dict[str, Any]:
+    """Create the form data json which answers all questions of :func:`form_pages`.
+
+    Args:
+        form (str)          : ``"google"``, ``"google-http"`` or ``"office"``.
+        url (str)           : URL of the first page.
+        num_questions (int) : The number of questions.
+        num_pages (int)     : The number of pages.
+        types (List[str])   : Question types used in turn.
+
+    Returns:
+        Dict[str, Any]: The form data.
+    """
+    next_selector: str = ".benchmarkNextButton" if form == "google" else ".section-next-button"
+    answer: List[Dict[str, Any]] = []
+    for numbers in split_pages(num_questions, num_pages):
+        page: Dict[str, Any] = {}
+        for no in numbers:
+            qtype: str = question_type(no, types)
+            if form.startswith("google"):
+                page[str(1000 + no)] = {
+                    "radio": {"val": [2]},
+                    "checkbox": {"val": [1, 3]},
+                    "text": {"val": f"Answer {no}"},
+                    "other": {"val": [NUM_OPTIONS + 1], "others": f"Other {no}"},
+                }[qtype]
+            else:
+                page[str(no)] = {
+                    "radio": {"no": 2},
+                    "checkbox": {"no": [1, 3]},
+                    "text": {"no": 1, "text": f"Answer {no}"},
+                    "other": {"no": NUM_OPTIONS + 1, "text": f"Other {no}"},
+                }[qtype]
+        if form != "google-http":
+            page["next"] = {"func": "click", "by": "css selector", "identifier": next_selector}
+        answer.append(page)
+    return {"name": f"Benchmark {form}", "URL": url, "form": form, "login": [], "answer": answer}
+
+
+class FixtureServer:
+    """Serve HTML pages at ``127.0.0.1`` in a background thread.
+
+    Paths ending with ``/formResponse`` accept ``POST``, and the posted fields are appended to :attr:`submissions`.
+
+    Args:
+        pages (Dict[str, str]) : HTML of each path. (ex. ``{"/google/0": "<html>..."}``)
+
+    Attributes:
+        submissions (List[Tuple[str, List[Tuple[str, str]]]]) : Paths and fields of the ``POST`` requests in order.
+
+    Examples:
+        >>> with FixtureServer({"/google/0": "<html></html>"}) as server:
+        ...     print(server.url("/google/0"))
+        http://127.0.0.1:54321/google/0
+    """
+
+    def __init__(self, pages: Dict[str, str]):
+        pages = dict(pages)
+        pages.setdefault("/done", PAGE_TEMPLATE.format(title="done", body="Done", script=""))
+        submissions: List[Tuple[str, List[Tuple[str, str]]]] = []
+        self.submissions = submissions
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                content = pages.get(self.path)
+                self.send_response(200 if content is not None else 404)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.end_headers()
+                self.wfile.write((content or "Not Found").encode("utf-8"))
+
+            def do_POST(self):
+                length: int = int(self.headers.get("Content-Length", 0))
+                body: str = self.rfile.read(length).decode("utf-8")
+                found: bool = self.path.endswith("/formResponse")
+                if found:
+                    submissions.append((self.path, parse_qsl(body, keep_blank_values=True)))
+                self.send_response(200 if found else 404)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.end_headers()
+                self.wfile.write(pages["/done"].encode("utf-8") if found else b"Not Found")
+
+            def log_message(self, *args) -> None:
+                pass
+
+        self.httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.address: Tuple[str, int] = self.httpd.server_address
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def url(self, path: str) -> str:
+        return f"http://{self.address[0]}:{self.address[1]}{path}"
+
+    def __enter__(self) -> "FixtureServer":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+if __name__ == "__main__":
+    # Dump the form data of a small fixture.
+    print(json.dumps(form_data("google", "http://127.0.0.1/google/0", 4, 2, QUESTION_TYPES)))
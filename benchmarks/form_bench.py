@@ -0,0 +1,154 @@
+# coding: utf-8
+"""Answer the local form fixtures (See ``fixtures.py``) and report per-phase timings and WebDriver command counts.
+
+It requires Chrome and chromedriver, but no network access.
+
+.. code-block:: shell
+
+    $ python benchmarks/form_bench.py --forms google office --questions 20 --pages 2 --repeat 3
+    $ python benchmarks/form_bench.py --types text --fast-fill --json bench.json
+    $ python benchmarks/form_bench.py --driver lean
+"""
+import argparse
+import collections
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fixtures import QUESTION_TYPES, FixtureServer, form_data, form_pages  # noqa: E402
+
+from form_auto_fill_in import forms  # noqa: E402
+from form_auto_fill_in.utils.driver_utils import DRIVER_PROFILES, get_chrome_driver  # noqa: E402
+from form_auto_fill_in.utils.generic_utils import save_data  # noqa: E402
+from form_auto_fill_in.utils.trace_utils import TRACER  # noqa: E402
+
+#: Spans reported as phases.
+PHASES: List[str] = [
+    "run/login",
+    "run/answer_form",
+    "run/answer_form/page/page.settle",
+    "run/answer_form/page/page.scan",
+    "run/answer_form/page/question",
+    "run/answer_form/page/page.next",
+]
+
+
+def count_commands(driver) -> collections.Counter:
+    """Count the WebDriver commands sent by ``driver`` (and its elements) from now on."""
+    counter: collections.Counter = collections.Counter()
+    execute = driver.execute
+
+    def counting_execute(driver_command: str, params: Dict[str, Any] = None):
+        counter[driver_command] += 1
+        return execute(driver_command, params)
+
+    driver.execute = counting_execute
+    return counter
+
+
+def bench(form: str, path: str, driver, fast_fill: bool) -> Dict[str, Any]:
+    TRACER.clear()
+    TRACER.enable()
+    counter = count_commands(driver)
+    model = forms.get(identifier=form, path=path, verbose=False)
+    model.fast_fill = fast_fill
+    start: float = time.perf_counter()
+    model.run(driver=driver)
+    elapsed: float = time.perf_counter() - start
+    del driver.execute
+    TRACER.disable()
+    phases = {row["path"]: row["total"] for row in TRACER.summary()}
+    return {
+        "elapsed": elapsed,
+        "phases": {phase: phases.get(phase, 0.0) for phase in PHASES},
+        "commands": sum(counter.values()),
+        "command_counts": dict(counter.most_common()),
+    }
+
+
+def main(argv: list = sys.argv[1:]) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark answering local form fixtures.")
+    parser.add_argument(
+        "--forms", nargs="+", default=["google", "office"], choices=["google", "office"]
+    )
+    parser.add_argument("-q", "--questions", type=int, default=10, help="The number of questions.")
+    parser.add_argument("-p", "--pages", type=int, default=1, help="The number of pages.")
+    parser.add_argument(
+        "-t",
+        "--types",
+        type=str,
+        default=",".join(QUESTION_TYPES),
+        help=f"Comma separated question types used in turn. ({', '.join(QUESTION_TYPES)})",
+    )
+    parser.add_argument("-n", "--repeat", type=int, default=3, help="The number of runs.")
+    parser.add_argument(
+        "--fast-fill", action="store_true", help="Whether to fill in text fields with a script."
+    )
+    parser.add_argument(
+        "--browser", action="store_true", help="Whether to run Chrome with GUI browser."
+    )
+    parser.add_argument(
+        "--driver", type=str, default="default", choices=list(DRIVER_PROFILES.keys())
+    )
+    parser.add_argument("--json", type=str, help="Path to save all results as json.")
+    args = parser.parse_args(argv)
+
+    types: List[str] = args.types.split(",")
+    for qtype in types:
+        if qtype not in QUESTION_TYPES:
+            parser.error(f"Unknown question type: {qtype}")
+
+    pages: Dict[str, str] = {}
+    for form in args.forms:
+        for i, page in enumerate(form_pages(form, args.questions, args.pages, types)):
+            pages[f"/{form}/{i}"] = page
+
+    try:
+        driver = get_chrome_driver(browser=args.browser, profile=args.driver)
+    except Exception as e:
+        print(f"Chrome is not available: [{e.__class__.__name__}] {e}")
+        return 1
+
+    results: Dict[str, List[Dict[str, Any]]] = {}
+    with tempfile.TemporaryDirectory() as tmpdir, FixtureServer(pages) as server, driver:
+        for form in args.forms:
+            path: str = os.path.join(tmpdir, f"{form}.json")
+            save_data(
+                form_data(form, server.url(f"/{form}/0"), args.questions, args.pages, types), path
+            )
+            # The first run warms up the driver and the plan cache.
+            bench(form=form, path=path, driver=driver, fast_fill=args.fast_fill)
+            results[form] = [
+                bench(form=form, path=path, driver=driver, fast_fill=args.fast_fill)
+                for _ in range(args.repeat)
+            ]
+
+    print(
+        f"questions={args.questions}, pages={args.pages}, types={args.types}, fast_fill={args.fast_fill}, driver={args.driver}, repeat={args.repeat}"
+    )
+    width: int = max([len(e) for e in PHASES] + [12])
+    for form, runs in results.items():
+        print(f"\n[{form}] median of {len(runs)} runs")
+        print(f"{'elapsed':<{width}} {statistics.median([r['elapsed'] for r in runs]):>9.3f}[s]")
+        for phase in PHASES:
+            print(
+                f"{phase:<{width}} {statistics.median([r['phases'][phase] for r in runs]):>9.3f}[s]"
+            )
+        print(f"{'commands':<{width}} {statistics.median([r['commands'] for r in runs]):>9.0f}")
+        for command, count in runs[-1]["command_counts"].items():
+            print(f"  {command:<{width - 2}} {count:>9}")
+
+    if args.json is not None:
+        with open(args.json, mode="w") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+# coding: utf-8
+"""Answer a local Google Form (See ``fixtures.py``) with the browserless ``"google-http"`` form model, and check the posted fields.
+
+The fixture serves ``FB_PUBLIC_LOAD_DATA_`` at ``/google-http/viewform``, and records the fields posted to ``/google-http/formResponse``. It exits with ``1`` if a run fails, or the ``entry.<id>`` fields, ``pageHistory`` or ``fbzx`` differ from the expected ones. It requires neither Chrome nor network access.
+
+.. code-block:: shell
+
+    $ python benchmarks/google_http.py --questions 20 --pages 3 --repeat 10
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fixtures import (  # noqa: E402
+    GOOGLE_FBZX,
+    QUESTION_TYPES,
+    FixtureServer,
+    form_data,
+    google_http_fields,
+    google_http_page,
+)
+
+from form_auto_fill_in import forms  # noqa: E402
+from form_auto_fill_in.utils.generic_utils import save_data  # noqa: E402
+
+
+def check_fields(
+    fields: List[Tuple[str, str]], expected: List[Tuple[str, str]], num_pages: int
+) -> List[str]:
+    """Compare the posted ``fields`` with the ``expected`` entries, and return the differences."""
+    errors: List[str] = []
+    entries: List[Tuple[str, str]] = [e for e in fields if e[0].startswith("entry.")]
+    if entries != expected:
+        missing = [e for e in expected if e not in entries]
+        unexpected = [e for e in entries if e not in expected]
+        errors.append(f"entries differ (missing: {missing}, unexpected: {unexpected})")
+    others: Dict[str, str] = dict([e for e in fields if not e[0].startswith("entry.")])
+    page_history: str = ",".join([str(i) for i in range(num_pages)])
+    if others.get("pageHistory") != page_history:
+        errors.append(f"pageHistory: expected {page_history!r}, got {others.get('pageHistory')!r}")
+    if others.get("fbzx") != str(GOOGLE_FBZX):
+        errors.append(f"fbzx: expected {str(GOOGLE_FBZX)!r}, got {others.get('fbzx')!r}")
+    return errors
+
+
+def main(argv: list = sys.argv[1:]) -> int:
+    parser = argparse.ArgumentParser(
+        description="Check the fields posted by the google-http form model to a local form."
+    )
+    parser.add_argument("-q", "--questions", type=int, default=10, help="The number of questions.")
+    parser.add_argument("-p", "--pages", type=int, default=2, help="The number of pages.")
+    parser.add_argument("-n", "--repeat", type=int, default=5, help="The number of runs.")
+    parser.add_argument(
+        "--types", nargs="+", default=QUESTION_TYPES, choices=QUESTION_TYPES, help="Question types."
+    )
+    args = parser.parse_args(argv)
+
+    pages: Dict[str, str] = {
+        "/google-http/viewform": google_http_page(args.questions, args.pages, args.types)
+    }
+    expected: List[Tuple[str, str]] = google_http_fields(args.questions, args.types)
+    failed: bool = False
+    elapsed: List[float] = []
+    with tempfile.TemporaryDirectory() as tmpdir, FixtureServer(pages) as server:
+        path: str = os.path.join(tmpdir, "google-http.json")
+        url: str = server.url("/google-http/viewform")
+        save_data(form_data("google-http", url, args.questions, args.pages, args.types), path)
+        for i in range(args.repeat):
+            start: float = time.perf_counter()
+            try:
+                forms.get(identifier="google-http", path=path, verbose=False).run()
+            except Exception as e:
+                print(f"run {i} failed: [{e.__class__.__name__}] {e}")
+                failed = True
+                continue
+            elapsed.append(time.perf_counter() - start)
+        for i, (action, fields) in enumerate(server.submissions):
+            if action != "/google-http/formResponse":
+                print(f"run {i}: posted to {action}")
+                failed = True
+            for error in check_fields(fields, expected, args.pages):
+                print(f"run {i}: {error}")
+                failed = True
+    if len(server.submissions) != args.repeat:
+        print(f"{len(server.submissions)} responses are posted in {args.repeat} runs.")
+        failed = True
+    if len(elapsed) > 0:
+        print(
+            f"google-http: median {statistics.median(elapsed) * 1000:.1f}[ms] of {len(elapsed)} runs"
+            f" ({len(expected)} fields, the first run fetches the schema)"
+        )
+    print("FAILED" if failed else "OK")
+    return int(failed)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+# coding: utf-8
+"""Measure the cold import time of ``form_auto_fill_in`` and its CLI entry points.
+
+Each import runs in a fresh interpreter with an empty ``HOME``, and the script fails when a heavy module (selenium, asyncio, ...) is imported eagerly, or when the import touches the filesystem.
+
+.. code-block:: shell
+
+    $ python benchmarks/import_time.py --repeat 10
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from typing import Any, Dict, List
+
+ROOT_DIR: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES: List[str] = [
+    "form_auto_fill_in",
+    "form_auto_fill_in.cli.answer_form",
+    "form_auto_fill_in.cli.show",
+    "form_auto_fill_in.cli.daemon",
+    "form_auto_fill_in.cli.schedule",
+    "form_auto_fill_in.cli.crawl",
+    "form_auto_fill_in.cli.bulk",
+]
+HEAVY_MODULES: List[str] = ["selenium", "asyncio", "urllib3", "concurrent.futures"]
+
+SCRIPT: str = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"elapsed": elapsed, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure(module: str, home: str) -> Dict[str, Any]:
+    env: Dict[str, str] = dict(os.environ, HOME=home, PYTHONDONTWRITEBYTECODE="1")
+    env["PYTHONPATH"] = os.pathsep.join([ROOT_DIR, env.get("PYTHONPATH", "")])
+    output = subprocess.run(
+        [sys.executable, "-c", SCRIPT.format(module=module, heavy=HEAVY_MODULES)],
+        env=env,
+        check=True,
+        stdout=subprocess.PIPE,
+    ).stdout
+    return json.loads(output.decode("utf-8").strip().splitlines()[-1])
+
+
+def main(argv: list = sys.argv[1:]) -> int:
+    parser = argparse.ArgumentParser(description="Measure the import time.")
+    parser.add_argument("-n", "--repeat", type=int, default=5, help="The number of runs.")
+    args = parser.parse_args(argv)
+
+    failed: bool = False
+    print(f"{'module':<40} {'median [ms]':>12} {'min [ms]':>10}  eagerly imported")
+    for module in MODULES:
+        with tempfile.TemporaryDirectory() as home:
+            results = [measure(module, home) for _ in range(args.repeat)]
+            created: List[str] = os.listdir(home)
+        elapsed = [r["elapsed"] * 1e3 for r in results]
+        loaded = sorted(set(sum([r["loaded"] for r in results], [])))
+        print(
+            f"{module:<40} {statistics.median(elapsed):>12.1f} {min(elapsed):>10.1f}  {', '.join(loaded) or '-'}"
+        )
+        if len(loaded) > 0 or len(created) > 0:
+            failed = True
+        if len(created) > 0:
+            print(f"  created at import: {', '.join(created)}")
+    return int(failed)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
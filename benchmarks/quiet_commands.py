@@ -0,0 +1,119 @@
+# coding: utf-8
+"""Count the WebDriver commands which are sent only to build messages (label texts, titles, ...), and check that quiet runs send none of them.
+
+Each fixture form is answered in verbose mode and in quiet mode. A command is attributed to messages when it is sent from a message hook (``MESSAGE_HOOKS``) or while a lazy message is evaluated in ``log_utils``. It exits with ``1`` if a quiet run sends any of them, so it can be used as a check in CI. It requires Chrome and chromedriver, but no network access.
+
+.. code-block:: shell
+
+    $ python benchmarks/quiet_commands.py --forms google office --questions 20 --pages 2
+"""
+import argparse
+import collections
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import traceback
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fixtures import QUESTION_TYPES, FixtureServer, form_data, form_pages  # noqa: E402
+
+from form_auto_fill_in import forms  # noqa: E402
+from form_auto_fill_in.utils.driver_utils import DRIVER_PROFILES, get_chrome_driver  # noqa: E402
+from form_auto_fill_in.utils.generic_utils import save_data  # noqa: E402
+
+#: Methods of the form models which are called only for messages.
+MESSAGE_HOOKS: List[str] = ["find_form_title", "find_question_title", "get_label_text"]
+LOG_MODULE: str = os.path.join("utils", "log_utils.py")
+
+
+def is_message_command() -> bool:
+    """Whether the command being sent is for messages, judging from the call stack."""
+    for frame in traceback.extract_stack():
+        if frame.name in MESSAGE_HOOKS or frame.filename.endswith(LOG_MODULE):
+            return True
+    return False
+
+
+def count_commands(driver) -> collections.Counter:
+    """Count the WebDriver commands sent by ``driver`` (and its elements) from now on. ``"total"`` is the number of all commands, and ``"message"`` is that of the commands for messages."""
+    counter: collections.Counter = collections.Counter()
+    execute = driver.execute
+
+    def counting_execute(driver_command: str, params: Dict[str, Any] = None):
+        counter["total"] += 1
+        if is_message_command():
+            counter["message"] += 1
+        return execute(driver_command, params)
+
+    driver.execute = counting_execute
+    return counter
+
+
+def run(form: str, path: str, driver, verbose: bool) -> Dict[str, int]:
+    counter = count_commands(driver)
+    model = forms.get(identifier=form, path=path, verbose=verbose)
+    # Messages of the verbose runs are evaluated as usual, but not shown.
+    with contextlib.redirect_stdout(io.StringIO()):
+        model.run(driver=driver)
+    del driver.execute
+    return {"total": counter["total"], "message": counter["message"]}
+
+
+def main(argv: list = sys.argv[1:]) -> int:
+    parser = argparse.ArgumentParser(
+        description="Check that quiet runs send no WebDriver commands for messages."
+    )
+    parser.add_argument(
+        "--forms", nargs="+", default=["google", "office"], choices=["google", "office"]
+    )
+    parser.add_argument("-q", "--questions", type=int, default=10, help="The number of questions.")
+    parser.add_argument("-p", "--pages", type=int, default=2, help="The number of pages.")
+    parser.add_argument(
+        "--browser", action="store_true", help="Whether to run Chrome with GUI browser."
+    )
+    parser.add_argument(
+        "--driver", type=str, default="default", choices=list(DRIVER_PROFILES.keys())
+    )
+    args = parser.parse_args(argv)
+
+    pages: Dict[str, str] = {}
+    for form in args.forms:
+        for i, page in enumerate(form_pages(form, args.questions, args.pages, QUESTION_TYPES)):
+            pages[f"/{form}/{i}"] = page
+
+    try:
+        driver = get_chrome_driver(browser=args.browser, profile=args.driver)
+    except Exception as e:
+        print(f"Chrome is not available: [{e.__class__.__name__}] {e}")
+        return 1
+
+    failed: bool = False
+    print(f"{'form':<8} {'mode':<8} {'commands':>9} {'message':>9}")
+    with tempfile.TemporaryDirectory() as tmpdir, FixtureServer(pages) as server, driver:
+        for form in args.forms:
+            path: str = os.path.join(tmpdir, f"{form}.json")
+            save_data(
+                form_data(
+                    form, server.url(f"/{form}/0"), args.questions, args.pages, QUESTION_TYPES
+                ),
+                path,
+            )
+            for verbose in [True, False]:
+                counts = run(form=form, path=path, driver=driver, verbose=verbose)
+                mode: str = "verbose" if verbose else "quiet"
+                print(f"{form:<8} {mode:<8} {counts['total']:>9} {counts['message']:>9}")
+                if not verbose and counts["message"] > 0:
+                    failed = True
+
+    if failed:
+        print("Quiet runs sent WebDriver commands only for messages.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+# coding: utf-8
+"""Answer the local form fixtures (See ``fixtures.py``) on a remote WebDriver, and check that the HTTP connections to it are reused and that sessions are retried.
+
+Without ``--remote``, ``chromedriver --port=<free port>`` is started as a standalone node. Selenium Grid (ex. ``docker run -p 4444:4444 selenium/standalone-chrome``) can be given with ``--remote`` instead. It exits with ``1`` if a form fails, or a new HTTP connection is opened for each session.
+
+.. code-block:: shell
+
+    $ python benchmarks/remote_grid.py --repeat 5
+    $ python benchmarks/remote_grid.py --remote http://127.0.0.1:4444/wd/hub --forms google
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fixtures import QUESTION_TYPES, FixtureServer, form_data, form_pages  # noqa: E402
+
+from form_auto_fill_in import forms  # noqa: E402
+from form_auto_fill_in.utils.driver_utils import (  # noqa: E402
+    get_chrome_driver,
+    get_remote_connection,
+    quit_driver,
+)
+from form_auto_fill_in.utils.generic_utils import save_data  # noqa: E402
+
+
+def free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def standalone_node(remote: Optional[str] = None, timeout: float = 10.0) -> Iterator[str]:
+    """Yield ``remote``, or the URL of a ``chromedriver`` started on a free port once it accepts connections."""
+    if remote is not None:
+        yield remote
+        return
+    port: int = free_port()
+    process = subprocess.Popen(
+        ["chromedriver", f"--port={port}"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        deadline: float = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=1).close()
+                break
+            except OSError:
+                time.sleep(0.1)
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def num_connections(url: str) -> int:
+    """The number of HTTP connections opened to ``url`` by the shared connection."""
+    return get_remote_connection(url)._conn.connection_from_url(url).num_connections
+
+
+def run(url: str, args: argparse.Namespace) -> bool:
+    """Answer the fixtures on ``url``, and return whether any check failed."""
+    failed: bool = False
+    # A closed port never creates a session, so it must fail after the retries.
+    start: float = time.perf_counter()
+    try:
+        get_chrome_driver(
+            profile={"remote": f"http://127.0.0.1:{free_port()}", "session_retries": 1}
+        )
+        print("A session is created on a closed port.")
+        failed = True
+    except Exception as e:
+        print(
+            f"retry   : failed after {time.perf_counter() - start:.2f}[s] ([{e.__class__.__name__}])"
+        )
+
+    pages: Dict[str, str] = {}
+    for form in args.forms:
+        for i, page in enumerate(form_pages(form, args.questions, args.pages, QUESTION_TYPES)):
+            pages[f"/{form}/{i}"] = page
+    spec: Dict[str, Any] = {"remote": url}
+    results: Dict[str, List[float]] = {}
+    with tempfile.TemporaryDirectory() as tmpdir, FixtureServer(pages) as server:
+        for form in args.forms:
+            path: str = os.path.join(tmpdir, f"{form}.json")
+            save_data(
+                form_data(
+                    form, server.url(f"/{form}/0"), args.questions, args.pages, QUESTION_TYPES
+                ),
+                path,
+            )
+            results[form] = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                driver = get_chrome_driver(profile=spec)
+                try:
+                    forms.get(identifier=form, path=path, verbose=False).run(driver=driver)
+                except Exception as e:
+                    print(f"{form} failed: [{e.__class__.__name__}] {e}")
+                    failed = True
+                finally:
+                    quit_driver(driver)
+                results[form].append(time.perf_counter() - start)
+    for form, elapsed in results.items():
+        print(f"{form:<8}: median {statistics.median(elapsed):.3f}[s] of {len(elapsed)} sessions")
+    sessions: int = sum([len(e) for e in results.values()])
+    connections: int = num_connections(url)
+    print(f"sessions: {sessions}, HTTP connections: {connections}")
+    # Each session sends many commands, so a new connection per session means it isn't reused.
+    return failed or connections >= max(2, sessions)
+
+
+def main(argv: list = sys.argv[1:]) -> int:
+    parser = argparse.ArgumentParser(
+        description="Answer local form fixtures on a remote WebDriver."
+    )
+    parser.add_argument(
+        "--remote", type=str, help="URL of the remote end. Defaults to a new chromedriver."
+    )
+    parser.add_argument(
+        "--forms", nargs="+", default=["google", "office"], choices=["google", "office"]
+    )
+    parser.add_argument("-q", "--questions", type=int, default=10, help="The number of questions.")
+    parser.add_argument("-p", "--pages", type=int, default=1, help="The number of pages.")
+    parser.add_argument("-n", "--repeat", type=int, default=3, help="The number of runs.")
+    args = parser.parse_args(argv)
+
+    try:
+        with standalone_node(args.remote) as url:
+            return int(run(url, args))
+    except FileNotFoundError as e:
+        print(f"chromedriver is not available: [{e.__class__.__name__}] {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
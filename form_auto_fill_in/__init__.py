@@ -3,4 +3,4 @@ import os
 
 from . import forms, utils
 from .__meta__ import *
-from .main import answer_form
+from .main import answer_form, answer_form_async
@@ -0,0 +1,362 @@
+# coding: utf-8
+"""Answer one form template for many respondents.
+
+Respondent rows are read one by one from a CSV or JSONL file (or the standard input), and only the rows being answered are kept in memory. (The ids of the rows which succeeded in the previous run are also kept to skip them, so the memory grows with the size of the result file, about 100 bytes per row.) At most ``jobs`` rows are answered concurrently by worker processes, and each result is appended to a JSONL file and flushed to disk as soon as it is finished, so nothing is lost when the process crashes. Rows which succeeded in the previous run (the same ``"id"`` in the result file) are skipped.
+
+Each worker process keeps one Chrome (a :class:`ChromeDriverPool <form_auto_fill_in.utils.driver_utils.ChromeDriverPool>` of size ``1``) for its rows. Cookies, caches and storages are cleared between rows, and the driver is replaced after ``max_jobs`` rows, or when it crashes. (Then the row fails, and it is answered again in the next run.) If a worker process dies (ex. killed by OOM), its rows fail and the workers are started again.
+
+A CSV row has an ``id`` column (Defaults to the row number), ``answer.<page>.<identifier>.<key>`` columns which override the answers in the template (values are parsed as json if possible), and the other columns are the secrets.
+
+.. code-block:: text
+
+    id,UTOKYO_ACCOUNT_MAIL_ADDRESS,UTOKYO_ACCOUNT_PASSWORD,answer.0.3.no
+    alice,alice@utac.u-tokyo.ac.jp,PASSWORD,2
+    bob,bob@utac.u-tokyo.ac.jp,PASSWORD,"[1, 3]"
+
+A JSONL row has the same information as an object.
+
+.. code-block:: json
+
+    {"id": "alice", "secrets": {"UTOKYO_ACCOUNT_PASSWORD": "PASSWORD"}, "answer": {"0": {"3": {"no": 2}}}}
+
+Each line of the result file is ``{"id", "line", "succeeded", "elapsed", "error", "finished_at"}``. Secrets are never written to it.
+"""
+from __future__ import annotations
+
+import csv
+import datetime
+import json
+import os
+import sys
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+)
+
+from .main import _answer_form_worker
+from .utils._colorings import toGREEN, toRED
+from .utils.driver_utils import ChromeDriverPool, DriverSpec, merge_driver_specs
+from .utils.plan_utils import FormPlan, load_plan, thaw
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+RESPONDENT_FORMATS: List[str] = ["csv", "jsonl"]
+ANSWER_COLUMN_PREFIX: str = "answer."
+
+#: The driver of this worker process. (See :func:`_answer_respondent_worker`)
+_POOL: Optional[ChromeDriverPool] = None
+
+
+class Respondent(NamedTuple):
+    """A row of the respondents.
+
+    Attributes:
+        id (str)                                         : An identifier of the respondent.
+        line (int)                                       : The line (or row) number in the input.
+        secrets_dict (Dict[str, str])                    : Key and value pairs of the secrets. (Keys are ``<PLACEHOLDER>``)
+        overrides (Dict[str, Dict[str, Dict[str, Any]]]) : Answers which override the template. (See :meth:`FormPlan.resolve <form_auto_fill_in.utils.plan_utils.FormPlan.resolve>`)
+        error (str)                                      : The reason why the row can not be answered. (``""`` if valid.)
+    """
+
+    id: str
+    line: int
+    secrets_dict: Dict[str, str]
+    overrides: Dict[str, Dict[str, Dict[str, Any]]]
+    error: str = ""
+
+
+def to_placeholder(name: str) -> str:
+    """Convert the secret name (ex. ``"PASSWORD"`` or ``"<PASSWORD>"``) into a placeholder (``"<PASSWORD>"``)."""
+    return name if name.startswith("<") and name.endswith(">") else f"<{name}>"
+
+
+def parse_csv_row(row: Dict[str, str], line: int) -> Respondent:
+    """Convert a CSV row into :class:`Respondent`. Empty cells are ignored.
+
+    Args:
+        row (Dict[str, str]) : A row read by ``csv.DictReader``.
+        line (int)           : The row number.
+
+    Returns:
+        Respondent: The respondent.
+    """
+    secrets_dict: Dict[str, str] = {}
+    overrides: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    for column, value in row.items():
+        if column is None or value is None or value == "" or column == "id":
+            continue
+        if column.startswith(ANSWER_COLUMN_PREFIX):
+            keys = column[len(ANSWER_COLUMN_PREFIX) :].split(".")
+            if len(keys) != 3 or not keys[0].isdigit():
+                return Respondent(
+                    id=row.get("id") or str(line),
+                    line=line,
+                    secrets_dict={},
+                    overrides={},
+                    error=f"{column}: must be answer.<page>.<identifier>.<key>",
+                )
+            try:
+                value = json.loads(value)
+            except ValueError:
+                pass
+            overrides.setdefault(keys[0], {}).setdefault(keys[1], {})[keys[2]] = value
+        else:
+            secrets_dict[to_placeholder(column)] = value
+    return Respondent(
+        id=row.get("id") or str(line), line=line, secrets_dict=secrets_dict, overrides=overrides
+    )
+
+
+def parse_jsonl_row(text: str, line: int) -> Respondent:
+    """Convert a JSONL row into :class:`Respondent`.
+
+    Args:
+        text (str) : A line of the JSONL.
+        line (int) : The line number.
+
+    Returns:
+        Respondent: The respondent.
+    """
+    try:
+        row: Dict[str, Any] = json.loads(text)
+        if not isinstance(row, dict):
+            raise ValueError(f"must be an object, got {type(row).__name__}")
+        answer: Any = row.get("answer", {})
+        if isinstance(answer, list):
+            answer = {str(i): page for i, page in enumerate(answer)}
+        return Respondent(
+            id=str(row.get("id", line)),
+            line=line,
+            secrets_dict={to_placeholder(k): str(v) for k, v in row.get("secrets", {}).items()},
+            overrides={str(k): v for k, v in answer.items()},
+        )
+    except (ValueError, AttributeError) as e:
+        return Respondent(
+            id=str(line),
+            line=line,
+            secrets_dict={},
+            overrides={},
+            error=f"[{e.__class__.__name__}] {e}",
+        )
+
+
+def iter_respondents(path: str, format: Optional[str] = None) -> Iterator[Respondent]:
+    """Read the respondents one by one.
+
+    Args:
+        path (str)                       : Path to the CSV or JSONL file. ``"-"`` for the standard input.
+        format (Optional[str], optional) : ``"csv"`` or ``"jsonl"``. Defaults to the extension of ``path``. (``"jsonl"`` for the standard input.)
+
+    Yields:
+        Iterator[Respondent]: Respondents. Broken rows are also yielded with ``error``.
+    """
+    if format is None:
+        format = "csv" if path.lower().endswith(".csv") else "jsonl"
+    f: IO[str] = sys.stdin if path == "-" else open(path, mode="r", encoding="utf-8", newline="")
+    try:
+        if format == "csv":
+            for line, row in enumerate(csv.DictReader(f), start=1):
+                yield parse_csv_row(row, line=line)
+        else:
+            for line, text in enumerate(f, start=1):
+                if text.strip() != "":
+                    yield parse_jsonl_row(text, line=line)
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def load_finished(path: str) -> Set[str]:
+    """Get the ids of the respondents which succeeded in the result file at ``path``. (Broken lines, ex. the last line written when the process crashed, are ignored.)"""
+    finished: Set[str] = set()
+    if os.path.exists(path):
+        with open(path, mode="r", encoding="utf-8") as f:
+            for text in f:
+                try:
+                    result: Dict[str, Any] = json.loads(text)
+                except ValueError:
+                    continue
+                if result.get("succeeded"):
+                    finished.add(str(result.get("id")))
+    return finished
+
+
+def _answer_respondent_worker(
+    path: str,
+    browser: bool = False,
+    profile: DriverSpec = None,
+    max_jobs: Optional[int] = None,
+    **kwargs,
+) -> Dict[str, Any]:
+    """Run :func:`_answer_form_worker <form_auto_fill_in.main._answer_form_worker>` with the driver of this worker process, which is launched at the first row and quit when the process exits.
+
+    Args:
+        path (str)                         : Path to the form data json (template).
+        browser (bool, optional)           : Whether you want to run Chrome with GUI browser. Defaults to ``False``.
+        profile (DriverSpec, optional)     : The driver profile. Defaults to ``None``.
+        max_jobs (Optional[int], optional) : The number of rows after which the driver is replaced. Defaults to ``None``.
+
+    Returns:
+        Dict[str, Any]: The result with ``"path"``, ``"succeeded"``, ``"elapsed"`` and ``"error"``.
+    """
+    import multiprocessing.util
+
+    global _POOL
+    try:
+        if _POOL is None:
+            pool = ChromeDriverPool(size=1, browser=browser, profile=profile, max_jobs=max_jobs)
+            # Worker processes exit without atexit, but with the finalizers of multiprocessing.
+            multiprocessing.util.Finalize(pool, pool.close, exitpriority=10)
+            _POOL = pool
+        with _POOL.acquire() as driver:
+            return _answer_form_worker(path=path, browser=browser, driver=driver, **kwargs)
+    except Exception as e:
+        return {
+            "path": path,
+            "succeeded": False,
+            "elapsed": 0.0,
+            "error": f"[{e.__class__.__name__}] {e}",
+        }
+
+
+def append_result(f: IO[str], result: Dict[str, Any]) -> None:
+    """Append ``result`` to the result file ``f`` as a line, and flush it to disk."""
+    f.write(json.dumps(result, ensure_ascii=False) + "\n")
+    f.flush()
+    os.fsync(f.fileno())
+
+
+def answer_respondents(
+    path: str,
+    respondents: Iterable[Respondent],
+    results_path: str,
+    jobs: int = 1,
+    browser: bool = False,
+    secrets_dict: Dict[str, str] = {},
+    verbose: bool = True,
+    skip_finished: bool = True,
+    driver_profile: DriverSpec = None,
+    max_jobs: Optional[int] = 100,
+    **kwargs,
+) -> Dict[str, int]:
+    """Answer the form template at ``path`` for each of ``respondents``.
+
+    Rows are taken from ``respondents`` only when a worker is about to be free, so it can be a generator of any length (ex. :func:`iter_respondents`).
+
+    Args:
+        path (str)                              : Path to the form data json (template).
+        respondents (Iterable[Respondent])      : Respondents.
+        results_path (str)                      : Path to the JSONL file which results are appended to.
+        jobs (int, optional)                    : The maximum number of respondents answered concurrently. Defaults to ``1``.
+        browser (bool, optional)                : Whether you want to run Chrome with GUI browser. Defaults to ``False``.
+        secrets_dict (Dict[str, str], optional) : Secrets shared by all respondents. (Overridden by the secrets of each row.) Defaults to ``{}``.
+        verbose (bool, optional)                : Whether to print the result of each respondent. (Messages of the workers are not printed.) Defaults to ``True``.
+        skip_finished (bool, optional)          : Whether to skip the respondents which succeeded in ``results_path``. Defaults to ``True``.
+        driver_profile (DriverSpec, optional)   : A driver profile which overrides ``"driver"`` in the json data. Defaults to ``None``.
+        max_jobs (Optional[int], optional)      : The number of rows after which the driver of a worker is replaced. (``None`` to keep it) Defaults to ``100``.
+
+    Raises:
+        FormPlanError: When the template is invalid. (Before any row is read.)
+
+    Returns:
+        Dict[str, int]: The number of ``"succeeded"``, ``"failed"`` and ``"skipped"`` respondents.
+    """
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+    from concurrent.futures.process import BrokenProcessPool
+
+    plan: FormPlan = load_plan(path)
+    profile: DriverSpec = merge_driver_specs(thaw(plan.definition).get("driver"), driver_profile)
+    finished: Set[str] = load_finished(results_path) if skip_finished else set()
+    counts: Dict[str, int] = {"succeeded": 0, "failed": 0, "skipped": 0}
+    jobs = max(1, jobs)
+
+    def record(respondent: Respondent, result: Dict[str, Any]) -> None:
+        counts["succeeded" if result["succeeded"] else "failed"] += 1
+        append_result(
+            f,
+            {
+                "id": respondent.id,
+                "line": respondent.line,
+                "succeeded": result["succeeded"],
+                "elapsed": round(result["elapsed"], 3),
+                "error": result["error"],
+                "finished_at": datetime.datetime.now().isoformat(timespec="seconds"),
+            },
+        )
+        if verbose or not result["succeeded"]:
+            mark = toGREEN("OK    ") if result["succeeded"] else toRED("FAILED")
+            print(f"{mark} {respondent.id} {result['elapsed']:>7.2f}[s] {result['error']}")
+
+    def drain(running: Dict[Future, Respondent], limit: int) -> None:
+        while len(running) > limit:
+            done, _ = wait(list(running.keys()), return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    result: Dict[str, Any] = future.result()
+                except Exception as e:
+                    # ex. BrokenProcessPool when a worker dies. The pool is renewed at the next submit.
+                    result = {
+                        "succeeded": False,
+                        "elapsed": 0.0,
+                        "error": f"[{e.__class__.__name__}] {e}",
+                    }
+                record(running.pop(future), result)
+
+    os.makedirs(os.path.dirname(os.path.abspath(results_path)), exist_ok=True)
+    if os.path.exists(results_path) and os.path.getsize(results_path) > 0:
+        with open(results_path, mode="rb+") as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                # Terminate the line broken by the crash of the previous run.
+                f.write(b"\n")
+    running: Dict[Future, Respondent] = {}
+    executor = ProcessPoolExecutor(max_workers=jobs)
+    try:
+        with open(results_path, mode="a", encoding="utf-8") as f:
+            for respondent in respondents:
+                if respondent.id in finished:
+                    counts["skipped"] += 1
+                    continue
+                respondent_secrets: Dict[str, str] = dict(secrets_dict, **respondent.secrets_dict)
+                error: str = respondent.error
+                if error == "":
+                    missing = plan.missing_secrets(respondent_secrets)
+                    if len(missing) > 0:
+                        error = f"secrets {missing} are not given"
+                if error != "":
+                    record(respondent, {"succeeded": False, "elapsed": 0.0, "error": error})
+                    continue
+                # Queue as many rows as workers, so that no worker waits for the input.
+                drain(running, limit=2 * jobs - 1)
+                job: Dict[str, Any] = dict(
+                    path=path,
+                    browser=browser,
+                    profile=profile,
+                    max_jobs=max_jobs,
+                    secrets_dict=respondent_secrets,
+                    verbose=False,
+                    overrides=respondent.overrides,
+                    **kwargs,
+                )
+                try:
+                    future = executor.submit(_answer_respondent_worker, **job)
+                except BrokenProcessPool:
+                    # A worker died (ex. killed by OOM), so the pool can't run any more rows.
+                    drain(running, limit=0)
+                    executor.shutdown(wait=False)
+                    executor = ProcessPoolExecutor(max_workers=jobs)
+                    future = executor.submit(_answer_respondent_worker, **job)
+                running[future] = respondent
+            drain(running, limit=0)
+    finally:
+        executor.shutdown()
+    return counts
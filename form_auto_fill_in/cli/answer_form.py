@@ -7,35 +7,62 @@
                              -P "UHMRF_PLACE=ABC" \\
                              -P "UTOKYO_ACCOUNT_MAIL_ADDRESS=XXXXXXXXXX@utac.u-tokyo.ac.jp" \\
                              -P "UTOKYO_ACCOUNT_PASSWORD=PASSWORD"
+    $ poetry run answer-form ~/.FormAutoFillIn --jobs 4
+    $ poetry run answer-form UHMRF.json --trace trace.json --trace-summary
+    $ poetry run answer-form ~/.FormAutoFillIn --dry-run
 """
 import argparse
 import os
 import sys
 from typing import Dict, List
 
-from ..main import answer_form
-from ..utils._path import FORM_AUTO_FILL_IN_DIR
+from ..main import answer_form, answer_forms, preflight, print_preflight, print_summary
+from ..utils._colorings import toRED
+from ..utils._path import FORM_AUTO_FILL_IN_DIR, expand_form_paths
 from ..utils._secrets import SECRETS
 from ..utils.argparse_utils import KwargsParamProcessor
+from ..utils.driver_utils import DRIVER_PROFILES, make_driver_spec
+from ..utils.log_utils import LOG_LEVELS
+from ..utils.trace_utils import TRACER
 
 ARGUMENT_KEYS: List[str] = [
     "path",
+    "jobs",
     "quiet",
+    "log_level",
+    "log_file",
     "browser",
+    "session",
+    "resume",
+    "driver",
+    "remote",
+    "dry_run",
+    "trace",
+    "trace_summary",
     "secret",
     "params",
 ]
 
 
-def answer_form_cli(argv: list = sys.argv[1:]):
+def answer_form_cli(argv: list = sys.argv[1:]) -> int:
     """Answering Form using CLI.
 
     Args:
-        path (str)               : Path to the form data json.
-        quiet (bool, optional)   : Whether you want to be quiet or not. Defaults to ``False``.
-        browser (bool, optional) : Whether you want to run Chrome with GUI browser. Defaults to ``False``.
-        secret (str, optional)   : An identifier for the name of the ``secret_dict``.
-        params (dict, optional)  : Key and value combination for Github Secrets. You can specify by ``-P username=USERNAME``, ``-P password=PASSWORD``, etc.
+        path (List[str])               : Paths to the form data json, directories which contain them, or glob patterns.
+        jobs (int, optional)           : The maximum number of forms answered concurrently. Defaults to ``1``.
+        quiet (bool, optional)         : Whether you want to be quiet or not. Defaults to ``False``.
+        log_level (str, optional)      : The level of the messages which overrides ``quiet``. (``"debug"``, ``"info"``, ``"warning"``, ``"error"`` or ``"quiet"``)
+        log_file (str, optional)       : Path to the JSONL file which messages are appended to in a background thread instead of printing.
+        browser (bool, optional)       : Whether you want to run Chrome with GUI browser. Defaults to ``False``.
+        session (bool, optional)       : Whether to reuse the authenticated session saved in the previous run. Defaults to ``False``.
+        resume (bool, optional)        : Whether to resume from the checkpoint of the previous failed run. Defaults to ``False``.
+        driver (str, optional)         : A driver profile which overrides ``"driver"`` in the json data. (``"default"`` or ``"lean"``)
+        remote (str, optional)         : URL of Selenium Grid (or another remote WebDriver) used instead of local Chrome. It overrides ``"driver.remote"`` in the json data.
+        dry_run (bool, optional)       : Whether to only check the json data against the cached schema of the form without browser. Defaults to ``False``.
+        trace (str, optional)          : Path to export the timing spans as Chrome trace json. (Open it with ``chrome://tracing``)
+        trace_summary (bool, optional) : Whether to print the summary table of the timing spans. Defaults to ``False``.
+        secret (str, optional)         : An identifier for the name of the ``secret_dict``.
+        params (dict, optional)        : Key and value combination for Github Secrets. You can specify by ``-P username=USERNAME``, ``-P password=PASSWORD``, etc.
 
     Examples:
         $ poetry run answer-form ./.github/workflows-json/UHMRF.json \\
@@ -43,22 +70,91 @@ def answer_form_cli(argv: list = sys.argv[1:]):
                                  -P "UHMRF_PLACE=ABC" \\
                                  -P UTOKYO_ACCOUNT_MAIL_ADDRESS="XXXXXXXXXX@utac.u-tokyo.ac.jp" \\
                                  -P UTOKYO_ACCOUNT_PASSWORD="PASSWORD"
+        $ poetry run answer-form ~/.FormAutoFillIn --jobs 4
+        $ poetry run answer-form "./forms/UHMRF-*.json" --jobs 2
+        $ poetry run answer-form UHMRF.json --trace trace.json --trace-summary
+        $ poetry run answer-form ~/.FormAutoFillIn --jobs 4 --driver lean
+        $ poetry run answer-form UHMRF.json --resume
+        $ poetry run answer-form ~/.FormAutoFillIn --dry-run
+        $ poetry run answer-form ~/.FormAutoFillIn --jobs 4 --log-level warning --log-file log.jsonl
+
+    Returns:
+        int: Exit status. ``1`` if no form data json is found, any form failed when answering several forms, or has errors with ``--dry-run``.
     """
     parser = argparse.ArgumentParser(
         description="Auto fill in form about 'UTokyo Health Management Report Form'",
         add_help=True,
     )
-    parser.add_argument("path", type=str, help="Path to the form data json")
+    parser.add_argument(
+        "path",
+        type=str,
+        nargs="+",
+        help="Paths to the form data json, directories which contain them, or glob patterns.",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="The maximum number of forms answered concurrently. Defaults to 1",
+    )
     parser.add_argument(
         "--quiet",
         action="store_true",
         help="Whether you want to be quiet or not. Defaults to False",
     )
+    parser.add_argument(
+        "--log-level",
+        type=str,
+        choices=list(LOG_LEVELS.keys()),
+        help="The level of the messages which overrides --quiet.",
+    )
+    parser.add_argument(
+        "--log-file",
+        type=str,
+        help="Path to the JSONL file which messages are appended to in a background thread instead of printing.",
+    )
     parser.add_argument(
         "--browser",
         action="store_true",
         help="Whether you want to run Chrome with GUI browser. Defaults to False",
     )
+    parser.add_argument(
+        "--session",
+        action="store_true",
+        help="Whether to reuse the authenticated session saved in the previous run. Defaults to False",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Whether to resume from the checkpoint of the previous failed run. Defaults to False",
+    )
+    parser.add_argument(
+        "--driver",
+        type=str,
+        choices=list(DRIVER_PROFILES.keys()),
+        help="A driver profile which overrides 'driver' in the json data. 'lean' blocks images, fonts and analytics, and doesn't wait for subresources.",
+    )
+    parser.add_argument(
+        "--remote",
+        type=str,
+        help="URL of Selenium Grid (or another remote WebDriver) used instead of local Chrome. (ex. http://127.0.0.1:4444/wd/hub)",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Whether to only check the json data against the cached schema of the form without browser. Defaults to False",
+    )
+    parser.add_argument(
+        "--trace",
+        type=str,
+        help="Path to export the timing spans as Chrome trace json. (Open it with chrome://tracing)",
+    )
+    parser.add_argument(
+        "--trace-summary",
+        action="store_true",
+        help="Whether to print the summary table of the timing spans. Defaults to False",
+    )
     parser.add_argument(
         "--secret",
         type=str,
@@ -73,12 +169,59 @@ def answer_form_cli(argv: list = sys.argv[1:]):
     )
 
     args = parser.parse_args(argv)
+    if args.jobs < 1:
+        parser.error(f"--jobs must be at least 1, got {args.jobs}")
 
-    path = args.path
+    paths = expand_form_paths(args.path)
+    if len(paths) == 0:
+        print(toRED(f"No form data json is found in {args.path}"))
+        return 1
     verbose = not args.quiet
     browser = args.browser
 
     secrets_dict = SECRETS.get(args.secret, {})
     secrets_dict.update({f"<{k}>": v for k, v in args.__dict__.items() if k not in ARGUMENT_KEYS})
 
-    answer_form(path=path, browser=browser, secrets_dict=secrets_dict, verbose=verbose)
+    if args.dry_run:
+        results = [preflight(path=path, secrets_dict=secrets_dict) for path in paths]
+        print_preflight(results)
+        return int(any([len(e["errors"]) > 0 for e in results]))
+
+    trace: bool = args.trace is not None or args.trace_summary
+    if trace:
+        TRACER.enable()
+    try:
+        if len(paths) == 1:
+            answer_form(
+                path=paths[0],
+                browser=browser,
+                secrets_dict=secrets_dict,
+                verbose=verbose,
+                session=args.session,
+                resume=args.resume,
+                driver_profile=make_driver_spec(profile=args.driver, remote=args.remote),
+                log_level=args.log_level,
+                log_file=args.log_file,
+            )
+            return 0
+
+        results = answer_forms(
+            paths=paths,
+            jobs=args.jobs,
+            browser=browser,
+            secrets_dict=secrets_dict,
+            verbose=verbose,
+            session=args.session,
+            resume=args.resume,
+            driver_profile=make_driver_spec(profile=args.driver, remote=args.remote),
+            log_level=args.log_level,
+            log_file=args.log_file,
+            trace=trace,
+        )
+        print_summary(results)
+        return int(not all([e["succeeded"] for e in results]))
+    finally:
+        if args.trace_summary:
+            TRACER.print_summary()
+        if args.trace is not None:
+            TRACER.export(args.trace)
@@ -0,0 +1,156 @@
+# coding: utf-8
+"""Answering one form template for many respondents.
+
+.. code-block:: shell
+    $ poetry run form-bulk UHMRF.json respondents.csv --jobs 4
+    $ cat respondents.jsonl | poetry run form-bulk UHMRF.json - --results results.jsonl
+"""
+import argparse
+import os
+import sys
+from typing import List
+
+from ..bulk import RESPONDENT_FORMATS, answer_respondents, iter_respondents
+from ..utils._colorings import toBLUE, toRED
+from ..utils._path import canonicalize_path
+from ..utils._secrets import SECRETS
+from ..utils.argparse_utils import KwargsParamProcessor
+from ..utils.driver_utils import DRIVER_PROFILES, make_driver_spec
+from ..utils.plan_utils import FormPlanError
+
+ARGUMENT_KEYS: List[str] = [
+    "path",
+    "respondents",
+    "results",
+    "format",
+    "jobs",
+    "retry_finished",
+    "quiet",
+    "browser",
+    "driver",
+    "remote",
+    "secret",
+    "params",
+]
+
+
+def form_bulk_cli(argv: list = sys.argv[1:]) -> int:
+    """Answering one form template for many respondents. (See :mod:`form_auto_fill_in.bulk` for the rows.)
+
+    Args:
+        path (str)                      : Path to the form data json (template).
+        respondents (str)               : Path to the CSV or JSONL file of the respondents. ``"-"`` for the standard input.
+        results (str, optional)         : Path to the JSONL file which results are appended to. Defaults to ``<respondents>.results.jsonl``.
+        format (str, optional)          : ``"csv"`` or ``"jsonl"``. Defaults to the extension of ``respondents``.
+        jobs (int, optional)            : The maximum number of respondents answered concurrently. Defaults to ``1``.
+        retry_finished (bool, optional) : Whether to answer again for the respondents which succeeded in ``results``. Defaults to ``False``.
+        quiet (bool, optional)          : Whether to print only failures. Defaults to ``False``.
+        browser (bool, optional)        : Whether you want to run Chrome with GUI browser. Defaults to ``False``.
+        driver (str, optional)          : A driver profile which overrides ``"driver"`` in the json data. (``"default"`` or ``"lean"``)
+        remote (str, optional)          : URL of Selenium Grid (or another remote WebDriver) used instead of local Chrome. It overrides ``"driver.remote"`` in the json data.
+        secret (str, optional)          : An identifier for the name of the ``secret_dict``. (Shared by all respondents.)
+        params (dict, optional)         : Key and value combination for Github Secrets shared by all respondents. You can specify by ``-P username=USERNAME``, etc.
+
+    Examples:
+        $ poetry run form-bulk UHMRF.json respondents.csv --jobs 4 --driver lean
+        $ cat respondents.jsonl | poetry run form-bulk UHMRF.json - --results results.jsonl
+
+    Returns:
+        int: Exit status. ``1`` if the template is invalid, or any respondent failed.
+    """
+    parser = argparse.ArgumentParser(
+        description="Answer one form template for many respondents.",
+        add_help=True,
+    )
+    parser.add_argument("path", type=str, help="Path to the form data json (template).")
+    parser.add_argument(
+        "respondents",
+        type=str,
+        help="Path to the CSV or JSONL file of the respondents. '-' for the standard input.",
+    )
+    parser.add_argument(
+        "-o",
+        "--results",
+        type=str,
+        help="Path to the JSONL file which results are appended to. Defaults to <respondents>.results.jsonl",
+    )
+    parser.add_argument(
+        "--format",
+        type=str,
+        choices=RESPONDENT_FORMATS,
+        help="The format of the respondents. Defaults to the extension.",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="The maximum number of respondents answered concurrently. Defaults to 1",
+    )
+    parser.add_argument(
+        "--retry-finished",
+        action="store_true",
+        help="Whether to answer again for the respondents which succeeded in the results. Defaults to False",
+    )
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="Whether to print only failures. Defaults to False",
+    )
+    parser.add_argument(
+        "--browser",
+        action="store_true",
+        help="Whether you want to run Chrome with GUI browser. Defaults to False",
+    )
+    parser.add_argument(
+        "--driver",
+        type=str,
+        choices=list(DRIVER_PROFILES.keys()),
+        help="A driver profile which overrides 'driver' in the json data.",
+    )
+    parser.add_argument(
+        "--remote",
+        type=str,
+        help="URL of Selenium Grid (or another remote WebDriver) used instead of local Chrome. (ex. http://127.0.0.1:4444/wd/hub)",
+    )
+    parser.add_argument(
+        "--secret",
+        type=str,
+        choices=list(SECRETS.keys()),
+        help="An identifier for the name of the secret_dict shared by all respondents.",
+    )
+    parser.add_argument(
+        "-P",
+        "--secrets",
+        action=KwargsParamProcessor,
+        help="Key and value combination for Github Secrets shared by all respondents.",
+    )
+    args = parser.parse_args(argv)
+
+    secrets_dict = SECRETS.get(args.secret, {})
+    secrets_dict.update({f"<{k}>": v for k, v in args.__dict__.items() if k not in ARGUMENT_KEYS})
+    results_path: str = args.results or (
+        "results.jsonl"
+        if args.respondents == "-"
+        else os.path.splitext(args.respondents)[0] + ".results.jsonl"
+    )
+
+    try:
+        counts = answer_respondents(
+            path=canonicalize_path(args.path),
+            respondents=iter_respondents(args.respondents, format=args.format),
+            results_path=results_path,
+            jobs=args.jobs,
+            browser=args.browser,
+            secrets_dict=secrets_dict,
+            verbose=not args.quiet,
+            skip_finished=not args.retry_finished,
+            driver_profile=make_driver_spec(profile=args.driver, remote=args.remote),
+        )
+    except (FormPlanError, OSError) as e:
+        print(toRED(f"[{e.__class__.__name__}] {e}"))
+        return 1
+    print(
+        f"{counts['succeeded']} succeeded, {counts['failed']} failed, {counts['skipped']} skipped. Results are at {toBLUE(results_path)}"
+    )
+    return int(counts["failed"] > 0)
@@ -0,0 +1,130 @@
+# coding: utf-8
+"""Recording the schema of a form.
+
+.. code-block:: shell
+    $ poetry run crawl-form ./.github/workflows-json/UHMRF.json \\
+                            -P "UTOKYO_ACCOUNT_MAIL_ADDRESS=XXXXXXXXXX@utac.u-tokyo.ac.jp" \\
+                            -P "UTOKYO_ACCOUNT_PASSWORD=PASSWORD"
+"""
+import argparse
+import sys
+from typing import List
+
+from ..main import crawl_form
+from ..utils._colorings import toBLUE, toGREEN, toRED
+from ..utils._path import canonicalize_path
+from ..utils._secrets import SECRETS
+from ..utils.argparse_utils import KwargsParamProcessor
+from ..utils.driver_utils import DRIVER_PROFILES, make_driver_spec
+
+ARGUMENT_KEYS: List[str] = [
+    "path",
+    "quiet",
+    "browser",
+    "session",
+    "driver",
+    "remote",
+    "submit",
+    "secret",
+    "params",
+]
+
+
+def crawl_form_cli(argv: list = sys.argv[1:]) -> int:
+    """Walk each page of the form once with the json data, and record the schema of the form. (See :mod:`form_auto_fill_in.utils.schema_utils`)
+
+    The schema is used by ``answer-form --dry-run``, and later runs finish each page as soon as the expected questions are answered.
+
+    Args:
+        path (str)               : Path to the form data json.
+        quiet (bool, optional)   : Whether you want to be quiet or not. Defaults to ``False``.
+        browser (bool, optional) : Whether you want to run Chrome with GUI browser. Defaults to ``False``.
+        session (bool, optional) : Whether to reuse the authenticated session saved in the previous run. Defaults to ``False``.
+        driver (str, optional)   : A driver profile which overrides ``"driver"`` in the json data. (``"default"`` or ``"lean"``)
+        remote (str, optional)   : URL of Selenium Grid (or another remote WebDriver) used instead of local Chrome. It overrides ``"driver.remote"`` in the json data.
+        submit (bool, optional)  : Whether to submit the form after walking all pages. Defaults to ``False``.
+        secret (str, optional)   : An identifier for the name of the ``secret_dict``.
+        params (dict, optional)  : Key and value combination for Github Secrets. You can specify by ``-P username=USERNAME``, ``-P password=PASSWORD``, etc.
+
+    Examples:
+        $ poetry run crawl-form UHMRF.json --secret UHMRF
+        $ poetry run crawl-form LabCafe.json --browser
+
+    Returns:
+        int: Exit status. ``1`` if the form has changed since the previous crawl.
+    """
+    parser = argparse.ArgumentParser(
+        description="Record the questions, types and options of each page of the form.",
+        add_help=True,
+    )
+    parser.add_argument("path", type=str, help="Path to the form data json.")
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="Whether you want to be quiet or not. Defaults to False",
+    )
+    parser.add_argument(
+        "--browser",
+        action="store_true",
+        help="Whether you want to run Chrome with GUI browser. Defaults to False",
+    )
+    parser.add_argument(
+        "--session",
+        action="store_true",
+        help="Whether to reuse the authenticated session saved in the previous run. Defaults to False",
+    )
+    parser.add_argument(
+        "--driver",
+        type=str,
+        choices=list(DRIVER_PROFILES.keys()),
+        help="A driver profile which overrides 'driver' in the json data.",
+    )
+    parser.add_argument(
+        "--remote",
+        type=str,
+        help="URL of Selenium Grid (or another remote WebDriver) used instead of local Chrome. (ex. http://127.0.0.1:4444/wd/hub)",
+    )
+    parser.add_argument(
+        "--submit",
+        action="store_true",
+        help="Whether to submit the form after walking all pages. Defaults to False",
+    )
+    parser.add_argument(
+        "--secret",
+        type=str,
+        choices=list(SECRETS.keys()),
+        help="An identifier for the name of the secret_dict.",
+    )
+    parser.add_argument(
+        "-P",
+        "--secrets",
+        action=KwargsParamProcessor,
+        help="Key and value combination for Github Secrets. You can specify by -P username=USERNAME -P password=PASSWORD",
+    )
+    args = parser.parse_args(argv)
+
+    secrets_dict = SECRETS.get(args.secret, {})
+    secrets_dict.update({f"<{k}>": v for k, v in args.__dict__.items() if k not in ARGUMENT_KEYS})
+
+    result = crawl_form(
+        path=canonicalize_path(args.path),
+        browser=args.browser,
+        secrets_dict=secrets_dict,
+        verbose=not args.quiet,
+        submit=args.submit,
+        session=args.session,
+        driver_profile=make_driver_spec(profile=args.driver, remote=args.remote),
+    )
+    num_questions: int = sum([len(page["questions"]) for page in result["schema"]["pages"]])
+    print(
+        f"Saved the schema ({len(result['schema']['pages'])} pages, {num_questions} questions) at {toBLUE(result['path'])}"
+    )
+    if result["previous"] is not None and result["previous"] != result["fingerprint"]:
+        print(
+            toRED(
+                f"The form has changed. (fingerprint: {result['previous']} -> {result['fingerprint']})"
+            )
+        )
+        return 1
+    print(f"fingerprint: {toGREEN(result['fingerprint'])}")
+    return 0
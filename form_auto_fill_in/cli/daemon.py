@@ -0,0 +1,153 @@
+# coding: utf-8
+"""Answering Form with a long-lived daemon.
+
+.. code-block:: shell
+    $ poetry run form-daemon serve --size 4 --driver lean --max-jobs 50 --max-rss 1024
+    $ poetry run form-daemon submit ./.github/workflows-json/UHMRF.json \\
+                                    --secret UHMRF \\
+                                    -P "UHMRF_PLACE=ABC"
+"""
+import argparse
+import sys
+from typing import List
+
+from ..daemon import DAEMON_SOCKET_PATH, create_daemon, submit_job
+from ..utils._colorings import toGREEN, toRED
+from ..utils._secrets import SECRETS
+from ..utils.argparse_utils import KwargsParamProcessor
+from ..utils.driver_utils import DRIVER_PROFILES, make_driver_spec
+
+ARGUMENT_KEYS: List[str] = [
+    "command",
+    "address",
+    "size",
+    "quiet",
+    "browser",
+    "driver",
+    "remote",
+    "max_jobs",
+    "max_rss",
+    "path",
+    "secret",
+    "params",
+]
+
+
+def form_daemon_cli(argv: list = sys.argv[1:]) -> int:
+    """Answering Form with a long-lived daemon.
+
+    Args:
+        command (str)             : ``"serve"`` to start the daemon, or ``"submit"`` to send a job to it.
+        address (str, optional)   : A path to the Unix domain socket, or a port number on ``127.0.0.1``. Defaults to ``DAEMON_SOCKET_PATH``.
+        size (int, optional)      : (serve) The number of warmed drivers. Defaults to ``1``.
+        quiet (bool, optional)    : Whether you want to be quiet or not. Defaults to ``False``.
+        browser (bool, optional)  : (serve) Whether you want to run Chrome with GUI browser. Defaults to ``False``.
+        driver (str, optional)    : (serve) A driver profile of the warmed drivers. (``"default"`` or ``"lean"``)
+        remote (str, optional)    : (serve) URL of Selenium Grid (or another remote WebDriver) on which the warmed sessions are created instead of local Chrome.
+        max_jobs (int, optional)  : (serve) The number of jobs after which a driver is replaced. Defaults to ``None``. (Unlimited)
+        max_rss (float, optional) : (serve) The memory usage [MB] of a driver over which it is replaced. Defaults to ``None``. (Unlimited)
+        path (str)                : (submit) Path to the form data json.
+        secret (str, optional)    : (submit) An identifier for the name of the ``secret_dict``.
+        params (dict, optional)   : (submit) Key and value combination for Github Secrets. You can specify by ``-P username=USERNAME``, ``-P password=PASSWORD``, etc.
+
+    Examples:
+        $ poetry run form-daemon serve --size 4
+        $ poetry run form-daemon submit ./.github/workflows-json/UHMRF.json \\
+                                        --secret UHMRF \\
+                                        -P "UHMRF_PLACE=ABC"
+
+    Returns:
+        int: Exit status.
+    """
+    parser = argparse.ArgumentParser(
+        description="Answer forms with pre-warmed Chrome drivers.",
+        add_help=True,
+    )
+    parser.add_argument("command", type=str, choices=["serve", "submit"])
+    parser.add_argument("path", type=str, nargs="?", help="(submit) Path to the form data json")
+    parser.add_argument(
+        "--address",
+        type=str,
+        default=DAEMON_SOCKET_PATH,
+        help="A path to the Unix domain socket, or a port number on 127.0.0.1 (which needs the token written by serve).",
+    )
+    parser.add_argument(
+        "--size", type=int, default=1, help="(serve) The number of warmed drivers. Defaults to 1"
+    )
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="Whether you want to be quiet or not. Defaults to False",
+    )
+    parser.add_argument(
+        "--browser",
+        action="store_true",
+        help="(serve) Whether you want to run Chrome with GUI browser. Defaults to False",
+    )
+    parser.add_argument(
+        "--driver",
+        type=str,
+        choices=list(DRIVER_PROFILES.keys()),
+        help="(serve) A driver profile of the warmed drivers.",
+    )
+    parser.add_argument(
+        "--remote",
+        type=str,
+        help="(serve) URL of Selenium Grid (or another remote WebDriver) on which the sessions are created.",
+    )
+    parser.add_argument(
+        "--max-jobs",
+        type=int,
+        help="(serve) The number of jobs after which a driver is replaced. Defaults to unlimited",
+    )
+    parser.add_argument(
+        "--max-rss",
+        type=float,
+        help="(serve) The memory usage [MB] of a driver over which it is replaced. Defaults to unlimited",
+    )
+    parser.add_argument(
+        "--secret",
+        type=str,
+        choices=list(SECRETS.keys()),
+        help="(submit) An identifier for the name of the secret_dict.",
+    )
+    parser.add_argument(
+        "-P",
+        "--secrets",
+        action=KwargsParamProcessor,
+        help="(submit) Key and value combination for Github Secrets. You can specify by -P username=USERNAME -P password=PASSWORD",
+    )
+    args = parser.parse_args(argv)
+    verbose = not args.quiet
+
+    if args.command == "serve":
+        with create_daemon(
+            address=args.address,
+            size=args.size,
+            browser=args.browser,
+            verbose=verbose,
+            profile=make_driver_spec(profile=args.driver, remote=args.remote),
+            max_jobs=args.max_jobs,
+            max_rss=args.max_rss,
+        ) as daemon:
+            try:
+                daemon.serve_forever()
+            except KeyboardInterrupt:
+                pass
+        return 0
+
+    if args.path is None:
+        parser.error("the following arguments are required for submit: path")
+    secrets_dict = SECRETS.get(args.secret, {}).copy()
+    secrets_dict.update({f"<{k}>": v for k, v in args.__dict__.items() if k not in ARGUMENT_KEYS})
+    result = submit_job(
+        path=args.path, secrets_dict=secrets_dict, address=args.address, verbose=verbose
+    )
+    memory: str = ""
+    if len(result.get("memory", {})) > 0:
+        memory = f" {result['memory']['rss']:.1f}MB ({result['memory']['delta']:+.1f}MB)"
+    if result["succeeded"]:
+        print(f"{toGREEN('OK')} {result['path']} {result['elapsed']:.2f}[s]{memory}")
+    else:
+        print(f"{toRED('FAILED')} {result['path']} {result['error']}{memory}")
+    return int(not result["succeeded"])
@@ -0,0 +1,102 @@
+# coding: utf-8
+"""Answering Forms on cron schedules.
+
+.. code-block:: shell
+    $ poetry run form-scheduler ./.github/workflows-json/schedule.json
+    $ poetry run form-scheduler ./.github/workflows-json/schedule.json --list 5
+    $ poetry run form-scheduler ./.github/workflows-json/schedule.json --once --jobs 4
+"""
+import argparse
+import sys
+
+from ..main import print_summary
+from ..scheduler import FormScheduler, load_schedule
+from ..utils._colorings import toBLUE, toRED
+from ..utils.driver_utils import DRIVER_PROFILES, make_driver_spec
+
+
+def form_scheduler_cli(argv: list = sys.argv[1:]) -> int:
+    """Answering Forms on cron schedules. (See :mod:`form_auto_fill_in.scheduler` for the schedule file.)
+
+    Args:
+        path (str)               : Path to the schedule file.
+        jobs (int, optional)     : The maximum number of forms answered concurrently. It overrides ``"jobs"`` in the schedule file.
+        once (bool, optional)    : Whether to answer every form just once now and exit. Defaults to ``False``.
+        list (int, optional)     : Show the next runs and exit.
+        quiet (bool, optional)   : Whether you want to be quiet or not. Defaults to ``False``.
+        browser (bool, optional) : Whether you want to run Chrome with GUI browser. Defaults to ``False``.
+        driver (str, optional)   : A driver profile which overrides ``"driver"`` in the json data. (``"default"`` or ``"lean"``)
+        remote (str, optional)   : URL of Selenium Grid (or another remote WebDriver) used instead of local Chrome. It overrides ``"driver.remote"`` in the json data.
+
+    Examples:
+        $ poetry run form-scheduler ./.github/workflows-json/schedule.json
+        $ poetry run form-scheduler ./.github/workflows-json/schedule.json --list 5
+
+    Returns:
+        int: Exit status. ``1`` if the schedule is invalid, or any form failed with ``--once``.
+    """
+    parser = argparse.ArgumentParser(
+        description="Answer forms on cron schedules.",
+        add_help=True,
+    )
+    parser.add_argument("path", type=str, help="Path to the schedule file.")
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        help="The maximum number of forms answered concurrently. It overrides 'jobs' in the schedule file.",
+    )
+    parser.add_argument(
+        "--once",
+        action="store_true",
+        help="Whether to answer every form just once now and exit. Defaults to False",
+    )
+    parser.add_argument("--list", type=int, metavar="N", help="Show the next N runs and exit.")
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="Whether you want to be quiet or not. Defaults to False",
+    )
+    parser.add_argument(
+        "--browser",
+        action="store_true",
+        help="Whether you want to run Chrome with GUI browser. Defaults to False",
+    )
+    parser.add_argument(
+        "--driver",
+        type=str,
+        choices=list(DRIVER_PROFILES.keys()),
+        help="A driver profile which overrides 'driver' in the json data.",
+    )
+    parser.add_argument(
+        "--remote",
+        type=str,
+        help="URL of Selenium Grid (or another remote WebDriver) used instead of local Chrome. (ex. http://127.0.0.1:4444/wd/hub)",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        schedule = load_schedule(args.path)
+    except (ValueError, OSError) as e:
+        print(toRED(f"[{e.__class__.__name__}] {e}"))
+        return 1
+    if args.jobs is not None:
+        schedule["jobs"] = args.jobs
+    scheduler = FormScheduler(
+        **schedule,
+        browser=args.browser,
+        verbose=not args.quiet,
+        driver_profile=make_driver_spec(profile=args.driver, remote=args.remote),
+    )
+
+    if args.list is not None:
+        for at, path in scheduler.upcoming(count=args.list):
+            print(f"{toBLUE(at.strftime('%Y-%m-%d %H:%M'))} {path}")
+        return 0
+
+    try:
+        results = scheduler.run(once=args.once)
+    except KeyboardInterrupt:
+        return 0
+    print_summary(results)
+    return int(not all([e["succeeded"] for e in results]))
@@ -3,24 +3,31 @@
 
 .. code-block:: shell
     $ poetry run show-forms --open
+    $ poetry run show-forms --form google --name UHMRF --sort pages --long
 """
 import argparse
-import json
-import os
 import sys
-from pathlib import Path
-from typing import Dict, List
 
-from ..utils._colorings import toBLUE, toGREEN
-from ..utils._path import FORM_AUTO_FILL_IN_DIR
-from ..utils.generic_utils import load_data, openf
+from ..utils._colorings import toBLUE, toGREEN, toRED
+from ..utils._path import FORM_AUTO_FILL_IN_DIR, ensure_form_dir
+from ..utils.generic_utils import openf
+from ..utils.index_utils import INDEX_SORT_KEYS, FormIndex
 
 
 def show_forms(argv: list = sys.argv[1:]):
     """Show All forms data at ``FORM_AUTO_FILL_IN_DIR``
 
+    The metadata of the forms are cached in :class:`FormIndex <form_auto_fill_in.utils.index_utils.FormIndex>`, and only the files changed since the last run are parsed.
+
     Args:
-        open (bool, optional) : Whether you want to open the target directory. Defaults to ``False``.
+        open (bool, optional)    : Whether you want to open the target directory. Defaults to ``False``.
+        name (str, optional)     : Show only the forms whose name contains it.
+        form (str, optional)     : Show only the forms of this type. (ex. ``"google"``)
+        host (str, optional)     : Show only the forms whose URL host contains it.
+        sort (str, optional)     : A key to sort. Defaults to ``"path"``.
+        reverse (bool, optional) : Whether to sort in descending order. Defaults to ``False``.
+        long (bool, optional)    : Whether to show the form type, host, number of pages and content hash. Defaults to ``False``.
+        rebuild (bool, optional) : Whether to rebuild the index from scratch. Defaults to ``False``.
 
     Examples:
         $ poetry run show-forms --open
@@ -34,13 +41,41 @@ def show_forms(argv: list = sys.argv[1:]):
         action="store_true",
         help="Whether you want to open the target directory.",
     )
+    parser.add_argument("--name", type=str, help="Show only the forms whose name contains it.")
+    parser.add_argument("--form", type=str, help="Show only the forms of this type.")
+    parser.add_argument("--host", type=str, help="Show only the forms whose URL host contains it.")
+    parser.add_argument(
+        "--sort", type=str, choices=INDEX_SORT_KEYS, default="path", help="A key to sort."
+    )
+    parser.add_argument(
+        "--reverse", action="store_true", help="Whether to sort in descending order."
+    )
+    parser.add_argument(
+        "-l",
+        "--long",
+        action="store_true",
+        help="Whether to show the form type, host, number of pages and content hash.",
+    )
+    parser.add_argument(
+        "--rebuild", action="store_true", help="Whether to rebuild the index from scratch."
+    )
     args = parser.parse_args(argv)
 
+    ensure_form_dir()
     print(f"Show ALL JSON files at {toGREEN(FORM_AUTO_FILL_IN_DIR)}")
-    p = Path(FORM_AUTO_FILL_IN_DIR)
-    for fp in p.glob("**/*.json"):
-        data = load_data(fp)
-        print(f"{toBLUE(fp.name)} : {data.get('name', 'NO NAME')}")
+    with FormIndex(root=FORM_AUTO_FILL_IN_DIR) as index:
+        index.update(rebuild=args.rebuild)
+        rows = index.search(
+            name=args.name, form=args.form, host=args.host, sort=args.sort, reverse=args.reverse
+        )
+    for row in rows:
+        if row["error"] is not None:
+            print(f"{toBLUE(row['path'])} : {toRED(row['error'])}")
+            continue
+        line = f"{toBLUE(row['path'])} : {row['name'] or 'NO NAME'}"
+        if args.long:
+            line += f" ({row['form']}, {row['host']}, {row['pages']} page(s), {row['sha256'][:12]})"
+        print(line)
 
     if args.open:
         openf(FORM_AUTO_FILL_IN_DIR)
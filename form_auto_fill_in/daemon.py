@@ -0,0 +1,219 @@
+# coding: utf-8
+"""A long-lived daemon which answers forms with pre-warmed Chrome drivers.
+
+Jobs are sent as one line of JSON over a local socket, and the result is sent back as one line of JSON.
+
+.. code-block:: json
+
+    {"path": "UHMRF.json", "secrets": {"<UHMRF_PLACE>": "ABC"}}
+    {"path": "UHMRF.json", "succeeded": true, "elapsed": 3.14, "error": "", "memory": {"jobs": 1, "rss": 312.4, "delta": 41.2, "recycled": ""}}
+
+``"memory"`` is the usage of the driver after the job. (See :meth:`ChromeDriverPool.acquire <form_auto_fill_in.utils.driver_utils.ChromeDriverPool.acquire>`)
+
+Jobs run with the secrets and the cached sessions of the user who started the daemon, so only that user can submit them. The Unix domain socket is created with the permission ``0600``. Any local user can connect to a TCP port, so each job line on it must have ``"token"``, which is written to a file readable only by the user (See :func:`token_path`) and read by :func:`submit_job`.
+"""
+import hmac
+import json
+import os
+import secrets
+import socket
+import socketserver
+from typing import Any, Dict, Optional, Union
+
+from .main import _answer_form_worker
+from .utils._colorings import toBLUE
+from .utils._path import FORM_AUTO_FILL_IN_DIR
+from .utils.driver_utils import ChromeDriverPool, DriverSpec
+from .utils.generic_utils import load_data, save_data
+
+DAEMON_SOCKET_PATH: str = os.path.join(FORM_AUTO_FILL_IN_DIR, "daemon.sock")
+
+
+def parse_address(address: Union[str, int, None] = None) -> Union[str, tuple]:
+    """Parse the address of the daemon.
+
+    Args:
+        address (Union[str, int, None], optional) : A path to the Unix domain socket, or a port number on ``127.0.0.1``. Defaults to ``DAEMON_SOCKET_PATH``.
+
+    Returns:
+        Union[str, tuple]: A path or a ``(host, port)`` tuple.
+    """
+    if address is None:
+        return DAEMON_SOCKET_PATH
+    if isinstance(address, int) or str(address).isdigit():
+        return ("127.0.0.1", int(address))
+    return str(address)
+
+
+def token_path(address: tuple) -> str:
+    """Get the path to the file of the token of the daemon listening on ``address`` (``(host, port)``)."""
+    return os.path.join(FORM_AUTO_FILL_IN_DIR, f"daemon-{address[1]}.token")
+
+
+class FormJobHandler(socketserver.StreamRequestHandler):
+    """Answer a form for each line of JSON with a driver from ``server.pool``. Lines without the token of the server (if it has one) are rejected, and the connection is closed."""
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            if len(line.strip()) == 0:
+                continue
+            rejected: bool = False
+            try:
+                job: Dict[str, Any] = json.loads(line)
+                if self.server.token is not None and not hmac.compare_digest(
+                    str(job.get("token", "")), self.server.token
+                ):
+                    rejected = True
+                    raise PermissionError("The token is wrong.")
+                usage: Dict[str, Any] = {}
+                with self.server.pool.acquire(usage=usage) as driver:
+                    result = _answer_form_worker(
+                        path=job["path"],
+                        secrets_dict=job.get("secrets", {}),
+                        verbose=job.get("verbose", self.server.verbose),
+                        driver=driver,
+                    )
+                result["memory"] = usage
+            except Exception as e:
+                result = {
+                    "path": None,
+                    "succeeded": False,
+                    "elapsed": 0.0,
+                    "error": f"[{e.__class__.__name__}] {e}",
+                }
+            self.wfile.write((json.dumps(result) + "\n").encode("utf-8"))
+            self.wfile.flush()
+            if rejected:
+                break
+
+
+class FormDaemonMixIn(socketserver.ThreadingMixIn):
+    """Hold a :class:`ChromeDriverPool <form_auto_fill_in.utils.driver_utils.ChromeDriverPool>` which is shared by the handlers."""
+
+    daemon_threads: bool = True
+    allow_reuse_address: bool = True
+    pool: ChromeDriverPool
+    verbose: bool
+    token: Optional[str] = None
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.pool.close()
+        if isinstance(self.server_address, str) and os.path.exists(self.server_address):
+            os.remove(self.server_address)
+        if isinstance(self.server_address, tuple) and os.path.exists(
+            token_path(self.server_address)
+        ):
+            os.remove(token_path(self.server_address))
+
+
+class TCPFormDaemon(FormDaemonMixIn, socketserver.TCPServer):
+    """A :class:`FormDaemonMixIn` listening on ``127.0.0.1``. Jobs must have :attr:`token`."""
+
+
+if hasattr(socketserver, "UnixStreamServer"):
+
+    class UnixFormDaemon(FormDaemonMixIn, socketserver.UnixStreamServer):
+        """A :class:`FormDaemonMixIn` listening on a Unix domain socket."""
+
+
+def create_daemon(
+    address: Union[str, int, None] = None,
+    size: int = 1,
+    browser: bool = False,
+    verbose: bool = True,
+    profile: DriverSpec = None,
+    max_jobs: Optional[int] = None,
+    max_rss: Optional[float] = None,
+) -> FormDaemonMixIn:
+    """Create a daemon which answers forms with ``size`` pre-warmed Chrome drivers.
+
+    Args:
+        address (Union[str, int, None], optional) : A path to the Unix domain socket, or a port number on ``127.0.0.1``. Defaults to ``DAEMON_SOCKET_PATH``.
+        size (int, optional)                      : The number of warmed drivers. Defaults to ``1``.
+        browser (bool, optional)                  : Whether you want to run Chrome with GUI browser. Defaults to ``False``.
+        verbose (bool, optional)                  : Whether to print message or not. Defaults to ``True``.
+        profile (DriverSpec, optional)            : A driver profile of the warmed drivers. (``"driver"`` in the json data of each job is ignored, because the drivers are launched in advance.) Defaults to ``None``.
+        max_jobs (Optional[int], optional)        : The number of jobs after which a driver is replaced. Defaults to ``None``. (Unlimited)
+        max_rss (Optional[float], optional)       : The memory usage [MB] of a driver over which it is replaced. Defaults to ``None``. (Unlimited)
+
+    Returns:
+        FormDaemonMixIn: A daemon. Call ``serve_forever()`` to start it.
+
+    Examples:
+        >>> from form_auto_fill_in.daemon import create_daemon
+        >>> with create_daemon(size=2) as daemon:
+        ...     daemon.serve_forever()
+    """
+    address = parse_address(address)
+    if isinstance(address, tuple):
+        daemon = TCPFormDaemon(address, FormJobHandler, bind_and_activate=False)
+    else:
+        os.makedirs(os.path.dirname(os.path.abspath(address)), exist_ok=True)
+        if os.path.exists(address):
+            os.remove(address)
+        daemon = UnixFormDaemon(address, FormJobHandler, bind_and_activate=False)
+    daemon.verbose = verbose
+    daemon.pool = ChromeDriverPool(
+        size=size,
+        browser=browser,
+        profile=profile,
+        max_jobs=max_jobs,
+        max_rss=max_rss,
+        verbose=verbose,
+    )
+    try:
+        if isinstance(address, tuple):
+            daemon.server_bind()
+            daemon.token = secrets.token_hex(32)
+            save_data({"token": daemon.token}, token_path(daemon.server_address), mode=0o600)
+        else:
+            # Secrets are sent through this socket, so nobody else may connect even for a moment.
+            umask: int = os.umask(0o077)
+            try:
+                daemon.server_bind()
+            finally:
+                os.umask(umask)
+        daemon.server_activate()
+    except Exception:
+        daemon.server_close()
+        raise
+    if verbose:
+        print(f"Listening on {toBLUE(address)} with {size} driver(s).")
+    return daemon
+
+
+def submit_job(
+    path: str,
+    secrets_dict: Dict[str, str] = {},
+    address: Union[str, int, None] = None,
+    verbose: Optional[bool] = None,
+    token: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Submit a job to the running daemon (See :func:`create_daemon`) and wait for the result.
+
+    Args:
+        path (str)                                : Path to the form data json. (Resolved on the daemon side.)
+        secrets_dict (Dict[str, str], optional)   : Key and value pairs defined in github secrets. Defaults to ``{}``.
+        address (Union[str, int, None], optional) : A path to the Unix domain socket, or a port number on ``127.0.0.1``. Defaults to ``DAEMON_SOCKET_PATH``.
+        verbose (Optional[bool], optional)        : Whether the daemon prints message or not. If ``None``, the daemon's setting is used. Defaults to ``None``.
+        token (Optional[str], optional)           : The token of the daemon on a TCP port. Defaults to the one in :func:`token_path`.
+
+    Returns:
+        Dict[str, Any]: The result with ``"path"``, ``"succeeded"``, ``"elapsed"`` and ``"error"``.
+    """
+    address = parse_address(address)
+    job: Dict[str, Any] = {"path": os.path.abspath(path), "secrets": secrets_dict}
+    if not os.path.exists(path):
+        job["path"] = path
+    if verbose is not None:
+        job["verbose"] = verbose
+    if isinstance(address, tuple):
+        job["token"] = token or load_data(token_path(address))["token"]
+    family = socket.AF_INET if isinstance(address, tuple) else socket.AF_UNIX
+    with socket.socket(family, socket.SOCK_STREAM) as sock:
+        sock.connect(address)
+        with sock.makefile(mode="rw", encoding="utf-8") as f:
+            f.write(json.dumps(job) + "\n")
+            f.flush()
+            return json.loads(f.readline())
@@ -1,16 +1,33 @@
 # coding: utf-8
-import re
-from typing import Dict, List, Union
+"""Form models. They are imported only when they are used. (See :mod:`registry <form_auto_fill_in.forms.registry>` for adding form models of other packages.)"""
+from __future__ import annotations
 
-from ..utils.generic_utils import handleKeyError
-from . import base, google, office
-from .base import BaseForm
-from .google import GoogleForm
-from .office import OfficeForm
+import importlib
+from typing import TYPE_CHECKING, Any, Dict, List, Union
 
-__all__: List[str] = ["GoogleForm", "OfficeForm"]
+from .registry import FormRegistry
 
-domain2form: Dict[str, str] = {"forms.gle": "google", "forms.office.com": "office"}
+if TYPE_CHECKING:
+    from .base import BaseForm
+
+__all__: List[str] = ["GoogleForm", "GoogleHTTPForm", "OfficeForm"]
+
+#: Built-in form models. (``"<module>:<class>"``)
+builtin_forms: Dict[str, str] = {
+    "google": f"{__name__}.google:GoogleForm",
+    "google-http": f"{__name__}.google_http:GoogleHTTPForm",
+    "office": f"{__name__}.office:OfficeForm",
+}
+
+#: Built-in URL patterns. (See :mod:`registry <form_auto_fill_in.forms.registry>`)
+domain2form: Dict[str, str] = {
+    "forms.gle": "google",
+    "docs.google.com/forms": "google",
+    "forms.office.com": "office",
+}
+
+all: FormRegistry = FormRegistry(forms=builtin_forms, hosts=domain2form)
+register = all.register
 
 
 def url2form(url: str) -> str:
@@ -21,16 +38,12 @@ def url2form(url: str) -> str:
 
     Raises:
         ValueError: When ``url`` is not a valid URL.
+        KeyError: When no pattern matches ``url``.
 
     Returns:
         str: An identifier for the Form Model.
     """
-    match: Union[re.Match, type(None)] = re.match(pattern=r"https?://(.+?)/", string=url)
-    if match is None:
-        raise ValueError(f"It doesn't seem to be a valid url, got url='{url}'")
-    domain = match.group(1)
-    handleKeyError(lst=domain2form.keys(), domain=domain)
-    return domain2form[domain]
+    return all.url2form(url)
 
 
 def get(identifier: Union[str, BaseForm], *args, **kwargs) -> BaseForm:
@@ -43,11 +56,17 @@ def get(identifier: Union[str, BaseForm], *args, **kwargs) -> BaseForm:
         BaseForm: A target Form Model instance.
     """
     if isinstance(identifier, str):
-        handleKeyError(lst=all.keys(), identifier=identifier)
         instance = all[identifier](*args, **kwargs)
     else:
         instance = identifier
     return instance
 
 
-all: Dict[str, BaseForm] = {"google": GoogleForm, "office": OfficeForm}
+def __getattr__(name: str) -> Any:
+    # Import the form models (ex. ``forms.GoogleForm``) and modules (ex. ``forms.base``) on access.
+    for identifier, target in builtin_forms.items():
+        if target.endswith(f":{name}"):
+            return all[identifier]
+    if name in ["base", "google", "google_http", "office"]:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,47 +1,140 @@
 # coding: utf-8
+from __future__ import annotations
+
 import copy
 import time
 from abc import ABC, abstractmethod
 from collections import deque
-from typing import Any, Callable, Dict, List, Optional, Union
-
-from selenium.webdriver.remote.webdriver import WebDriver
-from selenium.webdriver.remote.webelement import WebElement
-
-from ..utils._colorings import toACCENT, toBLUE, toGREEN
-from ..utils._path import canonicalize_path
-from ..utils.driver_utils import get_chrome_driver, try_find_element_func
-from ..utils.generic_utils import load_data, wrap_end, wrap_start
+from contextlib import contextmanager
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+if TYPE_CHECKING:
+    from selenium.webdriver.remote.webdriver import WebDriver
+    from selenium.webdriver.remote.webelement import WebElement
+
+    from ..utils.async_driver_utils import AsyncWebDriver, AsyncWebElement
+
+from ..utils._colorings import toACCENT, toBLUE, toGREEN, toRED
+from ..utils.checkpoint_utils import Checkpoint, checkpoint_path
+from ..utils.driver_utils import (
+    DriverSpec,
+    SessionLostError,
+    get_chrome_driver,
+    get_driver_profile,
+    is_session_alive,
+    merge_driver_specs,
+    quit_driver,
+    try_find_element,
+    try_find_element_func,
+    wait_until_left,
+    wait_until_settled,
+)
+from ..utils.generic_utils import try_wrapper, wrap_end, wrap_start
+from ..utils.log_utils import Logger, get_logger
+from ..utils.plan_utils import FormPlan, load_plan
+from ..utils.schema_utils import load_schema
+from ..utils.session_utils import delete_session, restore_session, save_session, session_path
+from ..utils.trace_utils import span
 
 
 class BaseForm(ABC):
     """Abstract Basement Class for Answering Form Automatically.
 
     Args:
-        path (str)                              : Path to json data that describes the procedure of form.
-        secrets_dict (Dict[str, str], optional) : Key and value pairs defined in github secrets. It is used because the password etc. is not output as it is. Defaults to ``{}``.
-        verbose (bool, optional)                : Whether to print message or not. Defaults to ``True``.
+        path (str)                                     : Path to json data that describes the procedure of form.
+        secrets_dict (Dict[str, str], optional)        : Key and value pairs defined in github secrets. It is used because the password etc. is not output as it is. Defaults to ``{}``.
+        verbose (bool, optional)                       : Whether to print message or not. Defaults to ``True``.
+        session (bool, optional)                       : Whether to reuse the authenticated session saved in the previous run. It is also enabled by ``"session"`` in the json data. Defaults to ``False``.
+        plan (Optional[FormPlan], optional)            : The compiled plan of ``path``. If ``None``, it is loaded by :func:`load_plan <form_auto_fill_in.utils.plan_utils.load_plan>`. Defaults to ``None``.
+        overrides (Optional[Dict[str, Any]], optional) : Answers which update ``"answer"`` in the json data for each page index and question identifier. (ex. ``{"0": {"3": {"no": 2}}}``, See :meth:`FormPlan.resolve <form_auto_fill_in.utils.plan_utils.FormPlan.resolve>`) Defaults to ``None``.
+        driver_profile (DriverSpec, optional)          : A driver profile (ex. ``"lean"`` or ``{"remote": "http://127.0.0.1:4444"}``) whose keys override those of ``"driver"`` in the json data. (See :func:`get_driver_profile <form_auto_fill_in.utils.driver_utils.get_driver_profile>`) Defaults to ``None``.
+        resume (bool, optional)                        : Whether to resume from the checkpoint of the previous failed run. Finished pages are answered again quietly with the recorded answers, and questions are not asked again. Defaults to ``False``.
+        reconnects (int, optional)                     : How many times to launch a new driver and resume when the session is lost in :meth:`run`. Defaults to ``2``.
+        log_level (Optional[str], optional)            : The level of :attr:`logger` which overrides ``verbose``. (``"debug"``, ``"info"``, ``"warning"``, ``"error"`` or ``"quiet"``) Defaults to ``None``.
+        log_file (Optional[str], optional)             : Path to the JSONL file which log records are appended to in a background thread instead of printing. Defaults to ``None``.
+
+    Raises:
+        FormPlanError: When the json data is invalid, or secrets used in it are not in ``secrets_dict``.
 
     Attributes:
         verbose (bool)                      : Whether to print message or not. Defaults to ``True``.
-        print (Callable[[Any], type(None)]) : Print function according to ``verbose``
-        data (Dict[str, Any])               : Data that describes the procedure of form.
+        logger (Logger)                     : The logger. (See :mod:`form_auto_fill_in.utils.log_utils`) Messages which need WebDriver commands are given as callables, so they are not evaluated in quiet runs.
+        print (Logger)                      : The same as :attr:`logger`, which can be called like ``print``.
+        plan (FormPlan)                     : The compiled plan of the json data.
+        data (Dict[str, Any])               : Data that describes the procedure of form. (A copy of the plan. ``<SECRET>`` placeholders are kept, and decoded with ``secrets_dict`` where they are used.)
         secrets_dict (Dict[str, str])       :
         path (str)                          : Path to json data that describes the procedure of form.
+        session (Dict[str, Any])            : Options of the session cache. (``{}`` if disabled.) ``"account"`` is a secret which identifies the account, and ``"authenticated"`` is a locator (``by`` and ``identifier``) of the element which only appears after login.
+        fast_fill (bool)                    : Whether to fill in text fields with a single script call instead of typing them. It is enabled by ``"fast_fill": true`` in the json data, and can be overridden by ``"fast"`` in each login step or answer. (Values with special keys such as ``Keys.ENTER`` are always typed.)
+        driver_profile (DriverSpec)         : The profile of the driver prepared in :meth:`run`. (``"driver"`` in the json data merged with ``driver_profile``) It is not applied to drivers passed to :meth:`run`.
+        checkpoint (Checkpoint)             : Progress of this form. It is saved after each question and page, and deleted when the form is answered.
+        reconnects (int)                    : How many times to launch a new driver and resume when the session is lost.
+        schema (Optional[Dict[str, Any]])   : The schema of this form recorded by ``crawl-form`` with the same json data. (See :mod:`form_auto_fill_in.utils.schema_utils`) Each page is finished when a scan after the expected questions are answered finds no new question. ``None`` if it is not cached, or the form has changed.
+        crawled (Optional[Dict[str, Any]])  : The schema being recorded in :meth:`crawl`. (``None`` otherwise.)
+        form_title_selector (str)           : A CSS selector of the element which has the title of the form. (Used in asyncio methods.)
+        question_container (str)            : A CSS selector of the element which contains all questions. It is observed to detect when the page settles.
+        snapshot_script (Optional[str])     : A JavaScript which returns the snapshots of all visible questions at once. (See :meth:`find_question_snapshots`)
     """
 
+    question_container: str = "body"
+    form_title_selector: str = "title"
+    snapshot_script: Optional[str] = None
+
     def __init__(
         self,
         path: str,
         secrets_dict: Dict[str, str] = {},
         verbose: bool = True,
+        session: bool = False,
+        plan: Optional[FormPlan] = None,
+        overrides: Optional[Dict[str, Dict[str, Dict[str, Any]]]] = None,
+        driver_profile: DriverSpec = None,
+        resume: bool = False,
+        reconnects: int = 2,
+        log_level: Optional[str] = None,
+        log_file: Optional[str] = None,
         **kwargs,
     ):
         self.verbose: bool = verbose
-        self.print: Callable[[Any], type(None)] = print if verbose else lambda *args: None
-        self.data: Dict[str, Any] = load_data(canonicalize_path(path))
+        self.logger: Logger = get_logger(
+            verbose=verbose, level=log_level, log_file=log_file, path=path
+        )
+        self.print: Logger = self.logger
+        self.plan: FormPlan = plan or load_plan(path)
+        self.data: Dict[str, Any] = self.plan.resolve(
+            secrets_dict=secrets_dict, path=path, overrides=overrides
+        )
         self.secrets_dict: Dict[str, str] = secrets_dict
         self.path: str = path
+        self.fast_fill: bool = self.data.get("fast_fill", False)
+        self.driver_profile: DriverSpec = merge_driver_specs(
+            self.data.get("driver"), driver_profile
+        )
+        self.checkpoint: Checkpoint = Checkpoint(
+            path=checkpoint_path(path=path, secrets_dict=secrets_dict), key=self.plan.key
+        )
+        if resume:
+            self.checkpoint = Checkpoint.load(path=self.checkpoint.path, key=self.plan.key)
+        self.reconnects: int = reconnects
+        self.schema: Optional[Dict[str, Any]] = load_schema(url=self.data.get("URL"))
+        if self.schema is not None and self.schema.get("key") != self.plan.key:
+            # Questions which appear depend on the answers, so only the schema crawled with this json is used.
+            self.schema = None
+        self.crawled: Optional[Dict[str, Any]] = None
+        session_data: Union[bool, Dict[str, Any]] = self.data.get("session") or session
+        if not isinstance(session_data, dict):
+            session_data = {"enabled": True} if session_data else {}
+        self.session: Dict[str, Any] = session_data
 
     # <--- Useful Methods ---
     def decode_secrets(self, string: Union[str, List[str]]) -> str:
@@ -71,12 +164,200 @@ class BaseForm(ABC):
         num_labels: int = len(labels)
         digit: int = len(str(num_labels))
 
-        for i, label in enumerate(labels, start=1):
-            mark: str = " "
-            if i in checks or str(i) in checks:
-                label.click()
-                mark = "x"
-            self.print(f"\t{i:>0{digit}}/{num_labels} [{mark}] {self.get_label_text(label)}")
+        with span("check_labels", num_labels=num_labels):
+            for i, label in enumerate(labels, start=1):
+                mark: str = " "
+                if i in checks or str(i) in checks:
+                    label.click()
+                    mark = "x"
+                # The label text costs WebDriver commands, so it is only got when printed.
+                self.print(
+                    lambda: f"\t{i:>0{digit}}/{num_labels} [{mark}] {self.get_label_text(label)}"
+                )
+
+    def get_session_path(self) -> Optional[str]:
+        """Get the path of the session file for this form and account.
+
+        The account is identified by ``"account"`` in the session options, or by the value of the first ``send_keys`` login step (ex. ``"<UTOKYO_ACCOUNT_MAIL_ADDRESS>"``).
+
+        Returns:
+            Optional[str]: Path to the session file. ``None`` if the session cache is disabled or login is not required.
+        """
+        login_steps: List[Dict[str, Any]] = self.data.get("login", [])
+        if len(self.session) == 0 or len(login_steps) == 0:
+            return None
+        account: str = self.session.get(
+            "account",
+            next((e.get("value", "") for e in login_steps if e.get("func") == "send_keys"), ""),
+        )
+        return session_path(url=self.data.get("URL"), account=self.decode_secrets(account))
+
+    def is_authenticated(self, driver: WebDriver) -> bool:
+        """Check whether the current page is already authenticated.
+
+        If ``"authenticated"`` locator is given in the session options, the page is authenticated when it is found. Otherwise, the element of the first login step is awaited with its ``"timeout"`` and ``"poll"`` (the login form may be rendered after a JavaScript or SSO redirect), and the page is authenticated only when it doesn't appear. The locator is recommended because the login form is awaited for the whole timeout on authenticated pages.
+
+        Args:
+            driver (WebDriver) : An instance of Selenium ``WebDriver``.
+
+        Returns:
+            bool: Whether the current page is authenticated or not.
+        """
+        locator: Optional[Dict[str, Any]] = self.session.get("authenticated")
+        if locator is not None:
+            return (
+                try_find_element(
+                    driver=driver,
+                    by=locator["by"],
+                    identifier=locator["identifier"],
+                    timeout=locator.get("timeout", 3),
+                    poll=locator.get("poll"),
+                    verbose=False,
+                )
+                is not None
+            )
+        first_step: Dict[str, Any] = self.data.get("login", [{}])[0]
+        return (
+            try_find_element(
+                driver=driver,
+                by=first_step["by"],
+                identifier=first_step["identifier"],
+                timeout=first_step.get("timeout", 3),
+                poll=first_step.get("poll"),
+                verbose=False,
+            )
+            is None
+        )
+
+    def find_question_snapshots(self, driver: WebDriver) -> List[Dict[str, Any]]:
+        """Get the snapshots of all visible questions in the form using ``driver``.
+
+        Each snapshot is a dictionary with the following keys:
+
+        - ``"element"``    : A question ``WebElement``.
+        - ``"identifier"`` : The identifier of the question.
+        - ``"title"``      : The title of the question. (``None`` if not collected yet.)
+        - ``"type"``       : The input type of the question. (``"radio"``, ``"checkbox"``, ``"text"``, ...)
+        - ``"options"``    : List of option labels.
+
+        If :attr:`snapshot_script` is defined, all of them are collected with a single ``execute_script`` call, otherwise (or when the script fails) each question is inspected with :meth:`find_visible_questions` and :meth:`find_question_identifier`.
+
+        Args:
+            driver (WebDriver) : An instance of Selenium ``WebDriver``.
+
+        Returns:
+            List[Dict[str, Any]]: Snapshots of visible questions.
+        """
+        if self.snapshot_script is not None:
+            snapshots = try_wrapper(
+                func=driver.execute_script,
+                script=self.snapshot_script,
+                msg_="take snapshots of visible questions",
+                verbose_=False,
+            )
+            if snapshots is not None:
+                return snapshots
+        return [
+            {
+                "element": question,
+                "identifier": self.find_question_identifier(driver=driver, question=question),
+                "title": None,
+                "type": "",
+                "options": [],
+            }
+            for question in self.find_visible_questions(driver=driver)
+        ]
+
+    def get_question_title(self, driver: WebDriver, snapshot: Dict[str, Any]) -> str:
+        """Get the title of the question in ``snapshot``. If it is not collected yet, it is found with :meth:`find_question_title` and kept in ``snapshot``."""
+        if snapshot.get("title") is None:
+            snapshot["title"] = self.find_question_title(
+                driver=driver, question=snapshot["element"]
+            )
+        return snapshot["title"]
+
+    @contextmanager
+    def quiet(self, enabled: bool = True) -> Iterator[None]:
+        """Don't print messages in the ``with`` block if ``enabled``."""
+        with self.logger.muted(enabled=enabled):
+            yield
+
+    def check_session(self, driver: WebDriver) -> None:
+        """Raise :class:`SessionLostError <form_auto_fill_in.utils.driver_utils.SessionLostError>` if the session of ``driver`` doesn't respond."""
+        if not is_session_alive(driver):
+            raise SessionLostError(f"The session is lost while answering {self.path}")
+
+    @classmethod
+    def check_answer(
+        cls, question: Dict[str, Any], answer: Optional[Dict[str, Any]] = None
+    ) -> Tuple[List[str], List[str]]:
+        """Check ``answer`` of ``question`` in the cached schema without browser. (See :mod:`form_auto_fill_in.utils.schema_utils`)
+
+        Args:
+            question (Dict[str, Any])                   : A question in the cached schema.
+            answer (Optional[Dict[str, Any]], optional) : The answer in the json data. ``None`` if the question is not answered. Defaults to ``None``.
+
+        Returns:
+            Tuple[List[str], List[str]]: Errors (it will fail) and warnings (it will be asked on demand).
+        """
+        if answer is None:
+            return [], ["is not answered, and will be asked on demand"]
+        return [], []
+
+    def find_question_labels(self, question: WebElement) -> List[WebElement]:
+        """Get the option elements of ``question``, whose texts are extracted by :meth:`get_label_text`."""
+        return question.find_elements_by_tag_name(name="label")
+
+    def find_question_type(self, driver: WebDriver, question: WebElement) -> str:
+        """Get the input type of ``question``. (The same as ``"type"`` in the snapshots of :meth:`find_question_snapshots`)"""
+        inputElements: List[WebElement] = question.find_elements_by_tag_name(name="input")
+        if len(inputElements) > 0:
+            return inputElements[0].get_attribute("type")
+        if len(question.find_elements_by_tag_name(name="textarea")) > 0:
+            return "textarea"
+        return "text"
+
+    def describe_question(
+        self, driver: WebDriver, question: WebElement, identifier: str, title: str
+    ) -> Dict[str, Any]:
+        """Describe ``question`` for the schema recorded in :meth:`crawl`.
+
+        Args:
+            driver (WebDriver)    : An instance of Selenium ``WebDriver``.
+            question (WebElement) : A question ``WebElement``.
+            identifier (str)      : The identifier of the question.
+            title (str)           : The title of the question.
+
+        Returns:
+            Dict[str, Any]: The question with ``"identifier"``, ``"title"``, ``"type"`` and ``"options"``.
+        """
+        return {
+            "identifier": identifier,
+            "title": title,
+            "type": self.find_question_type(driver=driver, question=question),
+            "options": [
+                self.get_label_text(label) for label in self.find_question_labels(question)
+            ],
+        }
+
+    def match_schema(self, snapshot: Dict[str, Any], expected: Dict[str, Dict[str, Any]]) -> bool:
+        """Whether ``snapshot`` matches the question in :attr:`schema`. The type and the number of options are compared only if the snapshot has them.
+
+        Args:
+            snapshot (Dict[str, Any])             : A snapshot of the question. (See :meth:`find_question_snapshots`)
+            expected (Dict[str, Dict[str, Any]])  : Questions of the page in :attr:`schema` for each identifier.
+
+        Returns:
+            bool: Whether it matches.
+        """
+        question: Optional[Dict[str, Any]] = expected.get(snapshot["identifier"])
+        if question is None:
+            return False
+        if snapshot.get("type"):
+            return snapshot["type"] == question["type"] and len(snapshot["options"]) == len(
+                question["options"]
+            )
+        return True
 
     def input_answer(self, msg: str = "Your Answer{isMultiple}", isMultiple=False) -> Any:
         """Get an answer from user with standard input. (``input()``)
@@ -107,16 +388,74 @@ class BaseForm(ABC):
     # --- Useful Methods --->
 
     # <--- Main Methods ---
-    def run(self, browser: bool = False, **kwargs) -> None:
+    def run(self, browser: bool = False, driver: Optional[WebDriver] = None, **kwargs) -> None:
         """Prepare a driver at once and execute the flow from login, answer, and logout of the form.
 
+        If the session of the prepared driver is lost (ex. Chrome crashed), a new driver is launched, and the flow is resumed from :attr:`checkpoint` up to :attr:`reconnects` times.
+
+        Args:
+            browser (bool, optional)               : Whether you want to run Chrome with GUI browser. Defaults to ``False``.
+            driver (Optional[WebDriver], optional) : An already running driver (ex. from :class:`ChromeDriverPool <form_auto_fill_in.utils.driver_utils.ChromeDriverPool>`). It is not quit after the flow. If ``None``, a new driver is prepared. Defaults to ``None``.
+
+        Raises:
+            SessionLostError: When the session is lost more than :attr:`reconnects` times, or the session of ``driver`` is lost.
+        """
+        if driver is None:
+            for reconnect in range(self.reconnects + 1):
+                with span("get_chrome_driver"):
+                    driver = get_chrome_driver(browser=browser, profile=self.driver_profile)
+                try:
+                    self.run(driver=driver, **kwargs)
+                    return
+                except SessionLostError as e:
+                    if reconnect == self.reconnects:
+                        raise
+                    self.print(
+                        toRED(f"{e}. Reconnect and resume from the {self.checkpoint.page}th page.")
+                    )
+                finally:
+                    quit_driver(driver)
+        with span("run", path=self.path):
+            try:
+                with span("login"):
+                    self.login(driver=driver)
+                    self.check_session(driver=driver)
+                with span("answer_form"):
+                    self.answer_form(driver=driver, **kwargs)
+            except SessionLostError:
+                raise
+            except Exception as e:
+                if is_session_alive(driver):
+                    raise
+                raise SessionLostError(
+                    f"The session is lost while answering {self.path} ([{e.__class__.__name__}] {e})"
+                ) from e
+            finally:
+                self.logger.flush()
+            with span("logout"):
+                self.logout(driver=driver)
+        self.checkpoint.delete()
+        self.logger.flush()
+
+    def crawl(
+        self, browser: bool = False, driver: Optional[WebDriver] = None, submit: bool = False
+    ) -> Dict[str, Any]:
+        """Walk each page of the form once (answering it with the json data), and record the schema of the form. (See :mod:`form_auto_fill_in.utils.schema_utils`)
+
         Args:
-            browser (bool, optional) : Whether you want to run Chrome with GUI browser. Defaults to ``False``.
+            browser (bool, optional)               : Whether you want to run Chrome with GUI browser. Defaults to ``False``.
+            driver (Optional[WebDriver], optional) : An already running driver. Defaults to ``None``.
+            submit (bool, optional)                : Whether to do the ``next`` step of the last page. (Usually, it submits the form.) Defaults to ``False``.
+
+        Returns:
+            Dict[str, Any]: The schema with ``"URL"``, ``"form"``, ``"key"`` (of the plan), ``"title"`` and ``"pages"``.
         """
-        with get_chrome_driver(browser=browser) as driver:
-            self.login(driver=driver)
-            self.answer_form(driver=driver, **kwargs)
-            self.logout(driver=driver)
+        self.crawled = {"URL": self.data.get("URL"), "form": self.plan.form, "key": self.plan.key}
+        try:
+            self.run(browser=browser, driver=driver, submit=submit)
+            return self.crawled
+        finally:
+            self.crawled = None
 
     def login(self, driver: WebDriver) -> None:
         """Perform the login procedure required to answer the form.
@@ -127,82 +466,410 @@ class BaseForm(ABC):
         url: str = self.data.get("URL")
         if url is not None:
             self.print(f"Visit Form: {toBLUE(url)}")
-            driver.get(url)
+            with span("login.visit", url=url):
+                driver.get(url)
+            path: Optional[str] = self.get_session_path()
+            if path is not None and restore_session(driver=driver, path=path):
+                with span("login.restore_session"):
+                    driver.get(url)
+                    authenticated: bool = self.is_authenticated(driver=driver)
+                if authenticated:
+                    self.print(toGREEN("Restored the authenticated session. Skip login."))
+                    return
+                self.print("The saved session has expired.")
+                delete_session(path=path)
+            self.print(wrap_start("START LOGIN"))
+            for i, loginkwargs in enumerate(self.data.get("login", [])):
+                _loginkwargs = loginkwargs.copy()
+                func = _loginkwargs.pop("func")
+                if func == "send_keys":
+                    _loginkwargs.setdefault("fast", self.fast_fill)
+                with span("login.step", index=i, func=func):
+                    try_find_element_func(
+                        driver=driver,
+                        funcname=func,
+                        secrets_dict=self.secrets_dict,
+                        verbose=self.verbose,
+                        **_loginkwargs,
+                    )
+            if path is not None and self.is_authenticated(driver=driver):
+                save_session(driver=driver, path=path)
+            self.print(wrap_end("END LOGIN"))
+
+    def answer_form(
+        self,
+        driver: WebDriver,
+        deque_maxlen: int = 3,
+        settle_quiet: Optional[float] = 0.1,
+        settle_timeout: float = 10,
+        submit: bool = True,
+        **kwargs,
+    ) -> None:
+        """Answer the forms.
+
+        Each page is scanned again whenever the DOM under :attr:`question_container` settles (see :func:`wait_until_settled <form_auto_fill_in.utils.driver_utils.wait_until_settled>`), and the page is finished when a scan finds no new question. If the observer can not be used, it falls back to scanning every second until ``deque_maxlen`` scans return the same result. If :attr:`schema` is cached, the page is finished by the first scan which finds no new question after all questions expected in it are answered, without waiting for ``deque_maxlen`` scans.
+
+        Answered questions and finished pages are recorded in :attr:`checkpoint`. Pages finished in the previous run are answered again quietly (fast-forwarded), and the answers entered on demand are reused.
+
+        Args:
+            driver (WebDriver)                       : An instance of Selenium ``WebDriver``.
+            deque_maxlen (int, optional)             : How many times to scan the form for new items that need to be entered. (Only used when polling.) Defaults to ``3``.
+            settle_quiet (Optional[float], optional) : Number of seconds without DOM mutation to regard the page as settled. If ``None``, always poll. Defaults to ``0.1``.
+            settle_timeout (float, optional)         : Number of seconds to wait for the page to settle. Defaults to ``10``.
+            submit (bool, optional)                  : Whether to do the ``next`` step of the last page. (Usually, it submits the form.) Defaults to ``True``.
+        """
+        self.print(wrap_start("START ANSWERING FORM"))
+        self.print(lambda: toACCENT("[TITLE]") + f"\n{self.find_form_title(driver=driver)}\n")
+        if self.crawled is not None:
+            self.crawled.update({"title": self.find_form_title(driver=driver), "pages": []})
+        use_observer: bool = settle_quiet is not None
+        pages: List[Dict[str, Any]] = self.data.get("answer", [{}])
+        for i, ith_answer_data in enumerate(pages):
+            self.print(wrap_start(f"START {i}th PAGE", indent=4))
+            expected: Optional[Dict[str, Dict[str, Any]]] = None
+            if self.schema is not None and self.crawled is None and i < len(self.schema["pages"]):
+                expected = {e["identifier"]: e for e in self.schema["pages"][i]["questions"]}
+            crawled_questions: List[Dict[str, Any]] = []
+            fast_forward: bool = i < self.checkpoint.page
+            if fast_forward:
+                self.print(toBLUE("Fast-forward the page finished in the previous run."))
+            answers: Dict[str, Dict[str, Any]] = {
+                k: dict(v) for k, v in ith_answer_data.items() if k != "next"
+            }
+            for question_identifier, answer in self.checkpoint.get_answers(i).items():
+                answers.setdefault(question_identifier, {}).update(answer)
+            answered_question_identifiers: Set[str] = set()
+            num_visible_questions = deque([-1] * deque_maxlen, maxlen=deque_maxlen)
+            # num_questions_to_answer: int = len([e for e in ith_answer_data.keys() if e != "next"])
+
+            with span("page", index=i), self.quiet(enabled=fast_forward):
+                while True:
+                    with span("page.settle"):
+                        settled: bool = use_observer and wait_until_settled(
+                            driver=driver,
+                            selector=self.question_container,
+                            quiet=settle_quiet,
+                            timeout=settle_timeout,
+                        )
+                        if not settled:
+                            # Fall back to polling for the rest of the form.
+                            use_observer = False
+                            time.sleep(1)
+                    with span("page.scan"):
+                        snapshots = self.find_question_snapshots(driver=driver)
+
+                    # STOP CONDITION
+                    # if len(answered_question_identifiers) >= num_questions_to_answer or
+                    if not settled:
+                        num_visible_questions.append([e["identifier"] for e in snapshots])
+                        if all(
+                            [num_visible_questions[0] == e for e in list(num_visible_questions)[1:]]
+                        ):
+                            break
+
+                    num_answered: int = 0
+                    for snapshot in snapshots:
+                        question: WebElement = snapshot["element"]
+                        question_identifier: str = snapshot["identifier"]
+                        if question_identifier not in answered_question_identifiers:
+                            with span("question", identifier=question_identifier):
+                                self.print(
+                                    lambda: toACCENT(f'[KEY: "{question_identifier}"]\n')
+                                    + f"{self.get_question_title(driver=driver, snapshot=snapshot)}\n"
+                                )
+                                if self.crawled is not None:
+                                    crawled_questions.append(
+                                        self.describe_question(
+                                            driver=driver,
+                                            question=question,
+                                            identifier=question_identifier,
+                                            title=self.get_question_title(
+                                                driver=driver, snapshot=snapshot
+                                            ),
+                                        )
+                                    )
+                                elif expected is not None and not self.match_schema(
+                                    snapshot=snapshot, expected=expected
+                                ):
+                                    self.print(
+                                        toRED(
+                                            f'The form has changed since it was crawled. ("{question_identifier}" is not expected.) Run crawl-form again.'
+                                        )
+                                    )
+                                    self.schema = expected = None
+                                answer = answers.setdefault(question_identifier, {})
+                                given: Dict[str, Any] = dict(answer)
+                                answered: bool = False
+                                try:
+                                    self.answer_question(question=question, answer=answer)
+                                    answered = True
+                                finally:
+                                    # Answers entered on demand are kept even if answering fails.
+                                    self.checkpoint.record(
+                                        page=i,
+                                        identifier=question_identifier,
+                                        answer={k: v for k, v in answer.items() if k not in given},
+                                        answered=answered,
+                                    )
+                            answered_question_identifiers.add(question_identifier)
+                            num_answered += 1
+                            self.print("-" * 30)
+
+                    if settled and num_answered == 0:
+                        break
+                    if (
+                        expected is not None
+                        and num_answered == 0
+                        and answered_question_identifiers >= set(expected)
+                    ):
+                        # Rescanned once more, as the answers (ex. overrides) may reveal questions not crawled.
+                        break
+
+                next_data = dict(ith_answer_data.get("next", {}))
+                if self.crawled is not None:
+                    self.crawled["pages"].append(
+                        {
+                            "questions": crawled_questions,
+                            "next": {
+                                k: v for k, v in next_data.items() if k in ["by", "identifier"]
+                            }
+                            or None,
+                        }
+                    )
+                if len(next_data) > 0 and (submit or i < len(pages) - 1):
+                    marker: Optional[WebElement] = (
+                        snapshots[0]["element"] if len(snapshots) > 0 else None
+                    )
+                    url: str = driver.current_url
+                    with span("page.next"):
+                        try_find_element_func(
+                            driver=driver,
+                            funcname=next_data.pop("func"),
+                            secrets_dict=self.secrets_dict,
+                            verbose=self.verbose,
+                            **next_data,
+                        )
+                    if marker is not None and i < len(pages) - 1:
+                        with span("page.leave"):
+                            # Otherwise, the old page may settle before the next one is shown, and be answered again.
+                            if not wait_until_left(
+                                driver=driver, element=marker, url=url, timeout=settle_timeout
+                            ):
+                                self.print(toRED(f"The {i}th page is still shown after 'next'."))
+                    self.check_session(driver=driver)
+                    self.checkpoint.finish_page(page=i)
+            self.print(wrap_end(f"END {i}th PAGE", indent=4))
+        self.print(wrap_end("END ANSWERING FORM"))
+
+    def logout(self, driver: WebDriver) -> None:
+        """Perform the logout procedure.
+
+        Args:
+            driver (WebDriver): An instance of Selenium ``WebDriver``.
+        """
+        self.print(toACCENT("[END]"))
+
+    # --- Main Methods --->
+
+    # <--- Asyncio Methods (NOTE: They require snapshot_script and answer_question_async.) ---
+    @classmethod
+    def supports_async(cls) -> bool:
+        """Whether the form model can be answered with :meth:`run_async`. (It overrides :meth:`run_async`, or defines :attr:`snapshot_script` and ``answer_question_async``.)"""
+        if cls.run_async is not BaseForm.run_async:
+            return True
+        return cls.snapshot_script is not None and hasattr(cls, "answer_question_async")
+
+    async def run_async(
+        self, browser: bool = False, driver: Optional[AsyncWebDriver] = None, **kwargs
+    ) -> None:
+        """Coroutine version of :meth:`run`. Many forms can be answered concurrently in one event loop.
+
+        Args:
+            browser (bool, optional)                    : Whether you want to run Chrome with GUI browser. Defaults to ``False``.
+            driver (Optional[AsyncWebDriver], optional) : An already running asyncio driver. If ``None``, a new one is prepared. Defaults to ``None``.
+
+        Raises:
+            NotImplementedError: When the form model doesn't support asyncio. (See :meth:`supports_async`)
+        """
+        from ..utils.async_driver_utils import get_async_chrome_driver
+
+        if not self.supports_async():
+            raise NotImplementedError(f"{self.__class__.__name__} doesn't support asyncio.")
+        if driver is None:
+            async with get_async_chrome_driver(
+                browser=browser,
+                url=get_driver_profile(self.driver_profile)["remote"],
+                profile=self.driver_profile,
+            ) as driver:
+                await self.run_async(driver=driver, **kwargs)
+            return
+        await self.login_async(driver=driver)
+        await self.answer_form_async(driver=driver, **kwargs)
+        await self.logout_async(driver=driver)
+
+    async def login_async(self, driver: AsyncWebDriver) -> None:
+        """Coroutine version of :meth:`login`. (The session cache is not supported.)
+
+        Args:
+            driver (AsyncWebDriver): An asyncio driver.
+        """
+        from ..utils.async_driver_utils import async_try_find_element_func
+
+        url: str = self.data.get("URL")
+        if url is not None:
+            self.print(f"Visit Form: {toBLUE(url)}")
+            await driver.get(url)
             self.print(wrap_start("START LOGIN"))
             for loginkwargs in self.data.get("login", []):
                 _loginkwargs = loginkwargs.copy()
                 func = _loginkwargs.pop("func")
-                try_find_element_func(
+                if func == "send_keys":
+                    _loginkwargs.setdefault("fast", self.fast_fill)
+                await async_try_find_element_func(
                     driver=driver,
-                    funcname=loginkwargs.pop("func"),
+                    funcname=func,
                     secrets_dict=self.secrets_dict,
                     verbose=self.verbose,
                     **_loginkwargs,
                 )
             self.print(wrap_end("END LOGIN"))
 
-    def answer_form(self, driver: WebDriver, deque_maxlen: int = 3, **kwargs) -> None:
-        """Answer the forms.
+    async def answer_form_async(
+        self,
+        driver: AsyncWebDriver,
+        deque_maxlen: int = 3,
+        settle_quiet: Optional[float] = 0.1,
+        settle_timeout: float = 10,
+        **kwargs,
+    ) -> None:
+        """Coroutine version of :meth:`answer_form`. Each page is scanned with :attr:`snapshot_script`, and the answers are entered by ``answer_question_async``.
 
         Args:
-            driver (WebDriver)           : An instance of Selenium ``WebDriver``.
-            deque_maxlen (int, optional) : How many times to scan the form for new items that need to be entered. Defaults to ``3``.
+            driver (AsyncWebDriver)                  : An asyncio driver.
+            deque_maxlen (int, optional)             : How many times to scan the form for new items that need to be entered. (Only used when polling.) Defaults to ``3``.
+            settle_quiet (Optional[float], optional) : Number of seconds without DOM mutation to regard the page as settled. If ``None``, always poll. Defaults to ``0.1``.
+            settle_timeout (float, optional)         : Number of seconds to wait for the page to settle. Defaults to ``10``.
         """
+        import asyncio
+
+        from ..utils.async_driver_utils import (
+            async_try_find_element_func,
+            async_wait_until_left,
+            async_wait_until_settled,
+        )
+
         self.print(wrap_start("START ANSWERING FORM"))
-        self.print(toACCENT("[TITLE]") + f"\n{self.find_form_title(driver=driver)}\n")
-        for i, ith_answer_data in enumerate(self.data.get("answer", [{}])):
+        if self.logger.enabled("info"):
+            form_title: str = await driver.execute_script(
+                "var e = document.querySelector(arguments[0]); return e ? e.innerText : document.title;",
+                self.form_title_selector,
+            )
+            self.print(toACCENT("[TITLE]") + f"\n{form_title}\n")
+        use_observer: bool = settle_quiet is not None
+        pages: List[Dict[str, Any]] = self.data.get("answer", [{}])
+        for i, ith_answer_data in enumerate(pages):
             self.print(wrap_start(f"START {i}th PAGE", indent=4))
-            answered_question_identifiers: List[str] = []
+            answered_question_identifiers: Set[str] = set()
             num_visible_questions = deque([-1] * deque_maxlen, maxlen=deque_maxlen)
-            # num_questions_to_answer: int = len([e for e in ith_answer_data.keys() if e != "next"])
-
             while True:
-                time.sleep(1)
-                visible_questions = self.find_visible_questions(driver=driver)
-                num_visible_questions.append(visible_questions)
-
-                # STOP CONDITION
-                # if len(answered_question_identifiers) >= num_questions_to_answer or
-                if all([num_visible_questions[0] == e for e in list(num_visible_questions)[1:]]):
-                    break
-
-                for question in visible_questions:
-                    question_identifier = self.find_question_identifier(
-                        driver=driver, question=question
-                    )
+                settled: bool = use_observer and await async_wait_until_settled(
+                    driver=driver,
+                    selector=self.question_container,
+                    quiet=settle_quiet,
+                    timeout=settle_timeout,
+                )
+                if not settled:
+                    # Fall back to polling for the rest of the form.
+                    use_observer = False
+                    await asyncio.sleep(1)
+                snapshots = await driver.execute_script(self.snapshot_script)
+                if not settled:
+                    num_visible_questions.append([e["identifier"] for e in snapshots])
+                    if all(
+                        [num_visible_questions[0] == e for e in list(num_visible_questions)[1:]]
+                    ):
+                        break
+                num_answered: int = 0
+                for snapshot in snapshots:
+                    question_identifier: str = snapshot["identifier"]
                     if question_identifier not in answered_question_identifiers:
                         self.print(
-                            toACCENT(f'[KEY: "{question_identifier}"]\n')
-                            + f"{self.find_question_title(driver=driver, question=question)}\n"
+                            toACCENT(f'[KEY: "{question_identifier}"]\n') + f"{snapshot['title']}\n"
                         )
-                        self.answer_question(
-                            question=question,
+                        await self.answer_question_async(
+                            snapshot=snapshot,
                             answer=ith_answer_data.get(question_identifier, {}),
                         )
-                        answered_question_identifiers.append(question_identifier)
+                        answered_question_identifiers.add(question_identifier)
+                        num_answered += 1
                         self.print("-" * 30)
+                if settled and num_answered == 0:
+                    break
 
-            next_data = ith_answer_data.get("next", {})
+            next_data = ith_answer_data.get("next", {}).copy()
             if len(next_data) > 0:
-                try_find_element_func(
+                marker: Optional[AsyncWebElement] = (
+                    snapshots[0]["element"] if len(snapshots) > 0 else None
+                )
+                url: str = await driver.current_url()
+                await async_try_find_element_func(
                     driver=driver,
                     funcname=next_data.pop("func"),
                     secrets_dict=self.secrets_dict,
                     verbose=self.verbose,
                     **next_data,
                 )
+                if marker is not None and i < len(pages) - 1:
+                    if not await async_wait_until_left(
+                        driver=driver, element=marker, url=url, timeout=settle_timeout
+                    ):
+                        self.print(toRED(f"The {i}th page is still shown after 'next'."))
             self.print(wrap_end(f"END {i}th PAGE", indent=4))
         self.print(wrap_end("END ANSWERING FORM"))
 
-    def logout(self, driver: WebDriver) -> None:
-        """Perform the logout procedure.
+    async def logout_async(self, driver: AsyncWebDriver) -> None:
+        """Coroutine version of :meth:`logout`.
 
         Args:
-            driver (WebDriver): An instance of Selenium ``WebDriver``.
+            driver (AsyncWebDriver): An asyncio driver.
         """
-        self.print(toACCENT("[END]"))
+        self.logout(driver=driver)
 
-    # --- Main Methods --->
+    async def input_answer_async(
+        self, msg: str = "Your Answer{isMultiple}", isMultiple=False
+    ) -> Any:
+        """Coroutine version of :meth:`input_answer`. The standard input is read in a thread so that other sessions are not blocked."""
+        import asyncio
+        import functools
+
+        return await asyncio.get_running_loop().run_in_executor(
+            None, functools.partial(self.input_answer, msg=msg, isMultiple=isMultiple)
+        )
+
+    async def check_labels_async(
+        self,
+        labels: List[AsyncWebElement],
+        checks: List[int],
+        texts: List[str],
+    ) -> None:
+        """Coroutine version of :meth:`check_labels`.
+
+        Args:
+            labels (List[AsyncWebElement]) : List of Checkbox Elements.
+            checks (List[int])             : Whether to check the label or not.
+            texts (List[str])              : Label texts. (``"options"`` of the snapshot)
+        """
+        num_labels: int = len(labels)
+        digit: int = len(str(num_labels))
+
+        for i, (label, text) in enumerate(zip(labels, texts), start=1):
+            mark: str = " "
+            if i in checks or str(i) in checks:
+                await label.click()
+                mark = "x"
+            self.print(f"\t{i:>0{digit}}/{num_labels} [{mark}] {text}")
+
+    # --- Asyncio Methods --->
 
     # <--- Abstract Methods (NOTE: When inheriting this class, you need to change these methods.) ---
     @abstractmethod
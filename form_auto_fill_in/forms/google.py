@@ -1,20 +1,25 @@
 # coding: utf-8
+from __future__ import annotations
+
 import copy
 import re
-import time
 from collections import deque
-from typing import Any, Callable, Dict, List, Optional, Union
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple, Union
+
+if TYPE_CHECKING:
+    from selenium.webdriver.remote.webdriver import WebDriver
+    from selenium.webdriver.remote.webelement import WebElement
 
-from selenium.webdriver.remote.webdriver import WebDriver
-from selenium.webdriver.remote.webelement import WebElement
+    from ..utils.async_driver_utils import AsyncWebElement
 
 from ..utils.driver_utils import (
+    fill_in,
     get_chrome_driver,
-    try_find_element,
     try_find_element_func,
     try_find_element_text,
 )
-from ..utils.generic_utils import load_data
+from ..utils.generic_utils import load_data, try_wrapper
+from ..utils.schema_utils import as_numbers
 from .base import BaseForm
 
 
@@ -33,6 +38,44 @@ class GoogleForm(BaseForm):
         path (str)       : Path to json data that describes the procedure of form.
     """
 
+    form_title_selector: str = ".freebirdFormviewerViewHeaderHeaderBody"
+    other_input_script: str = """
+    var other = arguments[0].querySelector(
+        ".freebirdFormviewerComponentsQuestionRadioOtherInputElement,"
+        + " .freebirdFormviewerComponentsQuestionCheckboxOtherInputElement"
+    );
+    return other !== null && (
+        other.classList.contains("isFocused") || other.contains(document.activeElement)
+    );
+    """
+    snapshot_script: str = """
+    return Array.prototype.map.call(
+        document.getElementsByClassName("freebirdFormviewerViewNumberedItemContainer"),
+        function (question) {
+            var div = question.getElementsByTagName("div")[0];
+            var params = (div && div.getAttribute("data-params")) || "";
+            var identifier = /%\\.@\\.\\[(\\d+),/.exec(params);
+            var title = /%\\.@\\.\\[\\d+,"(.+?)"/.exec(params);
+            var labels = question.getElementsByTagName("label");
+            var type = "text";
+            if (labels.length > 0) {
+                type = question.querySelector("[role=checkbox]") ? "checkbox" : "radio";
+            } else if (question.getElementsByTagName("textarea").length > 0) {
+                type = "textarea";
+            }
+            return {
+                element: question,
+                identifier: identifier ? identifier[1] : "",
+                title: title ? title[1] : "",
+                type: type,
+                options: Array.prototype.map.call(labels, function (label) {
+                    return label.innerText;
+                }),
+            };
+        }
+    );
+    """
+
     def __init__(
         self,
         path: str,
@@ -91,6 +134,84 @@ class GoogleForm(BaseForm):
             # ),
         ).group(1)
 
+    def find_question_type(self, driver: WebDriver, question: WebElement) -> str:
+        if len(question.find_elements_by_tag_name(name="label")) > 0:
+            if len(question.find_elements_by_css_selector("[role=checkbox]")) > 0:
+                return "checkbox"
+            return "radio"
+        if len(question.find_elements_by_tag_name(name="textarea")) > 0:
+            return "textarea"
+        return "text"
+
+    def describe_question(
+        self, driver: WebDriver, question: WebElement, identifier: str, title: str
+    ) -> Dict[str, Any]:
+        description: Dict[str, Any] = super().describe_question(
+            driver=driver, question=question, identifier=identifier, title=title
+        )
+        # The "Other" option is always the last one, and has its own text input.
+        description["other"] = (
+            len(description["options"]) > 0
+            and len(question.find_elements_by_tag_name(name="input")) > 1
+        )
+        return description
+
+    @classmethod
+    def check_answer(
+        cls, question: Dict[str, Any], answer: Optional[Dict[str, Any]] = None
+    ) -> Tuple[List[str], List[str]]:
+        if answer is None or "val" not in answer:
+            return super().check_answer(question=question, answer=None)
+        errors: List[str] = []
+        warnings: List[str] = []
+        val: Any = answer["val"]
+        options: List[str] = question.get("options", [])
+        if len(options) == 0:
+            if not isinstance(val, str) and not (
+                isinstance(val, list) and all([isinstance(e, str) for e in val])
+            ):
+                errors.append(f"val: must be a string for {question['type']} question, got {val!r}")
+            return errors, warnings
+
+        numbers: Optional[List[int]] = as_numbers(val)
+        if numbers is None:
+            errors.append(f"val: must be option numbers (1-{len(options)}), got {val!r}")
+            return errors, warnings
+        errors.extend(
+            [
+                f"val: {no} is out of range (1-{len(options)})"
+                for no in numbers
+                if not 1 <= no <= len(options)
+            ]
+        )
+        if question["type"] != "checkbox" and len(numbers) > 1:
+            errors.append(f"val: only one option can be chosen in {question['type']} question")
+        if question.get("other", False) and len(options) in numbers and "others" not in answer:
+            warnings.append("others: is not answered, and will be asked on demand")
+        return errors, warnings
+
+    def is_other_focused(self, question: WebElement) -> bool:
+        """Check whether the "Other" input (of Radio Button OR Check Box) in ``question`` is focused.
+
+        Both kinds of "Other" input are looked up at once without waiting, so it costs a single round trip even if ``question`` doesn't have it.
+
+        Args:
+            question (WebElement) : A question ``WebElement``.
+
+        Returns:
+            bool: Whether the "Other" input is focused or not.
+        """
+        return bool(
+            try_wrapper(
+                question.parent.execute_script,
+                self.other_input_script,
+                question,
+                ret_=False,
+                msg_="find the focused input for others",
+                verbose_=False,
+            )
+        )
+
     def answer_on_demand(self, question: WebElement) -> Dict[str, Any]:
         labels: List[WebElement] = question.find_elements_by_tag_name(name="label")
         if len(labels) > 0:
@@ -123,28 +244,68 @@ class GoogleForm(BaseForm):
             # If other is selected and you are prompted for answering it.
             checks: List[Union[str, int]] = answer.get("val", [])
             self.check_labels(labels=labels, checks=checks)
-            if len(inputElements) > 1:
-                time.sleep(0.5)
-                # Radio Button OR Check Box
-                element = try_find_element(
-                    driver=question,
-                    by="class name",
-                    identifier="freebirdFormviewerComponentsQuestionRadioOtherInputElement",
-                    timeout=1,
-                    verbose=False,
-                ) or try_find_element(
-                    driver=question,
-                    by="class name",
-                    identifier="freebirdFormviewerComponentsQuestionCheckboxOtherInputElement",
-                    timeout=1,
-                    verbose=False,
-                )
-                if element and "isFocused" in element.get_attribute(name="class"):
+            # The "Other" option is always the last one.
+            if len(inputElements) > 1 and str(len(labels)) in [str(e) for e in checks]:
+                if self.is_other_focused(question=question):
+                    if "others" not in answer:
+                        answer["others"] = self.input_answer(
+                            msg="Your Answer for Others", isMultiple=False
+                        )
+                    fill_in(
+                        target=inputElements[1],
+                        value=answer["others"],
+                        fast=answer.get("fast", self.fast_fill),
+                    )
+        else:
+            value: Union[str, List[str]] = answer.get("val", "")
+            fill_in(
+                target=inputElements[0],
+                value=self.decode_secrets(value),
+                fast=answer.get("fast", self.fast_fill),
+            )
+
+    async def answer_question_async(
+        self,
+        snapshot: Dict[str, Any],
+        answer: Dict[str, Any] = {},
+    ) -> None:
+        """Coroutine version of :meth:`answer_question`.
+
+        Args:
+            snapshot (Dict[str, Any])         : A snapshot of the question. (See :meth:`find_question_snapshots`)
+            answer (Dict[str, Any], optional) : Information required for answer. Defaults to ``{}``.
+        """
+        from ..utils.async_driver_utils import async_fill_in
+
+        question: AsyncWebElement = snapshot["element"]
+        labels: List[AsyncWebElement] = await question.find_elements(by="tag name", value="label")
+        if "val" not in answer:
+            if len(labels) > 0:
+                await self.check_labels_async(labels=labels, checks=[], texts=snapshot["options"])
+            answer.update({"val": await self.input_answer_async(isMultiple=len(labels) > 0)})
+
+        inputElements: List[AsyncWebElement] = await question.find_elements(
+            by="tag name", value="input"
+        )
+        if len(labels) > 0:
+            checks: List[Union[str, int]] = answer.get("val", [])
+            await self.check_labels_async(labels=labels, checks=checks, texts=snapshot["options"])
+            # The "Other" option is always the last one.
+            if len(inputElements) > 1 and str(len(labels)) in [str(e) for e in checks]:
+                if await question.parent.execute_script(self.other_input_script, question):
                     if "others" not in answer:
-                        others = self.input_answer(msg="Your Answer for Others", isMultiple=False)
-                    else:
-                        others = answer["others"]
-                    inputElements[1].send_keys(others)
+                        answer["others"] = await self.input_answer_async(
+                            msg="Your Answer for Others", isMultiple=False
+                        )
+                    await async_fill_in(
+                        target=inputElements[1],
+                        value=answer["others"],
+                        fast=answer.get("fast", self.fast_fill),
+                    )
         else:
             value: Union[str, List[str]] = answer.get("val", "")
-            inputElements[0].send_keys(self.decode_secrets(value))
+            await async_fill_in(
+                target=inputElements[0],
+                value=self.decode_secrets(value),
+                fast=answer.get("fast", self.fast_fill),
+            )
@@ -0,0 +1,310 @@
+# coding: utf-8
+from __future__ import annotations
+
+import json
+import re
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
+
+from ..utils._colorings import toACCENT, toBLUE, toGREEN
+from ..utils.generic_utils import try_wrapper, wrap_end, wrap_start
+from ..utils.schema_utils import save_schema
+from .google import GoogleForm
+
+if TYPE_CHECKING:
+    import urllib3
+
+#: Type codes of items in ``FB_PUBLIC_LOAD_DATA_``.
+GOOGLE_ITEM_TYPES: Dict[int, str] = {
+    0: "text",
+    1: "textarea",
+    2: "radio",
+    3: "dropdown",
+    4: "checkbox",
+    5: "scale",
+    6: "section",
+    7: "grid",
+    8: "page",
+    9: "date",
+    10: "time",
+    11: "image",
+    12: "video",
+}
+GOOGLE_CHOICE_TYPES: List[str] = ["radio", "dropdown", "checkbox", "scale"]
+GOOGLE_OTHER_OPTION: str = "__other_option__"
+
+_HTTP: Optional[urllib3.PoolManager] = None
+_SCHEMAS: Dict[str, Dict[str, Any]] = {}
+
+
+def get_http() -> urllib3.PoolManager:
+    """Get the HTTP connection pool shared in the process.
+
+    Returns:
+        urllib3.PoolManager: A pool manager which keeps connections alive.
+    """
+    import urllib3
+
+    global _HTTP
+    if _HTTP is None:
+        _HTTP = urllib3.PoolManager(num_pools=16, maxsize=16, retries=urllib3.Retry(3))
+    return _HTTP
+
+
+def parse_google_form(html: str, url: str) -> Dict[str, Any]:
+    """Parse the question schema from ``FB_PUBLIC_LOAD_DATA_`` embedded in the form page.
+
+    Args:
+        html (str) : HTML of the form page.
+        url (str)  : URL of the form page (after redirects).
+
+    Raises:
+        ValueError: When ``FB_PUBLIC_LOAD_DATA_`` is not found.
+
+    Returns:
+        Dict[str, Any]: A schema with ``"title"``, ``"action"`` (URL to post), ``"fbzx"`` and ``"pages"``. Each page is a list of questions with ``"identifier"``, ``"entries"``, ``"title"``, ``"type"``, ``"options"``, ``"other"`` (whether the last option is "Other") and ``"required"``.
+    """
+    match = re.search(
+        pattern=r"FB_PUBLIC_LOAD_DATA_\s*=\s*(.*?);\s*</script>", string=html, flags=re.S
+    )
+    if match is None:
+        raise ValueError(f"FB_PUBLIC_LOAD_DATA_ is not found in {url}")
+    data: List[Any] = json.loads(match.group(1))
+    action: str = url.split("?")[0]
+    if "/viewform" in action:
+        action = action[: action.index("/viewform")]
+    pages: List[List[Dict[str, Any]]] = [[]]
+    for item in data[1][1] or []:
+        item_type: str = GOOGLE_ITEM_TYPES.get(item[3], "unknown")
+        if item_type == "page":
+            pages.append([])
+        if len(item) < 5 or not item[4]:
+            continue
+        entries: List[List[Any]] = item[4]
+        options: List[List[Any]] = entries[0][1] or []
+        pages[-1].append(
+            {
+                "identifier": str(item[0]),
+                "entries": [str(e[0]) for e in entries],
+                "title": item[1] or "",
+                "type": item_type,
+                "options": [e[0] for e in options],
+                "other": len(options) > 0 and len(options[-1]) > 4 and bool(options[-1][4]),
+                "required": bool(entries[0][2]),
+            }
+        )
+    return {
+        "title": (data[1][8] if len(data[1]) > 8 else None) or data[3],
+        "action": action.rstrip("/") + "/formResponse",
+        "fbzx": str(data[14]) if len(data) > 14 else "",
+        "pages": pages,
+    }
+
+
+class GoogleHTTPForm(GoogleForm):
+    """Answer Google Forms without browser.
+
+    The question schema is fetched once (and cached in the process, and at :data:`SCHEMAS_DIR <form_auto_fill_in.utils.schema_utils.SCHEMAS_DIR>` for ``--dry-run``) from the form page, and the answers are posted to ``formResponse`` as ``entry.<id>`` fields with a pooled HTTP session. The answer json is the same as :class:`GoogleForm <form_auto_fill_in.forms.google.GoogleForm>`. The keys of each page can be either the question identifiers in ``data-params`` or the entry identifiers.
+
+    Args:
+        path (str)                              : Path to json data that describes the procedure of form.
+        secrets_dict (Dict[str, str], optional) : Key and value pairs defined in github secrets. It is used because the password etc. is not output as it is. Defaults to ``{}``.
+        verbose (bool, optional)                : Whether to print message or not. Defaults to ``True``.
+        http (Optional[urllib3.PoolManager])    : A pool manager to use. Defaults to the one shared in the process.
+
+    The other keyword arguments are the same as :class:`BaseForm <form_auto_fill_in.forms.base.BaseForm>`. (Options of the driver and the session are ignored.)
+
+    Note:
+        Forms which require login, and grid questions are not supported.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        secrets_dict: Dict[str, str] = {},
+        verbose: bool = True,
+        http: Optional[urllib3.PoolManager] = None,
+        **kwargs,
+    ):
+        super().__init__(path=path, secrets_dict=secrets_dict, verbose=verbose, **kwargs)
+        self.http: urllib3.PoolManager = http or get_http()
+
+    def fetch_schema(self, refresh: bool = False) -> Dict[str, Any]:
+        """Fetch the question schema of the form. (See :func:`parse_google_form`)
+
+        Args:
+            refresh (bool, optional) : Whether to ignore the schema cached in the process. Defaults to ``False``.
+
+        Returns:
+            Dict[str, Any]: The question schema.
+        """
+        url: str = self.data.get("URL")
+        if refresh or url not in _SCHEMAS:
+            response = self.http.request("GET", url, redirect=True)
+            if response.status >= 400:
+                raise ValueError(f"Failed to fetch {url} (status={response.status})")
+            final_url: str = response.geturl() or url
+            if not final_url.startswith("http"):
+                final_url = url
+            _SCHEMAS[url] = parse_google_form(html=response.data.decode("utf-8"), url=final_url)
+            try_wrapper(
+                save_schema,
+                schema=self.export_schema(_SCHEMAS[url]),
+                msg_="cache the schema",
+                verbose_=False,
+            )
+        return _SCHEMAS[url]
+
+    def export_schema(self, schema: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert the question schema into the format of :mod:`form_auto_fill_in.utils.schema_utils`. (Pages of this form have no ``next`` step.)"""
+        return {
+            "URL": self.data.get("URL"),
+            "form": "google-http",
+            "key": self.plan.key,
+            "title": schema["title"],
+            "pages": [{"questions": page, "next": None} for page in schema["pages"]],
+        }
+
+    def crawl(
+        self, browser: bool = False, driver: Optional[Any] = None, submit: bool = False
+    ) -> Dict[str, Any]:
+        """Fetch the question schema again without submitting. (See :meth:`BaseForm.crawl <form_auto_fill_in.forms.base.BaseForm.crawl>`. The arguments are ignored.)"""
+        self.print(f"Visit Form: {toBLUE(self.data.get('URL'))}")
+        return self.export_schema(self.fetch_schema(refresh=True))
+
+    @classmethod
+    def check_answer(
+        cls, question: Dict[str, Any], answer: Optional[Dict[str, Any]] = None
+    ) -> Tuple[List[str], List[str]]:
+        if answer is None:
+            if question.get("required", False):
+                return ["is required, but not answered"], []
+            return [], []
+        if len(question.get("entries", [None])) != 1:
+            return [f"{question['type']} question is not supported"], []
+        # Nothing is asked on demand, and "others" is posted as an empty string.
+        errors, warnings = super().check_answer(question=question, answer=answer)
+        return errors, [e.replace("will be asked on demand", "posted empty") for e in warnings]
+
+    def answer_to_fields(
+        self, question: Dict[str, Any], answer: Dict[str, Any]
+    ) -> List[Tuple[str, str]]:
+        """Convert the answer of a question to ``entry.<id>`` fields.
+
+        Args:
+            question (Dict[str, Any]) : A question in the schema.
+            answer (Dict[str, Any])   : Information required for answer. (``val`` and ``others``)
+
+        Raises:
+            ValueError: When the answer can not be converted.
+
+        Returns:
+            List[Tuple[str, str]]: Fields to post.
+        """
+        if len(question["entries"]) != 1:
+            raise ValueError(f"{question['type']} question is not supported: {question['title']}")
+        name: str = f"entry.{question['entries'][0]}"
+        val: Union[str, int, List[Union[str, int]]] = answer.get("val", [])
+        if question["type"] not in GOOGLE_CHOICE_TYPES:
+            return [(name, self.decode_secrets(val))]
+
+        if not isinstance(val, (list, tuple)):
+            val = [val]
+        fields: List[Tuple[str, str]] = []
+        options: List[str] = question["options"]
+        for no in val:
+            no = int(no)
+            if not 1 <= no <= len(options):
+                raise ValueError(f"val={no} is out of range for {question['title']}")
+            if question["other"] and no == len(options):
+                fields.append((name, GOOGLE_OTHER_OPTION))
+                fields.append(
+                    (
+                        f"{name}.other_option_response",
+                        self.decode_secrets(answer.get("others", "")),
+                    )
+                )
+            else:
+                fields.append((name, options[no - 1]))
+        return fields
+
+    def build_fields(self, schema: Dict[str, Any]) -> List[Tuple[str, str]]:
+        """Build all fields to post from the answer json.
+
+        Args:
+            schema (Dict[str, Any]) : The question schema.
+
+        Raises:
+            ValueError: When a required question has no answer.
+
+        Returns:
+            List[Tuple[str, str]]: Fields to post.
+        """
+        answers: List[Dict[str, Any]] = self.data.get("answer", [{}])
+        fields: List[Tuple[str, str]] = []
+        for i, page in enumerate(schema["pages"]):
+            ith_answer_data: Dict[str, Any] = answers[i] if i < len(answers) else {}
+            self.print(wrap_start(f"START {i}th PAGE", indent=4))
+            for question in page:
+                answer: Optional[Dict[str, Any]] = ith_answer_data.get(question["identifier"])
+                if answer is None:
+                    answer = ith_answer_data.get(question["entries"][0])
+                self.print(toACCENT(f'[KEY: "{question["identifier"]}"]\n') + question["title"])
+                if answer is None:
+                    if question["required"]:
+                        raise ValueError(
+                            f"No answer for the required question: {question['title']}"
+                        )
+                    continue
+                question_fields = self.answer_to_fields(question=question, answer=answer)
+                self.print("\t" + ", ".join([v for _, v in question_fields]))
+                fields.extend(question_fields)
+            self.print(wrap_end(f"END {i}th PAGE", indent=4))
+        fields.append(("fvv", "1"))
+        fields.append(("pageHistory", ",".join([str(i) for i in range(len(schema["pages"]))])))
+        if schema["fbzx"]:
+            fields.append(("fbzx", schema["fbzx"]))
+            fields.append(("partialResponse", json.dumps([None, None, schema["fbzx"]])))
+        return fields
+
+    def submit(self, schema: Dict[str, Any], fields: List[Tuple[str, str]]) -> int:
+        """Post ``fields`` to ``formResponse``.
+
+        Args:
+            schema (Dict[str, Any])       : The question schema.
+            fields (List[Tuple[str, str]]) : Fields to post.
+
+        Raises:
+            ValueError: When the form rejects the response.
+
+        Returns:
+            int: HTTP status code.
+        """
+        response = self.http.request_encode_body(
+            "POST", schema["action"], fields=fields, encode_multipart=False
+        )
+        if response.status >= 400:
+            raise ValueError(f"Failed to submit to {schema['action']} (status={response.status})")
+        return response.status
+
+    def run(self, browser: bool = False, driver: Optional[Any] = None, **kwargs) -> None:
+        """Fetch the schema, and submit the answers without browser. (``browser`` and ``driver`` are ignored.)"""
+        self.print(f"Visit Form: {toBLUE(self.data.get('URL'))}")
+        schema: Dict[str, Any] = self.fetch_schema()
+        self.print(wrap_start("START ANSWERING FORM"))
+        self.print(toACCENT("[TITLE]") + f"\n{schema['title']}\n")
+        fields = self.build_fields(schema=schema)
+        status: int = self.submit(schema=schema, fields=fields)
+        self.print(toGREEN(f"Submitted to {schema['action']} (status={status})"))
+        self.print(wrap_end("END ANSWERING FORM"))
+        self.logger.flush()
+
+    async def run_async(
+        self, browser: bool = False, driver: Optional[Any] = None, **kwargs
+    ) -> None:
+        """Coroutine version of :meth:`run`. The HTTP requests are sent in a thread so that other forms in the event loop are not blocked."""
+        import asyncio
+        import functools
+
+        await asyncio.get_running_loop().run_in_executor(
+            None, functools.partial(self.run, **kwargs)
+        )
@@ -1,18 +1,50 @@
 # coding: utf-8
+from __future__ import annotations
+
 import copy
 import time
 from collections import deque
-from typing import Any, Dict, List
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from selenium.webdriver.remote.webdriver import WebDriver
+    from selenium.webdriver.remote.webelement import WebElement
 
-from selenium.webdriver.remote.webdriver import WebDriver
-from selenium.webdriver.remote.webelement import WebElement
+    from ..utils.async_driver_utils import AsyncWebElement
 
-from ..utils.driver_utils import get_chrome_driver, try_find_element_func, try_find_element_text
+from ..utils.driver_utils import (
+    fill_in,
+    get_chrome_driver,
+    try_find_element_func,
+    try_find_element_text,
+)
 from ..utils.generic_utils import load_data
+from ..utils.schema_utils import as_numbers
 from .base import BaseForm
 
 
 class OfficeForm(BaseForm):
+    form_title_selector: str = ".office-form-title-content"
+    snapshot_script: str = """
+    return Array.prototype.map.call(
+        document.getElementsByClassName("office-form-question"),
+        function (question) {
+            var ordinal = question.querySelector("span.ordinal-number");
+            var title = question.querySelector("div.question-title-box");
+            var inputs = question.getElementsByTagName("input");
+            return {
+                element: question,
+                identifier: ordinal ? ordinal.innerText.replace(/\\.+$/, "") : "",
+                title: title ? title.innerText : "",
+                type: inputs.length > 0 ? inputs[0].type : "text",
+                options: Array.prototype.map.call(inputs, function (input) {
+                    return "[" + input.type + "] " + input.value;
+                }),
+            };
+        }
+    );
+    """
+
     def __init__(
         self,
         path: str,
@@ -44,6 +76,35 @@ class OfficeForm(BaseForm):
     def get_label_text(self, label: WebElement) -> str:
         return f"[{label.get_attribute('type')}] {label.get_attribute('value')}"
 
+    def find_question_labels(self, question: WebElement) -> List[WebElement]:
+        return question.find_elements_by_tag_name(name="input")
+
+    def find_question_type(self, driver: WebDriver, question: WebElement) -> str:
+        inputElements: List[WebElement] = question.find_elements_by_tag_name(name="input")
+        return inputElements[0].get_attribute("type") if len(inputElements) > 0 else "text"
+
+    @classmethod
+    def check_answer(
+        cls, question: Dict[str, Any], answer: Optional[Dict[str, Any]] = None
+    ) -> Tuple[List[str], List[str]]:
+        if answer is None or "no" not in answer:
+            return super().check_answer(question=question, answer=None)
+        errors: List[str] = []
+        warnings: List[str] = []
+        options: List[str] = question.get("options", [])
+        numbers: Optional[List[int]] = as_numbers(answer["no"])
+        if numbers is None:
+            errors.append(f"no: must be option numbers (1-{len(options)}), got {answer['no']!r}")
+            return errors, warnings
+        for no in numbers:
+            if not 1 <= no <= len(options):
+                errors.append(f"no: {no} is out of range (1-{len(options)})")
+            elif options[no - 1].startswith("[text]") and "text" not in answer:
+                warnings.append("text: is not answered, and will be asked on demand")
+        if question["type"] == "radio" and len(numbers) > 1:
+            errors.append("no: only one option can be chosen in radio question")
+        return errors, warnings
+
     def answer_on_demand(self, question: WebElement) -> Dict[str, Any]:
         inputElements: List[WebElement] = question.find_elements_by_tag_name(name="input")
         self.check_labels(labels=inputElements, checks=[])
@@ -84,9 +145,55 @@ class OfficeForm(BaseForm):
                 "Already Checked"
             if question_type == "text":
                 if "text" not in answer:
-                    text = self.input_answer(
+                    answer["text"] = self.input_answer(
                         msg=f"Your Text Answer for {self.get_label_text(target)}", isMultiple=False
                     )
-                else:
-                    text = answer["text"]
-                target.send_keys(self.decode_secrets(text))
+                fill_in(
+                    target=target,
+                    value=self.decode_secrets(answer["text"]),
+                    fast=answer.get("fast", self.fast_fill),
+                )
+
+    async def answer_question_async(
+        self,
+        snapshot: Dict[str, Any],
+        answer: Dict[str, Any] = {},
+    ) -> None:
+        """Coroutine version of :meth:`answer_question`.
+
+        Args:
+            snapshot (Dict[str, Any])         : A snapshot of the question. (See :meth:`find_question_snapshots`)
+            answer (Dict[str, Any], optional) : Information required for answer. Defaults to ``{}``.
+        """
+        from ..utils.async_driver_utils import async_fill_in
+
+        question: AsyncWebElement = snapshot["element"]
+        inputElements: List[AsyncWebElement] = await question.find_elements(
+            by="tag name", value="input"
+        )
+        if "no" not in answer:
+            await self.check_labels_async(
+                labels=inputElements, checks=[], texts=snapshot["options"]
+            )
+            answer.update({"no": await self.input_answer_async(isMultiple=len(inputElements) > 0)})
+
+        numbers = answer.get("no", [])
+        if not isinstance(numbers, (list, tuple)):
+            numbers = [numbers]
+        await self.check_labels_async(
+            labels=inputElements, checks=numbers, texts=snapshot["options"]
+        )
+
+        for no in list(numbers):
+            target: AsyncWebElement = inputElements[int(no) - 1]
+            if snapshot["options"][int(no) - 1].startswith("[text]"):
+                if "text" not in answer:
+                    answer["text"] = await self.input_answer_async(
+                        msg=f"Your Text Answer for {snapshot['options'][int(no) - 1]}",
+                        isMultiple=False,
+                    )
+                await async_fill_in(
+                    target=target,
+                    value=self.decode_secrets(answer["text"]),
+                    fast=answer.get("fast", self.fast_fill),
+                )
@@ -0,0 +1,193 @@
+# coding: utf-8
+"""Registry of the form models and the URL patterns they answer.
+
+Form models are registered as ``"<module>:<class>"`` references, and a module is imported only when its form model is used, so the startup doesn't get slower as form models are added. Besides the built-in ones, form models of other packages are registered with entry points, and URL patterns with another group (so that they are matched without importing the form models):
+
+.. code-block:: toml
+
+    [tool.poetry.plugins."form_auto_fill_in.forms"]
+    "intra" = "my_forms.intra:IntraForm"
+
+    [tool.poetry.plugins."form_auto_fill_in.hosts"]
+    "forms.intra.example.com" = "intra"
+    "*.example.com/survey" = "intra"
+
+A URL pattern is a host optionally followed by a path prefix (``"docs.google.com/forms"`` matches ``/forms`` and ``/forms/...``, but not ``/formsx``). The host can start with ``*.`` to match any subdomains (but not the domain itself), or contain other shell-style wildcards (ex. ``"forms-*.example.com"``). When several patterns match, an exact host beats ``*.`` ones, a longer ``*.`` suffix beats a shorter one, a longer path beats a shorter one, and the other wildcards are tried last.
+
+Built-in identifiers and patterns can't be overridden by the entry points.
+"""
+import fnmatch
+import functools
+import importlib
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+from ..utils._colorings import toRED
+from ..utils.generic_utils import handleKeyError
+
+FORMS_ENTRY_POINT_GROUP: str = "form_auto_fill_in.forms"
+HOSTS_ENTRY_POINT_GROUP: str = "form_auto_fill_in.hosts"
+
+#: A form model class, or a reference to it (``"<module>:<class>"``).
+Target = Union[str, type]
+
+
+def iter_entry_points(group: str) -> Iterator[Tuple[str, str]]:
+    """Iterate over the names and values of the installed entry points in ``group``."""
+    from importlib.metadata import entry_points
+
+    eps = entry_points()
+    if hasattr(eps, "select"):
+        selected = eps.select(group=group)
+    else:
+        # Python < 3.10 returns a dict of groups.
+        selected = eps.get(group, [])
+    for ep in selected:
+        yield ep.name, ep.value
+
+
+def load_target(target: Target) -> type:
+    """Import the form model referred by ``target`` (``"<module>:<class>"``), or return it as it is if it is already a class."""
+    if not isinstance(target, str):
+        return target
+    module, _, attr = target.partition(":")
+    obj = importlib.import_module(module.strip())
+    return functools.reduce(getattr, attr.strip().split("."), obj) if attr else obj
+
+
+def split_pattern(pattern: str) -> Tuple[str, str]:
+    """Split the URL pattern (ex. ``"*.example.com/forms/"``) into the lower case host (``"*.example.com"``) and the path prefix without the trailing slash (``"/forms"``)."""
+    if "://" in pattern:
+        pattern = pattern.split("://", 1)[1]
+    host, _, path = pattern.partition("/")
+    return host.lower(), ("/" + path).rstrip("/")
+
+
+def match_path(path: str, prefix: str) -> bool:
+    """Whether ``path`` is ``prefix`` or under it."""
+    return prefix == "" or path == prefix or path.startswith(prefix + "/")
+
+
+class FormRegistry(Mapping):
+    """A mapping from identifiers to form models which imports them lazily, and the lookup table of URL patterns.
+
+    Args:
+        forms (Dict[str, Target])     : Identifiers and form models (or references to them).
+        hosts (Dict[str, str])        : URL patterns and identifiers.
+        entry_points (bool, optional) : Whether to find form models and URL patterns in the entry points. (They are read only when an unknown identifier is used, or a URL is looked up for the first time.) Defaults to ``True``.
+
+    Examples:
+        >>> from form_auto_fill_in import forms
+        >>> forms.all.register("intra", "my_forms.intra:IntraForm", hosts=["*.intra.example.com"])
+        >>> forms.url2form("https://survey.intra.example.com/f/123")
+        'intra'
+        >>> forms.all["intra"]  # my_forms.intra is imported here.
+        <class 'my_forms.intra.IntraForm'>
+    """
+
+    def __init__(self, forms: Dict[str, Target], hosts: Dict[str, str], entry_points: bool = True):
+        self.targets: Dict[str, Target] = dict(forms)
+        self.hosts: Dict[str, str] = dict(hosts)
+        self.classes: Dict[str, type] = {}
+        self.discovered: bool = not entry_points
+        self._table: Optional[Dict[str, List[Tuple[str, str]]]] = None
+        self._wildcards: List[Tuple[str, str, str]] = []
+
+    def register(self, identifier: str, target: Target, hosts: Iterable[str] = []) -> None:
+        """Register a form model.
+
+        Args:
+            identifier (str)                : An identifier for the form model.
+            target (Target)                 : The form model, or a reference to it (``"<module>:<class>"``).
+            hosts (Iterable[str], optional) : URL patterns answered with the form model. Defaults to ``[]``.
+        """
+        self.targets[identifier] = target
+        self.classes.pop(identifier, None)
+        for pattern in hosts:
+            self.hosts[pattern] = identifier
+        self._table = None
+
+    def discover(self) -> None:
+        """Add the form models and URL patterns in the entry points. (Only once.)"""
+        if self.discovered:
+            return
+        self.discovered = True
+        for name, value in iter_entry_points(FORMS_ENTRY_POINT_GROUP):
+            if name in self.targets:
+                print(f"Form model {toRED(name)} in the entry points is ignored. ({value})")
+                continue
+            self.targets[name] = value
+        for pattern, identifier in iter_entry_points(HOSTS_ENTRY_POINT_GROUP):
+            self.hosts.setdefault(pattern, identifier.strip())
+        self._table = None
+
+    def __getitem__(self, identifier: str) -> type:
+        if identifier not in self.classes:
+            if identifier not in self.targets:
+                self.discover()
+                handleKeyError(lst=list(self.targets.keys()), identifier=identifier)
+            self.classes[identifier] = load_target(self.targets[identifier])
+        return self.classes[identifier]
+
+    def __contains__(self, identifier: object) -> bool:
+        if identifier not in self.targets:
+            self.discover()
+        return identifier in self.targets
+
+    def __iter__(self) -> Iterator[str]:
+        self.discover()
+        return iter(self.targets)
+
+    def __len__(self) -> int:
+        self.discover()
+        return len(self.targets)
+
+    @property
+    def table(self) -> Dict[str, List[Tuple[str, str]]]:
+        """The lookup table from hosts (exact ones, and ``"*.<suffix>"``) to the path prefixes (the longest first) and identifiers. Patterns with the other wildcards are kept in ``_wildcards``."""
+        if self._table is None:
+            self.discover()
+            table: Dict[str, List[Tuple[str, str]]] = {}
+            wildcards: List[Tuple[str, str, str]] = []
+            for pattern, identifier in self.hosts.items():
+                host, path = split_pattern(pattern)
+                name: str = host[2:] if host.startswith("*.") else host
+                if any([c in name for c in "*?["]):
+                    wildcards.append((host, path, identifier))
+                else:
+                    table.setdefault(host, []).append((path, identifier))
+            for entries in table.values():
+                entries.sort(key=lambda e: len(e[0]), reverse=True)
+            wildcards.sort(key=lambda e: len(e[1]), reverse=True)
+            self._table, self._wildcards = table, wildcards
+        return self._table
+
+    def url2form(self, url: str) -> str:
+        """Estimate the appropriate form model for the URL.
+
+        Args:
+            url (str) : Form URL.
+
+        Raises:
+            ValueError: When ``url`` is not a valid URL.
+            KeyError: When no pattern matches ``url``.
+
+        Returns:
+            str: An identifier for the form model.
+        """
+        split = urlsplit(url)
+        if split.scheme not in ["http", "https"] or not split.hostname:
+            raise ValueError(f"It doesn't seem to be a valid url, got url='{url}'")
+        host: str = split.hostname.lower()
+        path: str = split.path
+        table = self.table
+        labels: List[str] = host.split(".")
+        for key in [host] + ["*." + ".".join(labels[i:]) for i in range(1, len(labels))]:
+            for prefix, identifier in table.get(key, []):
+                if match_path(path, prefix):
+                    return identifier
+        for pattern, prefix, identifier in self._wildcards:
+            if fnmatch.fnmatchcase(host, pattern) and match_path(path, prefix):
+                return identifier
+        # Raises KeyError which shows the patterns.
+        handleKeyError(lst=list(self.hosts.keys()), domain=host)
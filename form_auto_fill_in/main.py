@@ -1,9 +1,53 @@
 # coding: utf-8
-from typing import Any, Dict
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
 from . import forms
-from .utils._path import canonicalize_path
-from .utils.generic_utils import load_data
+from .utils._colorings import toGREEN, toRED, toYELLOW
+from .utils.plan_utils import FormPlan, FormPlanError, load_plan, thaw
+from .utils.schema_utils import (
+    find_schema_question,
+    load_schema,
+    save_schema,
+    schema_fingerprint,
+    schema_path,
+)
+from .utils.trace_utils import TRACER
+
+if TYPE_CHECKING:
+    from selenium.webdriver.remote.webdriver import WebDriver
+
+    from .forms.base import BaseForm
+    from .utils.async_driver_utils import AsyncWebDriver
+
+
+def get_form_model(
+    path: str, secrets_dict: Dict[str, str] = {}, verbose: bool = True, **kwargs
+) -> BaseForm:
+    """Compile the form data json, and create the form model of its ``"form"``. (Inferred from ``"URL"`` if it is not given.)
+
+    Args:
+        path (str)                              : Path to the form data json.
+        secrets_dict (Dict[str, str], optional) : Key and value pairs defined in github secrets. Defaults to ``{}``.
+        verbose (bool, optional)                : Whether to print message or not. Defaults to ``True``.
+
+    Raises:
+        FormPlanError: When the json is invalid, or secrets used in it are not in ``secrets_dict``. (Before launching the browser.)
+
+    Returns:
+        BaseForm: The form model.
+    """
+    plan = load_plan(path)
+    return forms.get(
+        identifier=plan.form,
+        path=path,
+        secrets_dict=secrets_dict,
+        verbose=verbose,
+        plan=plan,
+        **kwargs,
+    )
 
 
 def answer_form(
@@ -11,7 +55,8 @@ def answer_form(
     browser: bool = False,
     secrets_dict: Dict[str, str] = {},
     verbose: bool = True,
-    **kwargs
+    driver: Optional[WebDriver] = None,
+    **kwargs,
 ) -> None:
     """Answer Form Using Respective Form Model.
 
@@ -20,12 +65,268 @@ def answer_form(
         browser (bool, optional)                : [description]. Defaults to ``False``.
         secrets_dict (Dict[str, str], optional) : [description]. Defaults to ``{}``.
         verbose (bool, optional)                : [description]. Defaults to ``True``.
+        driver (Optional[WebDriver], optional)  : An already running driver to reuse. Defaults to ``None``.
+
+    Raises:
+        FormPlanError: When the json is invalid, or secrets used in it are not in ``secrets_dict``. (Before launching the browser.)
     """
-    data: Dict[str, Any] = load_data(canonicalize_path(str(path)))
-    form: str = data.get("form")
-    if form is None:
-        form = forms.url2form(url=data.get("url"))
-    model = forms.get(
-        identifier=form, path=path, secrets_dict=secrets_dict, verbose=verbose, **kwargs
-    )
-    model.run(browser=browser)
+    model = get_form_model(path=path, secrets_dict=secrets_dict, verbose=verbose, **kwargs)
+    model.run(browser=browser, driver=driver)
+
+
+async def answer_form_async(
+    path: str,
+    browser: bool = False,
+    secrets_dict: Dict[str, str] = {},
+    verbose: bool = True,
+    driver: Optional[AsyncWebDriver] = None,
+    **kwargs,
+) -> None:
+    """Coroutine version of :func:`answer_form`. Many forms can be answered concurrently in one event loop.
+
+    Args:
+        path (str)                                  : Path to the form data json.
+        browser (bool, optional)                    : Whether you want to run Chrome with GUI browser. Defaults to ``False``.
+        secrets_dict (Dict[str, str], optional)     : Key and value pairs defined in github secrets. Defaults to ``{}``.
+        verbose (bool, optional)                    : Whether to print message or not. Defaults to ``True``.
+        driver (Optional[AsyncWebDriver], optional) : An already running asyncio driver to reuse. Defaults to ``None``.
+
+    Raises:
+        FormPlanError: When the json is invalid, or secrets used in it are not in ``secrets_dict``.
+        NotImplementedError: When the form model doesn't support asyncio. (Before launching the browser.)
+
+    Examples:
+        >>> import asyncio
+        >>> from form_auto_fill_in.main import answer_form_async
+        >>> async def main():
+        ...     await asyncio.gather(*[answer_form_async(path=p) for p in ["A.json", "B.json"]])
+        >>> asyncio.run(main())
+    """
+    model = get_form_model(path=path, secrets_dict=secrets_dict, verbose=verbose, **kwargs)
+    if not model.supports_async():
+        raise NotImplementedError(
+            f"{model.__class__.__name__} ({model.plan.form}) doesn't support asyncio. Use answer_form instead."
+        )
+    await model.run_async(browser=browser, driver=driver)
+
+
+def crawl_form(
+    path: str,
+    browser: bool = False,
+    secrets_dict: Dict[str, str] = {},
+    verbose: bool = True,
+    submit: bool = False,
+    **kwargs,
+) -> Dict[str, Any]:
+    """Walk each page of the form once with the json data, and save its schema at :data:`SCHEMAS_DIR <form_auto_fill_in.utils.schema_utils.SCHEMAS_DIR>`.
+
+    Args:
+        path (str)                              : Path to the form data json.
+        browser (bool, optional)                : Whether you want to run Chrome with GUI browser. Defaults to ``False``.
+        secrets_dict (Dict[str, str], optional) : Key and value pairs defined in github secrets. Defaults to ``{}``.
+        verbose (bool, optional)                : Whether to print message or not. Defaults to ``True``.
+        submit (bool, optional)                 : Whether to submit the form (do the ``next`` step of the last page). Defaults to ``False``.
+
+    Returns:
+        Dict[str, Any]: The result with ``"path"`` (to the schema file), ``"fingerprint"``, ``"previous"`` (the fingerprint of the previous schema, or ``None``) and ``"schema"``.
+    """
+    model = get_form_model(path=path, secrets_dict=secrets_dict, verbose=verbose, **kwargs)
+    schema: Dict[str, Any] = model.crawl(browser=browser, submit=submit)
+    previous: Optional[Dict[str, Any]] = load_schema(url=schema["URL"])
+    return {
+        "path": save_schema(schema),
+        "fingerprint": schema_fingerprint(schema["pages"]),
+        "previous": None if previous is None else previous["fingerprint"],
+        "schema": schema,
+    }
+
+
+def preflight(
+    path: str, secrets_dict: Dict[str, str] = {}, schema: Optional[str] = None
+) -> Dict[str, Any]:
+    """Check the form data json against the cached schema of the form without browser. (``--dry-run``)
+
+    The json itself, secrets used in it, and each answer (unknown question identifiers, ``val`` / ``no`` out of range, etc.) are checked in milliseconds, so broken jobs fail before they take a worker slot.
+
+    Args:
+        path (str)                              : Path to the form data json.
+        secrets_dict (Dict[str, str], optional) : Key and value pairs defined in github secrets. Defaults to ``{}``.
+        schema (Optional[str], optional)        : Path to the schema file. Defaults to the one cached for ``"URL"``. (See :mod:`form_auto_fill_in.utils.schema_utils`)
+
+    Returns:
+        Dict[str, Any]: The result with ``"path"``, ``"errors"``, ``"warnings"``, ``"schema"`` (path to the schema file, or ``""`` if it is not cached) and ``"elapsed"``.
+    """
+    start: float = time.perf_counter()
+    result: Dict[str, Any] = {"path": path, "errors": [], "warnings": [], "schema": ""}
+    errors: List[str] = result["errors"]
+    warnings: List[str] = result["warnings"]
+    try:
+        plan: FormPlan = load_plan(path)
+    except FormPlanError as e:
+        errors.extend(e.errors)
+    except (OSError, ValueError) as e:
+        errors.append(f"[{e.__class__.__name__}] {e}")
+    else:
+        errors.extend(
+            [
+                f"secret {e} is not given. (ex. -P {e[1:-1]}=...)"
+                for e in plan.missing_secrets(secrets_dict)
+            ]
+        )
+        url: str = plan.definition.get("URL", "")
+        data: Optional[Dict[str, Any]] = load_schema(url=url, path=schema)
+        if data is None:
+            warnings.append(f"No schema is cached for {url}, so answers are not checked.")
+        else:
+            result["schema"] = schema or schema_path(url)
+            check_answer = forms.all[plan.form].check_answer
+            pages: List[Dict[str, Any]] = data["pages"]
+            answers: List[Dict[str, Any]] = thaw(plan.definition["answer"])
+            if len(answers) > len(pages):
+                errors.append(f"answer: has {len(answers)} pages, but the form has {len(pages)}")
+            for i, page in enumerate(pages):
+                page_answers: Dict[str, Any] = answers[i] if i < len(answers) else {}
+                checked: Dict[str, Tuple[str, Optional[Dict[str, Any]]]] = {}
+                for key, answer in page_answers.items():
+                    question = find_schema_question(page["questions"], identifier=key)
+                    if question is not None:
+                        checked[question["identifier"]] = (key, answer)
+                    elif key != "next":
+                        errors.append(f"answer[{i}].{key}: no such question in the form")
+                for question in page["questions"]:
+                    key, answer = checked.get(
+                        question["identifier"], (question["identifier"], None)
+                    )
+                    errs, warns = check_answer(question=question, answer=answer)
+                    errors.extend([f"answer[{i}].{key}: {e}" for e in errs])
+                    warnings.extend([f"answer[{i}].{key}: {e}" for e in warns])
+    result["elapsed"] = time.perf_counter() - start
+    return result
+
+
+def print_preflight(results: List[Dict[str, Any]]) -> None:
+    """Print the results of :func:`preflight`.
+
+    Args:
+        results (List[Dict[str, Any]]) : Results of each form.
+    """
+    for result in results:
+        if len(result["errors"]) > 0:
+            mark = toRED("ERROR ")
+        elif len(result["warnings"]) > 0:
+            mark = toYELLOW("WARN  ")
+        else:
+            mark = toGREEN("OK    ")
+        print(f"{mark} {result['path']} ({result['elapsed'] * 1000:.1f}[ms])")
+        for error in result["errors"]:
+            print(toRED(f"  - {error}"))
+        for warning in result["warnings"]:
+            print(toYELLOW(f"  - {warning}"))
+    num_ok: int = len([e for e in results if len(e["errors"]) == 0])
+    print(f"{num_ok}/{len(results)} forms are ready to be answered.")
+
+
+def _answer_form_worker(path: str, trace: bool = False, **kwargs) -> Dict[str, Any]:
+    """Run :func:`answer_form` and report the result instead of raising an error.
+
+    Args:
+        path (str)             : Path to the form data json.
+        trace (bool, optional) : Whether to record spans and return them as ``"trace"``. Defaults to ``False``.
+
+    Returns:
+        Dict[str, Any]: The result with ``"path"``, ``"succeeded"``, ``"elapsed"`` and ``"error"``.
+    """
+    if trace:
+        TRACER.clear()
+        TRACER.enable()
+    start: float = time.perf_counter()
+    error: str = ""
+    try:
+        answer_form(path=path, **kwargs)
+    except Exception as e:
+        error = f"[{e.__class__.__name__}] {e}"
+    result: Dict[str, Any] = {
+        "path": path,
+        "succeeded": error == "",
+        "elapsed": time.perf_counter() - start,
+        "error": error,
+    }
+    if trace:
+        result["trace"] = TRACER.events
+        TRACER.disable()
+    return result
+
+
+def answer_forms(
+    paths: List[str],
+    jobs: int = 1,
+    browser: bool = False,
+    secrets_dict: Dict[str, str] = {},
+    verbose: bool = True,
+    trace: bool = False,
+    validate: bool = True,
+    **kwargs,
+) -> List[Dict[str, Any]]:
+    """Answer several forms, each in its own worker process with its own driver.
+
+    Args:
+        paths (List[str])                       : Paths to the form data json.
+        jobs (int, optional)                    : The maximum number of forms answered concurrently. Defaults to ``1``.
+        browser (bool, optional)                : Whether you want to run Chrome with GUI browser. Defaults to ``False``.
+        secrets_dict (Dict[str, str], optional) : Key and value pairs defined in github secrets. Defaults to ``{}``.
+        verbose (bool, optional)                : Whether to print message or not. Defaults to ``True``.
+        trace (bool, optional)                  : Whether to record spans in the workers, and collect them into :data:`TRACER <form_auto_fill_in.utils.trace_utils.TRACER>`. Defaults to ``False``.
+        validate (bool, optional)               : Whether to check each form with :func:`preflight` first, and fail the broken ones without taking a worker slot. Defaults to ``True``.
+
+    Returns:
+        List[Dict[str, Any]]: Results of each form in the order of ``paths``. (See :func:`print_summary`)
+
+    Note:
+        As workers can not read the standard input, every question has to be answered in the json.
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    results: Dict[str, Dict[str, Any]] = {}
+    if validate:
+        for path in paths:
+            checked: Dict[str, Any] = preflight(path=path, secrets_dict=secrets_dict)
+            if len(checked["errors"]) > 0:
+                results[path] = {
+                    "path": path,
+                    "succeeded": False,
+                    "elapsed": checked["elapsed"],
+                    "error": "[preflight] " + "; ".join(checked["errors"]),
+                }
+    with ProcessPoolExecutor(max_workers=max(1, jobs)) as executor:
+        futures = [
+            executor.submit(
+                _answer_form_worker,
+                path=path,
+                browser=browser,
+                secrets_dict=secrets_dict,
+                verbose=verbose,
+                trace=trace,
+                **kwargs,
+            )
+            for path in paths
+            if path not in results
+        ]
+        for future in as_completed(futures):
+            result = future.result()
+            TRACER.extend(result.pop("trace", []))
+            results[result["path"]] = result
+    return [results[path] for path in paths]
+
+
+def print_summary(results: List[Dict[str, Any]]) -> None:
+    """Print the summary of :func:`answer_forms`.
+
+    Args:
+        results (List[Dict[str, Any]]) : Results of each form.
+    """
+    num_succeeded: int = len([e for e in results if e["succeeded"]])
+    digit: int = max([len(e["path"]) for e in results] + [0])
+    for result in results:
+        mark = toGREEN("OK    ") if result["succeeded"] else toRED("FAILED")
+        print(f"{mark} {result['path']:<{digit}} {result['elapsed']:>7.2f}[s] {result['error']}")
+    print(f"{num_succeeded}/{len(results)} forms are answered successfully.")
@@ -0,0 +1,358 @@
+# coding: utf-8
+"""Answer forms on cron schedules instead of one CI workflow per form.
+
+The schedule file maps the form data json and their secrets to cron expressions. Due jobs are run by at most ``"jobs"`` worker processes, forms on the same host are started at most at the rate of the token bucket of the host, and failed jobs are retried with exponential backoff. (Retries resume from the checkpoint of the failed run.)
+
+.. code-block:: json
+
+    {
+        "jobs": 2,
+        "rate_limits": {
+            "forms.office.com": {"per_minute": 2, "burst": 2},
+            "google.com": {"per_minute": 2, "burst": 2}
+        },
+        "retry": {"attempts": 3, "initial": 60, "factor": 2, "maximum": 900},
+        "schedules": [
+            {
+                "path": "UHMRF.json",
+                "cron": "0 5 * * *",
+                "jitter": 600,
+                "secret": "UHMRF",
+                "secrets": {"UHMRF_PLACE": "ABC"}
+            }
+        ]
+    }
+
+- ``"rate_limits"`` : Token buckets per host. A key matches the host and its subdomains, and ``"*"`` matches the other hosts. (Merged into ``DEFAULT_RATE_LIMITS``)
+- ``"retry"``       : ``"attempts"`` is the total number of tries, and the other keys are passed to :func:`backoff_delay <form_auto_fill_in.utils.schedule_utils.backoff_delay>`. (Merged into ``DEFAULT_RETRY``)
+- ``"schedules"``   : ``"path"`` is relative to the schedule file (or at ``FORM_AUTO_FILL_IN_DIR``), ``"cron"`` is a :class:`CronSchedule <form_auto_fill_in.utils.schedule_utils.CronSchedule>` in the local time, each run is delayed randomly up to ``"jitter"`` seconds, ``"secret"`` is a name of ``SECRETS`` and ``"secrets"`` are added to (or override) them.
+"""
+from __future__ import annotations
+
+import datetime
+import heapq
+import os
+import random
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import urlparse
+
+from .main import _answer_form_worker, preflight
+from .utils._colorings import toBLUE, toGREEN, toRED
+from .utils._path import canonicalize_path
+from .utils._secrets import SECRETS
+from .utils.driver_utils import DriverSpec
+from .utils.generic_utils import load_data
+from .utils.plan_utils import load_plan
+from .utils.schedule_utils import CronSchedule, TokenBucket, backoff_delay
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+SCHEDULE_KEYS: List[str] = ["jobs", "rate_limits", "retry", "schedules"]
+ENTRY_KEYS: List[str] = ["path", "cron", "jitter", "secret", "secrets"]
+#: Token buckets per host. (``per_minute`` forms are started on average, and ``burst`` at once.)
+DEFAULT_RATE_LIMITS: Dict[str, Dict[str, float]] = {
+    "forms.office.com": {"per_minute": 2, "burst": 2},
+    "google.com": {"per_minute": 2, "burst": 2},
+}
+DEFAULT_RETRY: Dict[str, float] = {"attempts": 3, "initial": 60, "factor": 2, "maximum": 900}
+
+
+class ScheduleEntry(NamedTuple):
+    """A form data json answered on a cron schedule.
+
+    Attributes:
+        path (str)                    : Path to the form data json.
+        cron (CronSchedule)           : When the form is answered.
+        jitter (float)                : The maximum random delay in seconds.
+        secrets_dict (Dict[str, str]) : Key and value pairs of the secrets.
+        host (str)                    : The host of the form URL.
+    """
+
+    path: str
+    cron: CronSchedule
+    jitter: float
+    secrets_dict: Dict[str, str]
+    host: str
+
+
+class ScheduledRun(NamedTuple):
+    """A run of :class:`ScheduleEntry`.
+
+    Attributes:
+        entry (ScheduleEntry)       : The entry.
+        nominal (datetime.datetime) : The time of the cron schedule. (The next run is scheduled after it.)
+        attempt (int)               : The number of tries so far.
+        rescheduled (bool)          : Whether the next run of the entry is already queued.
+    """
+
+    entry: ScheduleEntry
+    nominal: datetime.datetime
+    attempt: int = 0
+    rescheduled: bool = False
+
+
+def load_schedule(path: str) -> Dict[str, Any]:
+    """Load and validate the schedule file. Form data json are compiled and checked with :func:`preflight <form_auto_fill_in.main.preflight>` here, so broken ones fail before the scheduler starts.
+
+    Args:
+        path (str) : Path to the schedule file.
+
+    Raises:
+        ValueError: When the schedule (or a form data json in it) is invalid.
+
+    Returns:
+        Dict[str, Any]: ``"jobs"``, ``"rate_limits"``, ``"retry"`` and ``"entries"`` (List of :class:`ScheduleEntry`).
+    """
+    data: Dict[str, Any] = load_data(path)
+    errors: List[str] = [
+        f"{key}: unknown key (must be one of {SCHEDULE_KEYS})"
+        for key in data.keys()
+        if key not in SCHEDULE_KEYS
+    ]
+    rate_limits: Dict[str, Dict[str, float]] = dict(DEFAULT_RATE_LIMITS)
+    rate_limits.update(data.get("rate_limits", {}))
+    for host, limit in rate_limits.items():
+        if not isinstance(limit, dict) or any(
+            [not isinstance(v, (int, float)) or v <= 0 for v in limit.values()]
+        ):
+            errors.append(f"rate_limits.{host}: must be an object with positive numbers")
+    retry: Dict[str, float] = dict(DEFAULT_RETRY)
+    retry.update(data.get("retry", {}))
+
+    entries: List[ScheduleEntry] = []
+    for i, entry in enumerate(data.get("schedules", [])):
+        where: str = f"schedules[{i}]"
+        unknown: List[str] = [key for key in entry.keys() if key not in ENTRY_KEYS]
+        if len(unknown) > 0:
+            errors.append(f"{where}: unknown keys {unknown} (must be one of {ENTRY_KEYS})")
+        form_path: str = os.path.join(os.path.dirname(os.path.abspath(path)), entry.get("path", ""))
+        if not os.path.isfile(form_path):
+            form_path = canonicalize_path(entry.get("path", ""))
+        secrets_dict: Dict[str, str] = SECRETS.get(entry.get("secret"), {}).copy()
+        secrets_dict.update({f"<{k}>": v for k, v in entry.get("secrets", {}).items()})
+        try:
+            cron = CronSchedule(entry.get("cron", ""))
+            plan = load_plan(form_path)
+        except (ValueError, OSError) as e:
+            errors.append(f"{where}: [{e.__class__.__name__}] {e}")
+            continue
+        errors.extend(
+            [
+                f"{where}: {e}"
+                for e in preflight(path=form_path, secrets_dict=secrets_dict)["errors"]
+            ]
+        )
+        entries.append(
+            ScheduleEntry(
+                path=form_path,
+                cron=cron,
+                jitter=float(entry.get("jitter", 0)),
+                secrets_dict=secrets_dict,
+                host=urlparse(plan.definition["URL"]).hostname or "",
+            )
+        )
+    if len(errors) > 0:
+        raise ValueError(f"Invalid schedule at {path}\n" + "\n".join(["  - " + e for e in errors]))
+    return {
+        "jobs": int(data.get("jobs", 1)),
+        "rate_limits": rate_limits,
+        "retry": retry,
+        "entries": entries,
+    }
+
+
+class FormScheduler:
+    """Run :class:`ScheduleEntry` on their cron schedules.
+
+    Args:
+        entries (List[ScheduleEntry])                       : Entries to run.
+        jobs (int, optional)                                : The maximum number of forms answered concurrently. Defaults to ``1``.
+        rate_limits (Dict[str, Dict[str, float]], optional) : Token buckets per host. Defaults to ``DEFAULT_RATE_LIMITS``.
+        retry (Dict[str, float], optional)                  : Retries of failed runs. Defaults to ``DEFAULT_RETRY``.
+        browser (bool, optional)                            : Whether you want to run Chrome with GUI browser. Defaults to ``False``.
+        verbose (bool, optional)                            : Whether to print message or not. Defaults to ``True``.
+        driver_profile (DriverSpec, optional)               : A driver profile which overrides ``"driver"`` in the json data. Defaults to ``None``.
+
+    Examples:
+        >>> from form_auto_fill_in.scheduler import FormScheduler, load_schedule
+        >>> schedule = load_schedule("schedule.json")
+        >>> FormScheduler(**schedule).run()
+    """
+
+    def __init__(
+        self,
+        entries: List[ScheduleEntry],
+        jobs: int = 1,
+        rate_limits: Dict[str, Dict[str, float]] = DEFAULT_RATE_LIMITS,
+        retry: Dict[str, float] = DEFAULT_RETRY,
+        browser: bool = False,
+        verbose: bool = True,
+        driver_profile: DriverSpec = None,
+    ):
+        self.entries: List[ScheduleEntry] = entries
+        self.jobs: int = max(1, jobs)
+        self.retry: Dict[str, float] = dict(DEFAULT_RETRY, **retry)
+        self.browser: bool = browser
+        self.verbose: bool = verbose
+        self.driver_profile: DriverSpec = driver_profile
+        self.buckets: Dict[str, TokenBucket] = {
+            host: TokenBucket(rate=limit.get("per_minute", 1) / 60, burst=limit.get("burst", 1))
+            for host, limit in rate_limits.items()
+        }
+        self.queue: List[Tuple[float, int, ScheduledRun]] = []
+        self._seq: int = 0
+
+    def get_bucket(self, host: str) -> Optional[TokenBucket]:
+        """Get the token bucket of ``host``. The longest matched key wins, and ``"*"`` matches any host.
+
+        Args:
+            host (str) : A host. (ex. ``"docs.google.com"``)
+
+        Returns:
+            Optional[TokenBucket]: The bucket, or ``None`` if ``host`` is not limited.
+        """
+        for key in sorted(self.buckets.keys(), key=len, reverse=True):
+            if host == key or host.endswith("." + key):
+                return self.buckets[key]
+        return self.buckets.get("*")
+
+    def push(self, at: float, run: ScheduledRun) -> None:
+        """Queue ``run`` to start at ``at`` (Seconds since the epoch)."""
+        heapq.heappush(self.queue, (at, self._seq, run))
+        self._seq += 1
+
+    def push_next(self, entry: ScheduleEntry, after: datetime.datetime) -> None:
+        """Queue the next run of ``entry`` after ``after`` (or now, if it is later) with a random delay up to ``entry.jitter``. As with cron, the times missed while the scheduler was not running (ex. suspended, or stalled by a long job) are skipped, not run one after another."""
+        nominal: datetime.datetime = entry.cron.next_after(max(after, datetime.datetime.now()))
+        self.push(
+            nominal.timestamp() + random.uniform(0, entry.jitter), ScheduledRun(entry, nominal)
+        )
+
+    def upcoming(self, count: int = 10) -> List[Tuple[datetime.datetime, str]]:
+        """Get the next ``count`` runs (without jitter) of all entries.
+
+        Args:
+            count (int, optional) : The number of runs. Defaults to ``10``.
+
+        Returns:
+            List[Tuple[datetime.datetime, str]]: Times and paths.
+        """
+        runs: List[Tuple[datetime.datetime, str]] = []
+        now: datetime.datetime = datetime.datetime.now()
+        for entry in self.entries:
+            t: datetime.datetime = now
+            for _ in range(count):
+                t = entry.cron.next_after(t)
+                runs.append((t, entry.path))
+        return sorted(runs)[:count]
+
+    def handle_result(self, run: ScheduledRun, result: Dict[str, Any]) -> None:
+        """Print ``result`` of ``run``, and queue a retry if it failed."""
+        attempt: int = run.attempt + 1
+        if result["succeeded"]:
+            if self.verbose:
+                print(f"{toGREEN('OK')} {result['path']} {result['elapsed']:.2f}[s]")
+            return
+        print(f"{toRED('FAILED')} {result['path']} (attempt {attempt}) {result['error']}")
+        if attempt < self.retry["attempts"]:
+            delay: float = backoff_delay(
+                attempt,
+                initial=self.retry["initial"],
+                factor=self.retry["factor"],
+                maximum=self.retry["maximum"],
+            )
+            print(f"Retry {result['path']} in {toBLUE(f'{delay:.0f}[s]')}")
+            self.push(time.time() + delay, run._replace(attempt=attempt))
+
+    def run(self, once: bool = False) -> List[Dict[str, Any]]:
+        """Run the entries until interrupted.
+
+        Args:
+            once (bool, optional) : Whether to run every entry just once now (with the rate limits and retries) and return. Defaults to ``False``.
+
+        Returns:
+            List[Dict[str, Any]]: (``once=True``) The last result of each entry. (See :func:`answer_forms <form_auto_fill_in.main.answer_forms>`)
+        """
+        from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+        from concurrent.futures.process import BrokenProcessPool
+
+        now: datetime.datetime = datetime.datetime.now()
+        for entry in self.entries:
+            if once:
+                self.push(time.time(), ScheduledRun(entry, now))
+            else:
+                self.push_next(entry, now)
+
+        results: Dict[str, Dict[str, Any]] = {}
+        running: Dict[Future, ScheduledRun] = {}
+        executor = ProcessPoolExecutor(max_workers=self.jobs)
+        broken: bool = False
+        try:
+            while len(self.queue) > 0 or len(running) > 0:
+                if broken:
+                    # A worker died (ex. killed by OOM), so the pool can't run any more jobs.
+                    executor.shutdown(wait=False)
+                    executor = ProcessPoolExecutor(max_workers=self.jobs)
+                    broken = False
+                limited: List[Tuple[float, ScheduledRun]] = []
+                while (
+                    len(self.queue) > 0
+                    and self.queue[0][0] <= time.time()
+                    and len(running) < self.jobs
+                ):
+                    _, _, run = heapq.heappop(self.queue)
+                    if not (run.rescheduled or once):
+                        self.push_next(run.entry, run.nominal)
+                        run = run._replace(rescheduled=True)
+                    bucket: Optional[TokenBucket] = self.get_bucket(run.entry.host)
+                    if bucket is not None and not bucket.try_acquire():
+                        limited.append((time.time() + bucket.wait_time(), run))
+                        continue
+                    if self.verbose:
+                        print(f"{toBLUE('START')} {run.entry.path} (attempt {run.attempt + 1})")
+                    try:
+                        future = executor.submit(
+                            _answer_form_worker,
+                            path=run.entry.path,
+                            browser=self.browser,
+                            secrets_dict=run.entry.secrets_dict,
+                            verbose=self.verbose,
+                            driver_profile=self.driver_profile,
+                            resume=run.attempt > 0,
+                        )
+                    except BrokenProcessPool:
+                        self.push(time.time(), run)
+                        broken = True
+                        break
+                    running[future] = run
+                for at, run in limited:
+                    self.push(at, run)
+
+                timeout: Optional[float] = None
+                if len(self.queue) > 0 and len(running) < self.jobs:
+                    # Wake up at least every minute to follow changes of the clock.
+                    timeout = min(60.0, max(0.0, self.queue[0][0] - time.time()))
+                if len(running) == 0:
+                    time.sleep(timeout or 0)
+                    continue
+                done, _ = wait(list(running.keys()), timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    run = running.pop(future)
+                    try:
+                        result: Dict[str, Any] = future.result()
+                    except Exception as e:
+                        # ex. BrokenProcessPool when a worker is killed. It is retried as a failure.
+                        broken = broken or isinstance(e, BrokenProcessPool)
+                        result = {
+                            "path": run.entry.path,
+                            "succeeded": False,
+                            "elapsed": 0.0,
+                            "error": f"[{e.__class__.__name__}] {e}",
+                        }
+                    results[run.entry.path] = result
+                    self.handle_result(run, result)
+        finally:
+            executor.shutdown()
+        return [results[entry.path] for entry in self.entries if entry.path in results]
@@ -1,22 +1,37 @@
 # coding: utf-8
-from . import argparse_utils, driver_utils, generic_utils
+from . import argparse_utils, driver_utils, generic_utils, session_utils
 from ._colorings import *
 from ._path import *
 from ._secrets import *
 from .argparse_utils import KwargsParamProcessor
 from .driver_utils import (
+    DRIVER_PROFILES,
+    ChromeDriverPool,
+    WaitPolicy,
+    block_urls,
+    clean_driver,
+    fill_in,
     get_chrome_driver,
+    get_chrome_options,
+    get_driver_profile,
+    get_remote_driver,
+    quit_driver,
     try_find_element,
     try_find_element_click,
     try_find_element_func,
     try_find_element_send_keys,
     try_find_element_text,
+    wait_for_element,
+    wait_until_left,
+    wait_until_settled,
 )
 from .generic_utils import (
+    async_try_wrapper,
     handleKeyError,
     load_data,
     openf,
     prepare_example_json,
+    save_data,
     try_wrapper,
     wrap_end,
     wrap_start,
@@ -1,28 +1,93 @@
 # coding: utf-8
+import glob
 import os
 from pathlib import Path
+from typing import List
 
 from ._colorings import toBLUE
 from .generic_utils import prepare_example_json
 
-__all__ = ["UTILS_DIR", "MODULE_DIR", "FORM_AUTO_FILL_IN_DIR"]
+__all__ = ["UTILS_DIR", "MODULE_DIR", "TEMPLATES_DIR", "FORM_AUTO_FILL_IN_DIR", "ensure_form_dir"]
 
 UTILS_DIR: str = os.path.dirname(os.path.abspath(__file__))
 MODULE_DIR: str = os.path.dirname(UTILS_DIR)
+TEMPLATES_DIR: str = os.path.join(MODULE_DIR, "templates")
 
 FORM_AUTO_FILL_IN_DIR: str = os.path.join(os.path.expanduser("~"), ".FormAutoFillIn")
 # Check whether uid/gid has the write access to DATADIR_BASE
 if os.path.exists(FORM_AUTO_FILL_IN_DIR) and not os.access(FORM_AUTO_FILL_IN_DIR, os.W_OK):
     FORM_AUTO_FILL_IN_DIR = os.path.join("/tmp", ".FormAutoFillIn")
+#: A file at ``FORM_AUTO_FILL_IN_DIR`` which tells that the example templates have been copied. (See :func:`ensure_form_dir`)
+TEMPLATES_MARKER: str = ".templates"
 
-if not os.path.exists(FORM_AUTO_FILL_IN_DIR):
-    os.mkdir(FORM_AUTO_FILL_IN_DIR)
-    print(f"{toBLUE(FORM_AUTO_FILL_IN_DIR)} is created. Downloaded data will be stored here.")
-    prepare_example_json(to=FORM_AUTO_FILL_IN_DIR)
+
+def ensure_form_dir() -> str:
+    """Create ``FORM_AUTO_FILL_IN_DIR``, and copy the example templates into it once.
+
+    The templates are copied unless ``TEMPLATES_MARKER`` exists, which is created after all of them are copied. So they are copied even if the directory is created by others (ex. the cache directories in it), or by a process which crashed while copying them, but templates deleted by the user don't come back. Each of them is copied atomically, so it is safe to call from concurrent processes.
+
+    Returns:
+        str: ``FORM_AUTO_FILL_IN_DIR``
+    """
+    try:
+        os.makedirs(FORM_AUTO_FILL_IN_DIR)
+        print(f"{toBLUE(FORM_AUTO_FILL_IN_DIR)} is created. Downloaded data will be stored here.")
+    except FileExistsError:
+        pass
+    marker: str = os.path.join(FORM_AUTO_FILL_IN_DIR, TEMPLATES_MARKER)
+    if not os.path.exists(marker):
+        prepare_example_json(to=FORM_AUTO_FILL_IN_DIR, overwrite=False)
+        open(marker, mode="a").close()
+    return FORM_AUTO_FILL_IN_DIR
 
 
 def canonicalize_path(path: str) -> str:
+    """Resolve ``path`` to the one at ``FORM_AUTO_FILL_IN_DIR`` if it doesn't exist but the one there does. (It doesn't create the directory.)"""
     path = str(path)
-    if not os.path.exists(path) and path in os.listdir(FORM_AUTO_FILL_IN_DIR):
-        path = os.path.join(FORM_AUTO_FILL_IN_DIR, path)
+    if not os.path.exists(path):
+        candidate: str = os.path.join(FORM_AUTO_FILL_IN_DIR, path)
+        if os.path.exists(candidate):
+            path = candidate
     return path
+
+
+def is_cache_path(path: str) -> bool:
+    """Whether ``path`` is in a directory at ``FORM_AUTO_FILL_IN_DIR`` which doesn't contain form data json. (ex. ``plans/<sha>.json``, See ``INDEX_EXCLUDED_DIRS``)"""
+    from .index_utils import INDEX_EXCLUDED_DIRS
+
+    relpath: str = os.path.relpath(os.path.abspath(path), FORM_AUTO_FILL_IN_DIR)
+    return relpath.split(os.sep)[0] in INDEX_EXCLUDED_DIRS
+
+
+def expand_form_paths(paths: List[str]) -> List[str]:
+    """Expand directories and glob patterns into paths to the form data json.
+
+    Directories are walked in the same way as the index (See :func:`iter_form_files <form_auto_fill_in.utils.index_utils.iter_form_files>`), so hidden entries and the cache directories at ``FORM_AUTO_FILL_IN_DIR`` (``plans``, ``sessions``, ...) are skipped. Glob patterns don't match them either.
+
+    Args:
+        paths (List[str]) : Paths to the form data json, directories which contain them, or glob patterns. Names at ``FORM_AUTO_FILL_IN_DIR`` are also accepted.
+
+    Returns:
+        List[str]: Paths to the form data json without duplicates.
+
+    Examples:
+        >>> from form_auto_fill_in.utils._path import expand_form_paths, FORM_AUTO_FILL_IN_DIR
+        >>> expand_form_paths([FORM_AUTO_FILL_IN_DIR])
+        ['/Users/iwasakishuto/.FormAutoFillIn/LabCafe.json', '/Users/iwasakishuto/.FormAutoFillIn/UHMRF-1st.json', ...]
+    """
+    from .index_utils import iter_form_files
+
+    expanded: List[str] = []
+    for path in map(str, paths):
+        if os.path.isdir(path):
+            expanded.extend(
+                sorted([os.path.join(path, relpath) for relpath, _ in iter_form_files(root=path)])
+            )
+        elif glob.has_magic(path):
+            matched: List[str] = sorted(glob.glob(path, recursive=True)) or sorted(
+                glob.glob(os.path.join(FORM_AUTO_FILL_IN_DIR, path), recursive=True)
+            )
+            expanded.extend([e for e in matched if not is_cache_path(e)])
+        else:
+            expanded.append(canonicalize_path(path))
+    return list(dict.fromkeys(expanded))
@@ -0,0 +1,640 @@
+# coding: utf-8
+"""An asyncio-native driver layer which talks the W3C WebDriver wire protocol without blocking.
+
+Many sessions can be driven concurrently from one event loop, because each command only awaits its own socket.
+
+.. code-block:: python
+
+    >>> import asyncio
+    >>> from form_auto_fill_in.utils.async_driver_utils import get_async_chrome_driver
+    >>> async def main():
+    ...     async with get_async_chrome_driver() as driver:
+    ...         await driver.get("https://www.google.com/")
+    ...         return await driver.execute_script("return document.title;")
+    >>> asyncio.run(main())
+    'Google'
+"""
+import asyncio
+import json
+import socket
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from ._colorings import toRED
+from .driver_utils import (
+    FILL_SCRIPT,
+    SETTLE_SCRIPT,
+    WAIT_ELEMENT_SCRIPT,
+    DriverSpec,
+    PollSpec,
+    WaitPolicy,
+    get_chrome_options,
+    get_driver_profile,
+    has_special_keys,
+)
+from .generic_utils import async_try_wrapper
+
+#: The key of the web element reference in the W3C WebDriver protocol.
+ELEMENT_KEY: str = "element-6066-11e4-a52e-4f735466cecf"
+
+
+class AsyncWebDriverException(Exception):
+    """An error returned from the remote end.
+
+    Args:
+        error (str)   : An error code. (ex. ``"no such element"``)
+        message (str) : A detail message.
+    """
+
+    def __init__(self, error: str, message: str = ""):
+        super().__init__(f"{error}: {message}")
+        self.error: str = error
+        self.message: str = message
+
+
+def to_w3c_locator(by: str, value: str) -> Tuple[str, str]:
+    """Convert a locator to the one supported by the W3C WebDriver protocol (as Selenium does).
+
+    Args:
+        by (str)    : Locator strategies.
+        value (str) : Identifier to find the element.
+
+    Returns:
+        Tuple[str, str]: A locator strategy and a value.
+    """
+    if by == "id":
+        return ("css selector", f'[id="{value}"]')
+    if by == "class name":
+        return ("css selector", f".{value}")
+    if by == "name":
+        return ("css selector", f'[name="{value}"]')
+    return (by, value)
+
+
+def raise_for_status(status: int, data: Any) -> Any:
+    """Get the ``value`` of the response, or raise the error in it.
+
+    Args:
+        status (int) : Status code.
+        data (Any)   : Decoded JSON. (A proxy may return another body, ex. a string or ``None``.)
+
+    Raises:
+        AsyncWebDriverException: When ``status`` is an error, or ``value`` has ``"error"``.
+
+    Returns:
+        Any: The ``value`` of the response.
+    """
+    value = data.get("value") if isinstance(data, dict) else data
+    if isinstance(value, dict) and "error" in value:
+        raise AsyncWebDriverException(
+            error=str(value["error"]), message=str(value.get("message", ""))
+        )
+    if status >= 400:
+        raise AsyncWebDriverException(
+            error=str(status), message="" if value is None else str(value)
+        )
+    return value
+
+
+class AsyncHTTPConnection:
+    """A minimal keep-alive HTTP/1.1 client for JSON requests over asyncio streams.
+
+    Args:
+        url (str) : Base URL of the remote end. (ex. ``"http://127.0.0.1:9515"``)
+    """
+
+    def __init__(self, url: str):
+        parsed = urlparse(url)
+        self.host: str = parsed.hostname or "127.0.0.1"
+        self.port: int = parsed.port or 80
+        self.base_path: str = parsed.path.rstrip("/")
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+        self.lock: asyncio.Lock = asyncio.Lock()
+
+    async def _read_body(self, headers: Dict[str, str]) -> bytes:
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            body = b""
+            while True:
+                size = int((await self.reader.readline()).strip().split(b";")[0], 16)
+                if size == 0:
+                    await self.reader.readline()
+                    return body
+                body += await self.reader.readexactly(size)
+                await self.reader.readline()
+        return await self.reader.readexactly(int(headers.get("content-length", 0)))
+
+    async def request(
+        self, method: str, path: str, payload: Optional[Dict[str, Any]] = None
+    ) -> Tuple[int, Any]:
+        """Send a request and wait for the JSON response.
+
+        Args:
+            method (str)                               : HTTP method.
+            path (str)                                 : Path from the base URL.
+            payload (Optional[Dict[str, Any]], optional) : JSON body. Defaults to ``None``.
+
+        Raises:
+            ConnectionError: When the connection is lost after the request is sent. (It is not sent again, because the remote end may have executed it.)
+
+        Returns:
+            Tuple[int, Any]: Status code and decoded JSON.
+        """
+        body: bytes = b"" if payload is None else json.dumps(payload).encode("utf-8")
+        head: str = (
+            f"{method} {self.base_path}{path} HTTP/1.1\r\n"
+            f"Host: {self.host}:{self.port}\r\n"
+            "Connection: keep-alive\r\n"
+            "Content-Type: application/json;charset=UTF-8\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n"
+        )
+        async with self.lock:
+            if self.writer is not None and (self.reader.at_eof() or self.writer.is_closing()):
+                # The keep-alive connection was closed by the remote end while idle.
+                await self.close()
+            for retry in range(2):
+                reused: bool = self.writer is not None
+                if not reused:
+                    self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+                try:
+                    self.writer.write(head.encode("latin-1") + body)
+                    await self.writer.drain()
+                    break
+                except ConnectionError:
+                    # Nothing has been received, so the stale connection is replaced and the request is sent again once.
+                    await self.close()
+                    if not reused or retry > 0:
+                        raise
+            try:
+                status_line = await self.reader.readline()
+                if not status_line:
+                    raise ConnectionResetError("Connection closed by the remote end.")
+                headers: Dict[str, str] = {}
+                while True:
+                    line = (await self.reader.readline()).decode("latin-1").strip()
+                    if line == "":
+                        break
+                    k, v = line.split(":", 1)
+                    headers[k.strip().lower()] = v.strip()
+                data = await self._read_body(headers)
+            except BaseException:
+                # The command may have been executed, so it is never sent again. (ex. a click on "submit")
+                # The rest of the response would be read as the next one, so the connection is dropped.
+                await self.close()
+                raise
+            if headers.get("connection", "").lower() == "close":
+                await self.close()
+        status = int(status_line.split()[1])
+        return (status, json.loads(data) if len(data) > 0 else None)
+
+    async def close(self) -> None:
+        """Close the connection."""
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+            self.reader = None
+
+
+class AsyncWebElement:
+    """Represents a DOM element in :class:`AsyncWebDriver`.
+
+    Args:
+        parent (AsyncWebDriver) : The driver which found this element.
+        id_ (str)               : The web element reference.
+    """
+
+    def __init__(self, parent: "AsyncWebDriver", id_: str):
+        self.parent: "AsyncWebDriver" = parent
+        self.id: str = id_
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, AsyncWebElement) and self.id == other.id
+
+    def __hash__(self) -> int:
+        return hash(self.id)
+
+    async def _execute(self, method: str, path: str, payload: Optional[Dict[str, Any]] = None):
+        return await self.parent.execute(method, f"/element/{self.id}{path}", payload)
+
+    async def find_element(self, by: str, value: str) -> "AsyncWebElement":
+        using, value = to_w3c_locator(by=by, value=value)
+        return await self._execute("POST", "/element", {"using": using, "value": value})
+
+    async def find_elements(self, by: str, value: str) -> List["AsyncWebElement"]:
+        using, value = to_w3c_locator(by=by, value=value)
+        return await self._execute("POST", "/elements", {"using": using, "value": value})
+
+    async def click(self) -> None:
+        await self._execute("POST", "/click", {})
+
+    async def send_keys(self, value: str) -> None:
+        await self._execute("POST", "/value", {"text": value})
+
+    async def get_attribute(self, name: str) -> Optional[str]:
+        return await self._execute("GET", f"/attribute/{name}")
+
+    async def text(self) -> str:
+        return await self._execute("GET", "/text")
+
+
+class AsyncWebDriver:
+    """A driver which talks the W3C WebDriver wire protocol with asyncio.
+
+    Args:
+        url (str)                                    : URL of the remote end (chromedriver or Selenium Grid).
+        capabilities (Optional[Dict[str, Any]], optional) : Capabilities of the new session. Defaults to the capabilities of :func:`get_chrome_options <form_auto_fill_in.utils.driver_utils.get_chrome_options>`.
+    """
+
+    def __init__(self, url: str, capabilities: Optional[Dict[str, Any]] = None):
+        if capabilities is None:
+            capabilities = chrome_capabilities()
+        self.url: str = url
+        self.capabilities: Dict[str, Any] = capabilities
+        self.connection: AsyncHTTPConnection = AsyncHTTPConnection(url)
+        self.session_id: Optional[str] = None
+
+    def _unwrap(self, value: Any) -> Any:
+        if isinstance(value, dict):
+            if ELEMENT_KEY in value:
+                return AsyncWebElement(parent=self, id_=value[ELEMENT_KEY])
+            return {k: self._unwrap(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [self._unwrap(e) for e in value]
+        return value
+
+    def _wrap(self, value: Any) -> Any:
+        if isinstance(value, AsyncWebElement):
+            return {ELEMENT_KEY: value.id}
+        if isinstance(value, dict):
+            return {k: self._wrap(v) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [self._wrap(e) for e in value]
+        return value
+
+    async def execute(
+        self, method: str, path: str, payload: Optional[Dict[str, Any]] = None
+    ) -> Any:
+        """Execute a command of the current session.
+
+        Args:
+            method (str)                               : HTTP method.
+            path (str)                                 : Path from ``/session/{session id}``.
+            payload (Optional[Dict[str, Any]], optional) : JSON body. Defaults to ``None``.
+
+        Raises:
+            AsyncWebDriverException: When the remote end returns an error.
+
+        Returns:
+            Any: The ``value`` of the response.
+        """
+        status, data = await self.connection.request(
+            method, f"/session/{self.session_id}{path}", payload
+        )
+        value = raise_for_status(status, data)
+        return self._unwrap(value)
+
+    async def start_session(self) -> None:
+        """Create a new session."""
+        status, data = await self.connection.request(
+            "POST", "/session", {"capabilities": {"alwaysMatch": self.capabilities}}
+        )
+        value = raise_for_status(status, data)
+        if not isinstance(value, dict) or "sessionId" not in value:
+            raise AsyncWebDriverException(error="session not created", message=str(value))
+        self.session_id = value["sessionId"]
+
+    async def quit(self) -> None:
+        """Delete the session and close the connection."""
+        if self.session_id is not None:
+            await async_try_wrapper(self.execute, "DELETE", "", verbose_=False)
+            self.session_id = None
+        await self.connection.close()
+
+    async def get(self, url: str) -> None:
+        await self.execute("POST", "/url", {"url": url})
+
+    async def current_url(self) -> str:
+        return await self.execute("GET", "/url")
+
+    async def find_element(self, by: str, value: str) -> AsyncWebElement:
+        using, value = to_w3c_locator(by=by, value=value)
+        return await self.execute("POST", "/element", {"using": using, "value": value})
+
+    async def find_elements(self, by: str, value: str) -> List[AsyncWebElement]:
+        using, value = to_w3c_locator(by=by, value=value)
+        return await self.execute("POST", "/elements", {"using": using, "value": value})
+
+    async def execute_script(self, script: str, *args) -> Any:
+        return await self.execute(
+            "POST", "/execute/sync", {"script": script, "args": self._wrap(list(args))}
+        )
+
+    async def execute_async_script(self, script: str, *args) -> Any:
+        return await self.execute(
+            "POST", "/execute/async", {"script": script, "args": self._wrap(list(args))}
+        )
+
+    async def set_script_timeout(self, timeout: float) -> None:
+        await self.execute("POST", "/timeouts", {"script": int(timeout * 1000)})
+
+    async def execute_cdp_cmd(self, cmd: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """Execute a Chrome DevTools Protocol command. (Only chromedriver supports it.)"""
+        return await self.execute("POST", "/goog/cdp/execute", {"cmd": cmd, "params": params or {}})
+
+    async def block_urls(self, patterns: List[str]) -> None:
+        """Coroutine version of :func:`block_urls <form_auto_fill_in.utils.driver_utils.block_urls>`."""
+        await self.execute_cdp_cmd("Network.enable")
+        await self.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+
+
+def chrome_capabilities(browser: bool = False, profile: DriverSpec = None) -> Dict[str, Any]:
+    """Convert :func:`get_chrome_options <form_auto_fill_in.utils.driver_utils.get_chrome_options>` to W3C capabilities.
+
+    Args:
+        browser (bool, optional)       : Whether you want to run Chrome with GUI browser. Defaults to ``False``.
+        profile (DriverSpec, optional) : A driver profile. (See :func:`get_driver_profile <form_auto_fill_in.utils.driver_utils.get_driver_profile>`) Defaults to ``None``.
+
+    Returns:
+        Dict[str, Any]: Capabilities for ``alwaysMatch``.
+    """
+    capabilities: Dict[str, Any] = get_chrome_options(
+        browser=browser, profile=profile
+    ).to_capabilities()
+    # Legacy (JSON Wire Protocol) keys are rejected in W3C mode.
+    return {
+        k: v
+        for k, v in capabilities.items()
+        if k in ["browserName", "pageLoadStrategy", "acceptInsecureCerts"] or ":" in k
+    }
+
+
+def _get_free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@asynccontextmanager
+async def start_chromedriver(
+    executable_path: str = "chromedriver", timeout: float = 10
+) -> AsyncIterator[str]:
+    """Start ``chromedriver`` as a subprocess. One process can host many sessions.
+
+    Args:
+        executable_path (str, optional) : Path to ``chromedriver``. Defaults to ``"chromedriver"``.
+        timeout (float, optional)       : Number of seconds to wait for ``chromedriver`` to be ready. Defaults to ``10``.
+
+    Yields:
+        str: URL of ``chromedriver``.
+    """
+    port: int = _get_free_port()
+    process = await asyncio.create_subprocess_exec(
+        executable_path,
+        f"--port={port}",
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.DEVNULL,
+    )
+    url: str = f"http://127.0.0.1:{port}"
+    try:
+        deadline: float = time.monotonic() + timeout
+        while True:
+            try:
+                connection = AsyncHTTPConnection(url)
+                _, data = await connection.request("GET", "/status")
+                await connection.close()
+                if data["value"].get("ready", True):
+                    break
+            except OSError:
+                pass
+            if time.monotonic() > deadline:
+                raise TimeoutError(toRED(f"chromedriver is not ready at {url}"))
+            await asyncio.sleep(0.05)
+        yield url
+    finally:
+        if process.returncode is None:
+            process.terminate()
+            await process.wait()
+
+
+@asynccontextmanager
+async def get_async_chrome_driver(
+    browser: bool = False, url: Optional[str] = None, profile: DriverSpec = None
+) -> AsyncIterator[AsyncWebDriver]:
+    """Prepare an :class:`AsyncWebDriver` with a new Chrome session.
+
+    Args:
+        browser (bool, optional)       : Whether you want to run Chrome with GUI browser. Defaults to ``False``.
+        url (Optional[str], optional)  : URL of a running ``chromedriver`` (or Selenium Grid) to share. If ``None``, a new ``chromedriver`` is started. Defaults to ``None``.
+        profile (DriverSpec, optional) : A driver profile. (See :func:`get_driver_profile <form_auto_fill_in.utils.driver_utils.get_driver_profile>`) Defaults to ``None``.
+
+    Yields:
+        AsyncWebDriver: A driver.
+    """
+    if url is None:
+        async with start_chromedriver() as url:
+            async with get_async_chrome_driver(browser=browser, url=url, profile=profile) as driver:
+                yield driver
+        return
+    driver = AsyncWebDriver(
+        url=url, capabilities=chrome_capabilities(browser=browser, profile=profile)
+    )
+    await driver.start_session()
+    try:
+        blocked_urls: List[str] = get_driver_profile(profile)["blocked_urls"]
+        if len(blocked_urls) > 0:
+            await async_try_wrapper(
+                driver.block_urls,
+                blocked_urls,
+                msg_="block URLs",
+                verbose_=False,
+            )
+        yield driver
+    finally:
+        await driver.quit()
+
+
+async def async_try_find_element(
+    driver: AsyncWebDriver,
+    by: str,
+    identifier: str,
+    timeout: float = 3,
+    poll: PollSpec = None,
+    verbose: bool = True,
+) -> Optional[AsyncWebElement]:
+    """Coroutine version of :func:`try_find_element <form_auto_fill_in.utils.driver_utils.try_find_element>`.
+
+    Args:
+        driver (AsyncWebDriver)  : An asyncio driver (or element to search under).
+        by (str)                 : Locator strategies.
+        identifier (str)         : Identifier to find the element
+        timeout (float)          : Number of seconds before timing out. Defaults to ``3``.
+        poll (PollSpec)          : How to wait for the element. (See :meth:`WaitPolicy.from_spec <form_auto_fill_in.utils.driver_utils.WaitPolicy.from_spec>`) Defaults to ``None``.
+        verbose (bool)           : Whether you want to print output or not. Defaults to ``True``.
+
+    Returns:
+        Optional[AsyncWebElement]: The element if found.
+    """
+
+    policy: WaitPolicy = WaitPolicy.from_spec(poll)
+
+    async def find() -> AsyncWebElement:
+        deadline: float = time.monotonic() + timeout
+        if policy.observe and isinstance(driver, AsyncWebDriver):
+            try:
+                await driver.set_script_timeout(timeout + 1)
+                element = await driver.execute_async_script(
+                    WAIT_ELEMENT_SCRIPT, by, identifier, int(timeout * 1000)
+                )
+                if element is not None:
+                    return element
+            except AsyncWebDriverException:
+                pass
+        for interval in policy.intervals():
+            elements = await driver.find_elements(by=by, value=identifier)
+            if len(elements) > 0:
+                return elements[0]
+            remaining: float = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"{by}={identifier} is not found in {timeout}[s]")
+            await asyncio.sleep(min(interval, remaining))
+
+    return await async_try_wrapper(
+        find, msg_=f"locate element with {by}={identifier}", verbose_=verbose
+    )
+
+
+async def async_fill_in(target: AsyncWebElement, value: str, fast: bool = False) -> None:
+    """Coroutine version of :func:`fill_in <form_auto_fill_in.utils.driver_utils.fill_in>`."""
+    if fast and not has_special_keys(value):
+        await target.parent.execute_script(FILL_SCRIPT, target, value)
+    else:
+        await target.send_keys(value)
+
+
+async def async_try_find_element_send_keys(
+    driver: AsyncWebDriver,
+    by: Optional[str] = None,
+    identifier: Optional[str] = None,
+    value: str = "",
+    target: Optional[AsyncWebElement] = None,
+    timeout: float = 3,
+    secrets_dict: Dict[str, str] = {},
+    verbose: bool = True,
+    fast: bool = False,
+    poll: PollSpec = None,
+    **kwargs,
+) -> None:
+    """Coroutine version of :func:`try_find_element_send_keys <form_auto_fill_in.utils.driver_utils.try_find_element_send_keys>`."""
+    if target is None:
+        target = await async_try_find_element(
+            driver=driver,
+            by=by,
+            identifier=identifier,
+            timeout=timeout,
+            poll=poll,
+            verbose=verbose,
+        )
+    if target is not None:
+        await async_try_wrapper(
+            async_fill_in,
+            target=target,
+            value=secrets_dict.get(value, value),
+            fast=fast,
+            msg_=f"fill {value} in element with {by}={identifier}",
+            verbose_=verbose,
+        )
+
+
+async def async_try_find_element_click(
+    driver: AsyncWebDriver,
+    by: Optional[str] = None,
+    identifier: Optional[str] = None,
+    target: Optional[AsyncWebElement] = None,
+    timeout: float = 3,
+    secrets_dict: Dict[str, str] = {},
+    verbose: bool = True,
+    poll: PollSpec = None,
+    **kwargs,
+) -> None:
+    """Coroutine version of :func:`try_find_element_click <form_auto_fill_in.utils.driver_utils.try_find_element_click>`."""
+    if target is None:
+        target = await async_try_find_element(
+            driver=driver,
+            by=by,
+            identifier=identifier,
+            timeout=timeout,
+            poll=poll,
+            verbose=verbose,
+        )
+    if target is not None:
+        await async_try_wrapper(
+            target.parent.execute_script,
+            "arguments[0].click();",
+            target,
+            msg_=f"click the element with {by}={identifier}",
+            verbose_=verbose,
+        )
+
+
+async def async_try_find_element_func(
+    driver: AsyncWebDriver,
+    funcname: str = "send_keys",
+    **kwargs,
+) -> None:
+    """Coroutine version of :func:`try_find_element_func <form_auto_fill_in.utils.driver_utils.try_find_element_func>`."""
+    await {"click": async_try_find_element_click, "send_keys": async_try_find_element_send_keys}[
+        funcname
+    ](driver=driver, **kwargs)
+
+
+async def async_wait_until_settled(
+    driver: AsyncWebDriver,
+    selector: str = "body",
+    quiet: float = 0.1,
+    timeout: float = 10,
+    verbose: bool = False,
+) -> bool:
+    """Coroutine version of :func:`wait_until_settled <form_auto_fill_in.utils.driver_utils.wait_until_settled>`."""
+
+    async def settle() -> bool:
+        await driver.set_script_timeout(timeout + 1)
+        return await driver.execute_async_script(
+            SETTLE_SCRIPT, selector, int(quiet * 1000), int(timeout * 1000)
+        )
+
+    return bool(
+        await async_try_wrapper(
+            settle,
+            ret_=False,
+            msg_=f"wait until the element with css selector={selector} settles",
+            verbose_=verbose,
+        )
+    )
+
+
+async def async_wait_until_left(
+    driver: AsyncWebDriver,
+    element: AsyncWebElement,
+    url: Optional[str] = None,
+    timeout: float = 10,
+    poll: PollSpec = None,
+) -> bool:
+    """Coroutine version of :func:`wait_until_left <form_auto_fill_in.utils.driver_utils.wait_until_left>`."""
+    policy: WaitPolicy = WaitPolicy.from_spec(poll)
+    deadline: float = time.monotonic() + timeout
+    for interval in policy.intervals():
+        try:
+            if not await driver.execute_script("return arguments[0].isConnected;", element):
+                return True
+            if url is not None and await driver.current_url() != url:
+                return True
+        except AsyncWebDriverException as e:
+            if e.error == "stale element reference":
+                return True
+        remaining: float = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        await asyncio.sleep(min(interval, remaining))
+    return False
@@ -0,0 +1,141 @@
+# coding: utf-8
+"""Checkpoints of multi-page forms, so that a failed run can be resumed without answering everything again.
+
+A checkpoint records the pages which have been finished, the identifiers of the answered questions, and the answers entered on demand (with standard input). It never contains the answers in the json data, so resolved secrets are not written to disk.
+"""
+import hashlib
+import os
+from typing import Any, Dict, List, Optional
+
+from ._path import FORM_AUTO_FILL_IN_DIR
+from .generic_utils import load_data, save_data
+
+CHECKPOINTS_DIR: str = os.path.join(FORM_AUTO_FILL_IN_DIR, "checkpoints")
+
+
+def checkpoint_path(path: str, secrets_dict: Dict[str, str] = {}) -> str:
+    """Get the path of the checkpoint for the form data json at ``path`` answered with ``secrets_dict``.
+
+    Args:
+        path (str)                              : Path to the form data json.
+        secrets_dict (Dict[str, str], optional) : Key and value pairs of the secrets. Runs with different secrets (ex. accounts) have different checkpoints. Defaults to ``{}``.
+
+    Returns:
+        str: Path to the checkpoint file.
+    """
+    key: str = "\n".join(
+        [os.path.abspath(path)] + [f"{k}={v}" for k, v in sorted(secrets_dict.items())]
+    )
+    return os.path.join(CHECKPOINTS_DIR, hashlib.sha256(key.encode("utf-8")).hexdigest() + ".json")
+
+
+class Checkpoint:
+    """Progress of answering a form.
+
+    Args:
+        path (str)                                                         : Path to the checkpoint file.
+        key (str)                                                          : The key of the plan. (See :class:`FormPlan <form_auto_fill_in.utils.plan_utils.FormPlan>`) A checkpoint of the modified json is not resumed.
+        page (int, optional)                                               : The index of the first page which is not finished. Defaults to ``0``.
+        answered (Optional[Dict[str, List[str]]], optional)                : Identifiers of the answered questions for each page index.
+        answers (Optional[Dict[str, Dict[str, Dict[str, Any]]]], optional) : Answers entered on demand for each page index and question identifier.
+
+    Examples:
+        >>> from form_auto_fill_in.utils.checkpoint_utils import Checkpoint, checkpoint_path
+        >>> checkpoint = Checkpoint.load(path=checkpoint_path("UHMRF.json"), key=plan.key)
+        >>> checkpoint.record(page=0, identifier="1", answer={"no": 2})
+        >>> checkpoint.finish_page(page=0)
+    """
+
+    def __init__(
+        self,
+        path: str,
+        key: str,
+        page: int = 0,
+        answered: Optional[Dict[str, List[str]]] = None,
+        answers: Optional[Dict[str, Dict[str, Dict[str, Any]]]] = None,
+    ):
+        self.path: str = path
+        self.key: str = key
+        self.page: int = page
+        self.answered: Dict[str, List[str]] = answered or {}
+        self.answers: Dict[str, Dict[str, Dict[str, Any]]] = answers or {}
+
+    @classmethod
+    def load(cls, path: str, key: str) -> "Checkpoint":
+        """Load the checkpoint at ``path``. A new one is returned if it doesn't exist, is broken, or is for another ``key``.
+
+        Args:
+            path (str) : Path to the checkpoint file.
+            key (str)  : The key of the plan.
+
+        Returns:
+            Checkpoint: The checkpoint.
+        """
+        try:
+            data: Dict[str, Any] = load_data(path)
+            if data.get("key") == key:
+                return cls(
+                    path=path,
+                    key=key,
+                    page=int(data.get("page", 0)),
+                    answered=data.get("answered", {}),
+                    answers=data.get("answers", {}),
+                )
+        except (OSError, ValueError):
+            pass
+        return cls(path=path, key=key)
+
+    @property
+    def started(self) -> bool:
+        """Whether any question has been answered."""
+        return self.page > 0 or len(self.answered) > 0
+
+    def get_answers(self, page: int) -> Dict[str, Dict[str, Any]]:
+        """Get the answers entered on demand in the ``page`` th page."""
+        return self.answers.get(str(page), {})
+
+    def is_answered(self, page: int, identifier: str) -> bool:
+        return identifier in self.answered.get(str(page), [])
+
+    def record(
+        self, page: int, identifier: str, answer: Dict[str, Any] = {}, answered: bool = True
+    ) -> None:
+        """Record the answer of the question ``identifier`` in the ``page`` th page, and save the checkpoint.
+
+        Args:
+            page (int)                        : The index of the page.
+            identifier (str)                  : The identifier of the question.
+            answer (Dict[str, Any], optional) : The answer entered on demand. Defaults to ``{}``.
+            answered (bool, optional)         : Whether the question is answered. (``False`` if answering it failed after the answer was entered.) Defaults to ``True``.
+        """
+        answered = answered and not self.is_answered(page, identifier)
+        if not answered and len(answer) == 0:
+            return
+        if answered:
+            self.answered.setdefault(str(page), []).append(identifier)
+        if len(answer) > 0:
+            self.answers.setdefault(str(page), {}).setdefault(identifier, {}).update(answer)
+        self.save()
+
+    def finish_page(self, page: int) -> None:
+        """Record that the ``page`` th page is finished (its ``next`` step is done), and save the checkpoint."""
+        self.page = page + 1
+        self.save()
+
+    def save(self) -> None:
+        """Save the checkpoint. (Only the owner can read it, as it may contain answers entered on demand.)"""
+        save_data(
+            {
+                "key": self.key,
+                "page": self.page,
+                "answered": self.answered,
+                "answers": self.answers,
+            },
+            self.path,
+            mode=0o600,
+        )
+
+    def delete(self) -> None:
+        """Delete the checkpoint file (ex. after the form is answered)."""
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -1,54 +1,736 @@
 # coding: utf-8
+# NOTE: selenium is imported only when a driver is needed, so that importing this module is fast.
+from __future__ import annotations
 
-from typing import Any, Callable, Dict, Optional
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
 
-from selenium import webdriver
-from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.remote.webdriver import WebDriver
-from selenium.webdriver.remote.webelement import WebElement
-from selenium.webdriver.support.ui import WebDriverWait
+if TYPE_CHECKING:
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.remote.webdriver import WebDriver
+    from selenium.webdriver.remote.webelement import WebElement
 
 from ._colorings import toBLACK, toGREEN, toRED
-from .generic_utils import try_wrapper
+from .generic_utils import handleKeyError, try_wrapper
+from .process_utils import (
+    forget_driver,
+    get_driver_pid,
+    get_tree_rss,
+    kill_processes,
+    reap_orphans,
+    record_driver,
+    snapshot_tree,
+)
+from .schedule_utils import backoff_delay
+from .trace_utils import traced
 
+#: Driver profiles selectable by ``"driver"`` in the form data json or ``--driver`` of the CLI.
+#: ``"lean"`` doesn't wait for subresources, doesn't download images, fonts, media and analytics, and trims features of Chrome which form filling never needs.
+DRIVER_PROFILES: Dict[str, Dict[str, Any]] = {
+    "default": {},
+    "lean": {
+        "page_load_strategy": "eager",
+        "arguments": [
+            "--disable-extensions",
+            "--disable-gpu",
+            "--disable-background-networking",
+            "--disable-background-timer-throttling",
+            "--disable-component-update",
+            "--disable-default-apps",
+            "--disable-sync",
+            "--disable-features=Translate,OptimizationHints,MediaRouter",
+            "--blink-settings=imagesEnabled=false",
+            "--mute-audio",
+            "--no-first-run",
+            "--window-size=800,600",
+        ],
+        "prefs": {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.default_content_setting_values.notifications": 2,
+        },
+        "blocked_urls": [
+            "*.png",
+            "*.jpg",
+            "*.jpeg",
+            "*.gif",
+            "*.webp",
+            "*.svg",
+            "*.ico",
+            "*.woff",
+            "*.woff2",
+            "*.ttf",
+            "*.otf",
+            "*.mp3",
+            "*.mp4",
+            "*.webm",
+            "*google-analytics.com*",
+            "*googletagmanager.com*",
+            "*doubleclick.net*",
+        ],
+    },
+}
 
-def get_chrome_driver(browser: bool = False) -> WebDriver:
+#: ``"driver"`` in the form data json. A name of ``DRIVER_PROFILES``, or ``{"profile": name, "blocked_urls": [...], "remote": url, "session_retries": n}``.
+DriverSpec = Union[str, Dict[str, Any], None]
+
+#: Connections to the remote ends (ex. Selenium Grid) shared by the drivers in this process, so that HTTP connections are kept alive and reused.
+REMOTE_CONNECTIONS: Dict[str, Any] = {}
+_REMOTE_CONNECTIONS_LOCK: threading.Lock = threading.Lock()
+
+
+def get_driver_profile(spec: DriverSpec = None) -> Dict[str, Any]:
+    """Resolve ``spec`` into a driver profile.
+
+    Args:
+        spec (DriverSpec, optional) : A name of ``DRIVER_PROFILES``, or a dict with ``"profile"`` (a name of ``DRIVER_PROFILES``), ``"blocked_urls"`` (URL patterns blocked in addition to those of the profile. A warning is printed if the driver can't block them, ex. a remote end without the Chrome DevTools Protocol endpoint.), ``"remote"`` (URL of the remote end, ex. Selenium Grid, used instead of local Chrome) and ``"session_retries"`` (the number of retries when the remote end can't create a session). Defaults to ``None``. (``"default"``)
+
+    Returns:
+        Dict[str, Any]: A driver profile with ``"page_load_strategy"``, ``"arguments"``, ``"prefs"``, ``"blocked_urls"``, ``"remote"`` and ``"session_retries"``.
+
+    Examples:
+        >>> from form_auto_fill_in.utils import get_driver_profile
+        >>> profile = get_driver_profile({"profile": "lean", "blocked_urls": ["*.css"]})
+        >>> profile["page_load_strategy"], profile["blocked_urls"][-1]
+        ('eager', '*.css')
+    """
+    if spec is None:
+        spec = "default"
+    if isinstance(spec, str):
+        spec = {"profile": spec}
+    name: str = spec.get("profile", "default")
+    handleKeyError(lst=list(DRIVER_PROFILES.keys()), profile=name)
+    base: Dict[str, Any] = DRIVER_PROFILES[name]
+    return {
+        "page_load_strategy": base.get("page_load_strategy", "normal"),
+        "arguments": list(base.get("arguments", [])),
+        "prefs": dict(base.get("prefs", {})),
+        "blocked_urls": list(base.get("blocked_urls", [])) + list(spec.get("blocked_urls", [])),
+        "remote": spec.get("remote"),
+        "session_retries": int(spec.get("session_retries", 3)),
+    }
+
+
+def merge_driver_specs(*specs: DriverSpec) -> DriverSpec:
+    """Merge driver specs. Keys of the later ones override those of the former ones.
+
+    Args:
+        specs (DriverSpec) : Driver specs. (See :func:`get_driver_profile`)
+
+    Returns:
+        DriverSpec: The merged spec, or ``None`` if all of them are ``None``.
+
+    Examples:
+        >>> from form_auto_fill_in.utils.driver_utils import merge_driver_specs
+        >>> merge_driver_specs({"profile": "lean", "blocked_urls": ["*.css"]}, {"remote": "http://127.0.0.1:4444"})
+        {'profile': 'lean', 'blocked_urls': ['*.css'], 'remote': 'http://127.0.0.1:4444'}
+    """
+    merged: Dict[str, Any] = {}
+    for spec in specs:
+        if spec is not None:
+            merged.update({"profile": spec} if isinstance(spec, str) else spec)
+    return merged or None
+
+
+def make_driver_spec(profile: Optional[str] = None, remote: Optional[str] = None) -> DriverSpec:
+    """Make a driver spec from the options of the CLI (``--driver`` and ``--remote``), which is merged into ``"driver"`` in the json data.
+
+    Args:
+        profile (Optional[str], optional) : A name of ``DRIVER_PROFILES``. Defaults to ``None``.
+        remote (Optional[str], optional)  : URL of the remote end. (ex. Selenium Grid) Defaults to ``None``.
+
+    Returns:
+        DriverSpec: The spec, or ``None`` if neither is given.
+    """
+    return merge_driver_specs(profile, None if remote is None else {"remote": remote})
+
+
+def get_chrome_options(browser: bool = False, profile: DriverSpec = None) -> Options:
+    """Get options of Chrome shared by :func:`get_chrome_driver` and the asyncio driver layer.
+
+    Args:
+        browser (bool, optional)       : Whether you want to run Chrome with GUI browser. Defaults to ``False``.
+        profile (DriverSpec, optional) : A driver profile. (See :func:`get_driver_profile`) Defaults to ``None``.
+
+    Returns:
+        Options: Options of Chrome.
+    """
+    from selenium.webdriver.chrome.options import Options
+
+    driver_profile: Dict[str, Any] = get_driver_profile(profile)
     chrome_options = Options()
     chrome_options.add_argument("--no-sandbox")
     chrome_options.add_argument("--ignore-certificate-errors")
     chrome_options.add_argument("--disable-dev-shm-usage")
+    prefs: Dict[str, Any] = driver_profile["prefs"]
     if browser:
-        chrome_options.add_experimental_option(
-            "prefs",
+        prefs.update(
             {
                 # "plugins.always_open_pdf_externally": True,
                 "profile.default_content_settings.popups": 1,
                 # "download.default_directory": ".",
                 "directory_upgrade": True,
-            },
+            }
         )
         chrome_options.add_argument("--kiosk-printing")
     else:
         chrome_options.add_argument("--headless")
-    return webdriver.Chrome(options=chrome_options)
+    if len(prefs) > 0:
+        chrome_options.add_experimental_option("prefs", prefs)
+    for argument in driver_profile["arguments"]:
+        chrome_options.add_argument(argument)
+    if driver_profile["page_load_strategy"] != "normal":
+        chrome_options.set_capability("pageLoadStrategy", driver_profile["page_load_strategy"])
+    return chrome_options
+
+
+def block_urls(driver: WebDriver, patterns: List[str]) -> bool:
+    """Block requests whose URLs match ``patterns`` through the Chrome DevTools Protocol.
+
+    Sessions on a remote end (``webdriver.Remote`` doesn't have ``execute_cdp_cmd``) send the commands through the endpoint of chromedriver (``/goog/cdp/execute``), which Selenium Grid also forwards to the node.
+
+    Args:
+        driver (WebDriver)   : Selenium WebDriver.
+        patterns (List[str]) : URL patterns. ``*`` matches any characters. (ex. ``"*.png"``)
+
+    Returns:
+        bool: Whether the patterns are applied. (Drivers other than Chrome, and remote ends which don't support the endpoint, can't block them.)
+    """
+    from selenium.common.exceptions import WebDriverException
+
+    def execute_cdp_cmd(cmd: str, params: Dict[str, Any]) -> Any:
+        if hasattr(driver, "execute_cdp_cmd"):
+            return driver.execute_cdp_cmd(cmd, params)
+        driver.command_executor._commands.setdefault(
+            "executeCdpCommand", ("POST", "/session/$sessionId/goog/cdp/execute")
+        )
+        return driver.execute("executeCdpCommand", {"cmd": cmd, "params": params})
+
+    try:
+        execute_cdp_cmd("Network.enable", {})
+        execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+    except (WebDriverException, AttributeError):
+        return False
+    return True
+
+
+def get_remote_connection(url: str) -> Any:
+    """Get the keep-alive connection to the remote end ``url`` shared in this process.
+
+    Args:
+        url (str) : URL of the remote end. (ex. ``"http://127.0.0.1:4444/wd/hub"``)
+
+    Returns:
+        RemoteConnection: The connection.
+    """
+    from selenium.webdriver.remote.remote_connection import RemoteConnection
+
+    with _REMOTE_CONNECTIONS_LOCK:
+        if url not in REMOTE_CONNECTIONS:
+            REMOTE_CONNECTIONS[url] = RemoteConnection(url, keep_alive=True)
+        return REMOTE_CONNECTIONS[url]
+
+
+def get_remote_driver(url: str, options: Options, retries: int = 3) -> WebDriver:
+    """Create a session of Chrome on the remote end (ex. Selenium Grid, or ``chromedriver --port=9515``).
+
+    When a session can't be created (ex. all nodes are busy, or the grid is restarting), it is retried with exponential backoff.
+
+    Args:
+        url (str)               : URL of the remote end.
+        options (Options)       : Options of Chrome. (See :func:`get_chrome_options`)
+        retries (int, optional) : The number of retries. Defaults to ``3``.
+
+    Raises:
+        WebDriverException: When a session can't be created after ``retries`` retries.
+
+    Returns:
+        WebDriver: Selenium WebDriver.
+    """
+    from selenium import webdriver
+    from selenium.common.exceptions import WebDriverException
+    from urllib3.exceptions import HTTPError
+
+    for attempt in range(retries + 1):
+        try:
+            return webdriver.Remote(command_executor=get_remote_connection(url), options=options)
+        except (WebDriverException, HTTPError, OSError) as e:
+            if attempt == retries:
+                if isinstance(e, WebDriverException):
+                    raise
+                raise WebDriverException(
+                    f"Failed to create a session on {url} ([{e.__class__.__name__}] {e})"
+                ) from e
+            time.sleep(backoff_delay(attempt + 1, initial=1.0, maximum=30.0))
+
+
+def get_chrome_driver(browser: bool = False, profile: DriverSpec = None) -> WebDriver:
+    """Launch Chrome, or create a session on the remote end if ``"remote"`` is given in ``profile``. (See :func:`get_remote_driver`)
+
+    A local chromedriver is recorded, so that it is killed by :func:`reap_orphans <form_auto_fill_in.utils.process_utils.reap_orphans>` if this process crashes without quitting it. (Quit it with :func:`quit_driver`.)
+
+    Args:
+        browser (bool, optional)       : Whether you want to run Chrome with GUI browser. Defaults to ``False``.
+        profile (DriverSpec, optional) : A driver profile. (See :func:`get_driver_profile`) Defaults to ``None``.
+
+    Returns:
+        WebDriver: Selenium WebDriver.
+    """
+    from selenium import webdriver
+
+    driver_profile: Dict[str, Any] = get_driver_profile(profile)
+    blocked_urls: List[str] = driver_profile["blocked_urls"]
+    options: Options = get_chrome_options(browser=browser, profile=profile)
+    if driver_profile["remote"] is not None:
+        driver = get_remote_driver(
+            url=driver_profile["remote"],
+            options=options,
+            retries=driver_profile["session_retries"],
+        )
+    else:
+        driver = webdriver.Chrome(options=options)
+    pid: Optional[int] = get_driver_pid(driver)
+    if pid is not None:
+        try_wrapper(record_driver, pid, msg_="record the driver", verbose_=False)
+    if len(blocked_urls) > 0 and not block_urls(driver, blocked_urls):
+        print(
+            toRED(
+                f"[WARNING] URLs are not blocked ({blocked_urls}), because the driver doesn't support the Chrome DevTools Protocol. Only the arguments and the prefs of the profile are applied."
+            )
+        )
+    return driver
+
+
+def quit_driver(driver: WebDriver) -> None:
+    """Quit ``driver``, kill its processes which remain (ex. Chrome which doesn't respond), and delete its record.
+
+    Args:
+        driver (WebDriver) : Selenium WebDriver.
+    """
+    pid: Optional[int] = get_driver_pid(driver)
+    # Chrome processes are orphaned when chromedriver exits, so they are listed in advance.
+    snapshot: Dict[int, Any] = {} if pid is None else snapshot_tree(pid)
+    try_wrapper(driver.quit, msg_="quit the driver", verbose_=False)
+    kill_processes(snapshot)
+    forget_driver(pid)
+
+
+class SessionLostError(RuntimeError):
+    """Raised when the WebDriver session doesn't respond any more. (ex. Chrome or chromedriver crashed)"""
+
+
+def is_session_alive(driver: WebDriver) -> bool:
+    """Whether the session of ``driver`` still responds.
+
+    Args:
+        driver (WebDriver) : Selenium WebDriver.
+
+    Returns:
+        bool: ``False`` if the session is deleted, or the browser or driver is not reachable.
+    """
+    from selenium.common.exceptions import UnexpectedAlertPresentException
+
+    try:
+        driver.current_url
+    except UnexpectedAlertPresentException:
+        pass
+    except Exception:
+        return False
+    return True
+
+
+def clean_driver(driver: WebDriver) -> None:
+    """Clean ``driver`` up so that it can be reused for another form.
+
+    Extra tabs are closed, cookies, caches and storages are cleared, and the remaining tab shows a blank page.
+
+    Args:
+        driver (WebDriver) : Selenium WebDriver.
+    """
+    for handle in driver.window_handles[1:]:
+        driver.switch_to.window(handle)
+        driver.close()
+    driver.switch_to.window(driver.window_handles[0])
+    try_wrapper(
+        driver.execute_script,
+        "window.localStorage.clear(); window.sessionStorage.clear();",
+        msg_="clear storages",
+        verbose_=False,
+    )
+    if hasattr(driver, "execute_cdp_cmd"):
+        driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        driver.execute_cdp_cmd("Network.clearBrowserCache", {})
+    else:
+        driver.delete_all_cookies()
+    driver.get("about:blank")
+
+
+class ChromeDriverPool:
+    """A pool of warmed Chrome drivers which are reused across forms.
+
+    The memory usage of each driver (the RSS of chromedriver and its Chrome processes, See :mod:`process_utils <form_auto_fill_in.utils.process_utils>`) is measured around each job, and a driver is replaced with a new one after ``max_jobs`` jobs, or when its memory usage exceeds ``max_rss``. Drivers left by crashed processes are killed when the pool is created and closed.
+
+    Args:
+        size (int, optional)                : The number of drivers kept in the pool. Defaults to ``1``.
+        browser (bool, optional)            : Whether you want to run Chrome with GUI browser. Defaults to ``False``.
+        profile (DriverSpec, optional)      : A driver profile of all drivers. (See :func:`get_driver_profile`) Defaults to ``None``.
+        max_jobs (Optional[int], optional)  : The number of jobs after which a driver is replaced. Defaults to ``None``. (Unlimited)
+        max_rss (Optional[float], optional) : The memory usage [MB] over which a driver is replaced. Defaults to ``None``. (Unlimited)
+        verbose (bool, optional)            : Whether to print the memory usage after each job. Defaults to ``False``.
+
+    Attributes:
+        size (int)     : The number of drivers in the pool. (It is smaller than ``capacity`` while drivers which failed to launch are not replaced.)
+        capacity (int) : The number of drivers which should be kept in the pool.
+
+    Examples:
+        >>> from form_auto_fill_in.utils import ChromeDriverPool
+        >>> with ChromeDriverPool(size=2, max_jobs=50, max_rss=1024) as pool:
+        ...     usage = {}
+        ...     with pool.acquire(usage=usage) as driver:
+        ...         driver.get("https://www.google.com/")
+        ...     print(usage)
+        {'jobs': 1, 'rss': 312.4, 'delta': 41.2, 'recycled': ''}
+    """
 
+    def __init__(
+        self,
+        size: int = 1,
+        browser: bool = False,
+        profile: DriverSpec = None,
+        max_jobs: Optional[int] = None,
+        max_rss: Optional[float] = None,
+        verbose: bool = False,
+    ):
+        self.size: int = size
+        self.capacity: int = size
+        self.browser: bool = browser
+        self.profile: DriverSpec = profile
+        self.max_jobs: Optional[int] = max_jobs
+        self.max_rss: Optional[float] = max_rss
+        self.verbose: bool = verbose
+        self.drivers: List[WebDriver] = []
+        self.jobs: Dict[int, int] = {}
+        self.idle: queue.Queue = queue.Queue()
+        self.lock: threading.Lock = threading.Lock()
+        reap_orphans()
+        for _ in range(size):
+            self.idle.put(self.create_driver())
 
+    def create_driver(self) -> WebDriver:
+        """Launch a new driver and register it to the pool.
+
+        Returns:
+            WebDriver: A new driver.
+        """
+        driver = get_chrome_driver(browser=self.browser, profile=self.profile)
+        with self.lock:
+            self.drivers.append(driver)
+            self.jobs[id(driver)] = 0
+        return driver
+
+    def discard_driver(self, driver: WebDriver) -> None:
+        """Quit ``driver`` and remove it from the pool.
+
+        Args:
+            driver (WebDriver) : A driver in the pool.
+        """
+        with self.lock:
+            if driver in self.drivers:
+                self.drivers.remove(driver)
+            self.jobs.pop(id(driver), None)
+        quit_driver(driver)
+
+    def get_rss(self, driver: WebDriver) -> float:
+        """Get the memory usage [MB] of ``driver``. (``0`` if it can't be measured.)"""
+        pid: Optional[int] = get_driver_pid(driver)
+        return 0.0 if pid is None else get_tree_rss(pid) / 2**20
+
+    def should_recycle(self, jobs: int, rss: float) -> str:
+        """Get the reason why the driver which has done ``jobs`` jobs and uses ``rss`` [MB] should be replaced, or ``""`` if it can be reused."""
+        if self.max_jobs is not None and jobs >= self.max_jobs:
+            return f"{jobs} jobs"
+        if self.max_rss is not None and rss > self.max_rss:
+            return f"{rss:.1f}MB > {self.max_rss:.1f}MB"
+        return ""
+
+    def refill(self) -> None:
+        """Launch drivers for the slots lost by failed replacements (See :meth:`release`).
+
+        Raises:
+            Exception: When no driver is left in the pool and a new one can't be launched, so that :meth:`acquire` doesn't wait forever.
+        """
+        while True:
+            with self.lock:
+                if self.size >= self.capacity:
+                    return
+                self.size += 1
+            try:
+                self.idle.put(self.create_driver())
+            except Exception as e:
+                with self.lock:
+                    self.size -= 1
+                    size: int = self.size
+                if size == 0:
+                    raise
+                print(toRED(f"[{e.__class__.__name__}] Failed to launch a driver. ({e})"))
+                return
+
+    @contextmanager
+    def acquire(
+        self, timeout: Optional[float] = None, usage: Optional[Dict[str, Any]] = None
+    ) -> Iterator[WebDriver]:
+        """Hand out an idle driver, and give it back to the pool after the job. (See :meth:`release`)
+
+        Args:
+            timeout (Optional[float], optional)        : Number of seconds to wait for an idle driver. Defaults to ``None``.
+            usage (Optional[Dict[str, Any]], optional) : A dict which receives the usage of the driver after the job, ``"jobs"`` (the number of jobs done by the driver), ``"rss"`` (the memory usage [MB] after cleaning it), ``"delta"`` (the change of it by the job [MB]) and ``"recycled"`` (why the driver is replaced, or ``""``). Defaults to ``None``.
+
+        Yields:
+            WebDriver: An idle driver.
+        """
+        self.refill()
+        driver: WebDriver = self.idle.get(timeout=timeout)
+        rss: float = self.get_rss(driver)
+        try:
+            yield driver
+        finally:
+            self.release(driver=driver, rss=rss, usage=usage)
+
+    def release(
+        self, driver: WebDriver, rss: float = 0.0, usage: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """Clean ``driver`` up, and put it back to the pool.
+
+        If the driver can not be cleaned (ex. Chrome or chromedriver crashed), or it should be recycled (See :meth:`should_recycle`), it is replaced with a new one. If the new one can't be launched either, the slot is dropped (:attr:`size` is decreased) and refilled by the next :meth:`acquire`, so the pool never waits for a driver which will not come back.
+
+        Args:
+            driver (WebDriver)                         : A driver handed out by :meth:`acquire`.
+            rss (float, optional)                      : The memory usage [MB] of the driver before the job. Defaults to ``0.0``.
+            usage (Optional[Dict[str, Any]], optional) : A dict which receives the usage of the driver. (See :meth:`acquire`) Defaults to ``None``.
+        """
+        recycled: str = ""
+        try:
+            clean_driver(driver)
+        except Exception as e:
+            recycled = f"the driver can not be cleaned ([{e.__class__.__name__}])"
+        with self.lock:
+            jobs: int = self.jobs.get(id(driver), 0) + 1
+            self.jobs[id(driver)] = jobs
+        after: float = self.get_rss(driver)
+        recycled = recycled or self.should_recycle(jobs=jobs, rss=after)
+        if recycled != "":
+            self.discard_driver(driver)
+            try:
+                driver = self.create_driver()
+            except Exception as e:
+                with self.lock:
+                    self.size -= 1
+                recycled += f", and it can not be replaced ([{e.__class__.__name__}] {e})"
+                driver = None
+        if usage is not None:
+            usage.update(
+                {
+                    "jobs": jobs,
+                    "rss": round(after, 1),
+                    "delta": round(after - rss, 1),
+                    "recycled": recycled,
+                }
+            )
+        if self.verbose or driver is None:
+            print(
+                f"Driver memory: {after:.1f}MB ({after - rss:+.1f}MB) after {jobs} job(s)"
+                + ("" if recycled == "" else toRED(f" Recycled ({recycled})"))
+            )
+        if driver is not None:
+            self.idle.put(driver)
+
+    def close(self) -> None:
+        """Quit all drivers in the pool, and kill the drivers left by crashed processes."""
+        for driver in list(self.drivers):
+            self.discard_driver(driver)
+        reap_orphans()
+
+    def __enter__(self) -> "ChromeDriverPool":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+class WaitPolicy:
+    """How to wait for an element which is not present yet.
+
+    The element is looked up again after each interval of :meth:`intervals`, which starts with ``initial`` seconds and grows ``factor`` times up to ``maximum`` seconds, so elements which appear soon are found soon, while the slow ones don't flood the driver with commands. If ``observe`` is ``True``, the element is awaited with a ``MutationObserver`` injected by ``execute_async_script`` (See :data:`WAIT_ELEMENT_SCRIPT`) instead, and the polling is used only when the script is interrupted (ex. by navigation).
+
+    Inherit this class and override :meth:`intervals` to plug in your own strategy.
+
+    Args:
+        initial (float, optional) : The first interval in seconds. Defaults to ``0.05``.
+        factor (float, optional)  : The ratio of an interval to the previous one. Defaults to ``2.0``.
+        maximum (float, optional) : The maximum interval in seconds. Defaults to ``0.5``.
+        observe (bool, optional)  : Whether to wait with a ``MutationObserver``. Defaults to ``False``.
+
+    Examples:
+        >>> from form_auto_fill_in.utils import WaitPolicy
+        >>> policy = WaitPolicy.from_spec({"initial": 0.01, "maximum": 0.2})
+        >>> intervals = policy.intervals()
+        >>> [next(intervals) for _ in range(6)]
+        [0.01, 0.02, 0.04, 0.08, 0.16, 0.2]
+    """
+
+    def __init__(
+        self,
+        initial: float = 0.05,
+        factor: float = 2.0,
+        maximum: float = 0.5,
+        observe: bool = False,
+    ):
+        self.initial: float = initial
+        self.factor: float = factor
+        self.maximum: float = maximum
+        self.observe: bool = observe
+
+    def intervals(self) -> Iterator[float]:
+        """Yield the intervals between lookups.
+
+        Yields:
+            Iterator[float]: Number of seconds to sleep.
+        """
+        interval: float = self.initial
+        while True:
+            yield min(interval, self.maximum)
+            interval *= self.factor
+
+    @classmethod
+    def from_spec(cls, spec: PollSpec) -> "WaitPolicy":
+        """Create a policy from ``"poll"`` of a step in the json data.
+
+        Args:
+            spec (PollSpec) : ``None`` (:data:`DEFAULT_WAIT_POLICY`), a fixed interval in seconds, ``"observe"``, keyword arguments of :class:`WaitPolicy`, or a policy itself.
+
+        Returns:
+            WaitPolicy: A wait policy.
+        """
+        if spec is None:
+            return DEFAULT_WAIT_POLICY
+        if isinstance(spec, WaitPolicy):
+            return spec
+        if isinstance(spec, str):
+            handleKeyError(lst=["observe"], spec=spec)
+            return cls(observe=True)
+        if isinstance(spec, dict):
+            return cls(**spec)
+        return cls(initial=spec, factor=1.0, maximum=spec)
+
+
+#: ``"poll"`` of a step in the json data. (See :meth:`WaitPolicy.from_spec`)
+PollSpec = Union[None, float, str, Dict[str, Any], WaitPolicy]
+DEFAULT_WAIT_POLICY: WaitPolicy = WaitPolicy()
+
+WAIT_ELEMENT_SCRIPT: str = """
+var by = arguments[0], identifier = arguments[1], timeout = arguments[2];
+var callback = arguments[arguments.length - 1];
+function find() {
+    switch (by) {
+        case "id": return document.getElementById(identifier);
+        case "xpath": return document.evaluate(
+            identifier, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+        ).singleNodeValue;
+        case "name": return document.getElementsByName(identifier)[0];
+        case "tag name": return document.getElementsByTagName(identifier)[0];
+        case "class name": return document.getElementsByClassName(identifier)[0];
+        case "link text":
+        case "partial link text":
+            return Array.prototype.find.call(document.links, function (a) {
+                var text = a.textContent.trim();
+                return by === "link text" ? text === identifier : text.indexOf(identifier) >= 0;
+            });
+        default: return document.querySelector(identifier);
+    }
+}
+var found = find();
+if (found) { callback(found); return; }
+var observer = new MutationObserver(function () {
+    var found = find();
+    if (found) { finish(found); }
+});
+var deadline = setTimeout(function () { finish(null); }, timeout);
+function finish(element) {
+    observer.disconnect();
+    clearTimeout(deadline);
+    callback(element || null);
+}
+observer.observe(document, {childList: true, subtree: true, attributes: true});
+"""
+
+
+def wait_for_element(
+    driver: WebDriver,
+    by: str,
+    identifier: str,
+    timeout: float = 3,
+    poll: PollSpec = None,
+) -> WebElement:
+    """Wait for an element given a By strategy and locator according to the wait policy.
+
+    Args:
+        driver (WebDriver)        : Selenium WebDriver.
+        by (str)                  : Locator strategies.
+        identifier (str)          : Identifier to find the element
+        timeout (float, optional) : Number of seconds before timing out. Defaults to ``3``.
+        poll (PollSpec)           : A wait policy. (See :meth:`WaitPolicy.from_spec`) Defaults to ``None``.
+
+    Raises:
+        TimeoutException: When the element is not found in ``timeout`` seconds.
+
+    Returns:
+        WebElement: The element.
+    """
+    from selenium.common.exceptions import TimeoutException, WebDriverException
+
+    policy: WaitPolicy = WaitPolicy.from_spec(poll)
+    deadline: float = time.monotonic() + timeout
+    if policy.observe and hasattr(driver, "execute_async_script"):
+        try:
+            driver.set_script_timeout(timeout + 1)
+            element = driver.execute_async_script(
+                WAIT_ELEMENT_SCRIPT, by, identifier, int(timeout * 1000)
+            )
+            if element is not None:
+                return element
+        except WebDriverException:
+            # ex. "document unloaded while waiting for result", then poll the new document.
+            pass
+    for interval in policy.intervals():
+        elements: List[WebElement] = driver.find_elements(by=by, value=identifier)
+        if len(elements) > 0:
+            return elements[0]
+        remaining: float = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutException(f"{by}={identifier} is not found in {timeout}[s]")
+        time.sleep(min(interval, remaining))
+
+
+@traced()
 def try_find_element(
     driver: WebDriver,
     by: str,
     identifier: str,
-    timeout: int = 3,
+    timeout: float = 3,
     verbose: bool = True,
-) -> None:
+    poll: PollSpec = None,
+) -> Optional[WebElement]:
     """Find an element given a By strategy and locator.
 
     Args:
-        driver (WebDriver)            : Selenium WebDriver.
-        by (str)                      : Locator strategies. See `4. Locating Elements — Selenium Python Bindings 2 documentation <https://selenium-python.readthedocs.io/locating-elements.html>`_
-        identifier (str)              : Identifier to find the element
-        timeout (int)                 : Number of seconds before timing out. Defaults to ``3``.
-        verbose (bool)                : Whether you want to print output or not. Defaults to ``True``.
+        driver (WebDriver) : Selenium WebDriver.
+        by (str)           : Locator strategies. See `4. Locating Elements — Selenium Python Bindings 2 documentation <https://selenium-python.readthedocs.io/locating-elements.html>`_
+        identifier (str)   : Identifier to find the element
+        timeout (float)    : Number of seconds before timing out. Defaults to ``3``.
+        verbose (bool)     : Whether you want to print output or not. Defaults to ``True``.
+        poll (PollSpec)    : How to wait for the element. (See :meth:`WaitPolicy.from_spec`) Defaults to ``None``.
 
     Examples:
         >>> from form_auto_fill_in.utils import get_chrome_driver, try_find_element
@@ -58,13 +740,18 @@ def try_find_element(
         Succeeded to locate element with tag name=img
     """
     return try_wrapper(
-        func=WebDriverWait(driver=driver, timeout=timeout).until,
+        func=wait_for_element,
         msg_=f"locate element with {by}={identifier}",
-        method=lambda x: x.find_element(by=by, value=identifier),
+        driver=driver,
+        by=by,
+        identifier=identifier,
+        timeout=timeout,
+        poll=poll,
         verbose_=verbose,
     )
 
 
+@traced()
 def try_find_element_text(
     driver: Optional[WebDriver] = None,
     by: Optional[str] = None,
@@ -74,6 +761,7 @@ def try_find_element_text(
     verbose: bool = True,
     get_text: Callable[[WebElement], str] = lambda target: target.text,
     default_text: str = "",
+    poll: PollSpec = None,
 ) -> str:
     """Find an element given a By strategy and locator, and get text from it.
 
@@ -86,6 +774,7 @@ def try_find_element_text(
         verbose (bool, optional)                         : Whether you want to print output or not. Defaults to ``True``.
         get_text (Callable[[WebElement], str], optional) : A function to extract text from the target element. Defaults to ``lambdatarget:target.text``.
         default_text (str, optional)                     : Value to return when a function fails. Defaults to ``""``.
+        poll (PollSpec, optional)                        : How to wait for the element. (See :meth:`WaitPolicy.from_spec`) Defaults to ``None``.
 
     Returns:
         str: Extracted text.
@@ -98,6 +787,7 @@ def try_find_element_text(
             by=by,
             timeout=timeout,
             verbose=verbose,
+            poll=poll,
         )
 
     if target is not None:
@@ -107,6 +797,47 @@ def try_find_element_text(
     return text
 
 
+FILL_SCRIPT: str = """
+var target = arguments[0], value = arguments[1];
+var prototype = target instanceof HTMLTextAreaElement
+    ? HTMLTextAreaElement.prototype
+    : HTMLInputElement.prototype;
+target.focus();
+Object.getOwnPropertyDescriptor(prototype, "value").set.call(target, target.value + value);
+target.dispatchEvent(new Event("input", {bubbles: true}));
+target.dispatchEvent(new Event("change", {bubbles: true}));
+"""
+#: The range of the characters for the special keys of WebDriver (``selenium.webdriver.common.keys.Keys``, ex. ``Keys.ENTER``)
+SPECIAL_KEYS_RANGE: Tuple[str, str] = ("\ue000", "\ue05d")
+
+
+def has_special_keys(value: str) -> bool:
+    """Whether ``value`` contains special keys (ex. ``Keys.ENTER``, ``Keys.TAB``) which can only be typed."""
+    return any([SPECIAL_KEYS_RANGE[0] <= c <= SPECIAL_KEYS_RANGE[1] for c in value])
+
+
+@traced(arg_keys=())
+def fill_in(target: WebElement, value: str, fast: bool = False) -> None:
+    """Fill ``value`` in ``target``.
+
+    Args:
+        target (WebElement)    : Represents a DOM element.
+        value (str)            : A string for typing, or setting form fields.
+        fast (bool, optional)  : Whether to set the value and dispatch the ``input`` and ``change`` events with a single script call instead of typing it character by character. It is ignored if ``value`` contains special keys (See :func:`has_special_keys`), which the script would set literally. Defaults to ``False``.
+
+    Examples:
+        >>> from form_auto_fill_in.utils import get_chrome_driver, fill_in
+        >>> with get_chrome_driver() as driver:
+        ...     driver.get("https://www.google.com/")
+        ...     fill_in(target=driver.find_element_by_name("q"), value="selenium", fast=True)
+    """
+    if fast and not has_special_keys(value):
+        target.parent.execute_script(FILL_SCRIPT, target, value)
+    else:
+        target.send_keys(*tuple(value))
+
+
+@traced()
 def try_find_element_send_keys(
     driver: WebDriver,
     by: Optional[str] = None,
@@ -116,6 +847,8 @@ def try_find_element_send_keys(
     timeout: int = 3,
     secrets_dict: Dict[str, str] = {},
     verbose: bool = True,
+    fast: bool = False,
+    poll: PollSpec = None,
 ) -> None:
     """Find an element given a By strategy and locator, and Simulates typing into the element.
 
@@ -128,6 +861,8 @@ def try_find_element_send_keys(
         timeout (int)                 : Number of seconds before timing out. Defaults to ``3``.
         secrets_dict (Dict[str, str]) : Key and value pairs defined in github secrets. It is used because the password etc. is not output as it is. Defaults to ``{}``.
         verbose (bool)                : Whether you want to print output or not. Defaults to ``True``.
+        fast (bool)                   : Whether to fill in the value with a single script call instead of typing it. (See :func:`fill_in`) Defaults to ``False``.
+        poll (PollSpec)               : How to wait for the element. (See :meth:`WaitPolicy.from_spec`) Defaults to ``None``.
     """
     if target is None:
         target = try_find_element(
@@ -136,17 +871,21 @@ def try_find_element_send_keys(
             by=by,
             timeout=timeout,
             verbose=verbose,
+            poll=poll,
         )
     # real_values = secrets_dict.get(val, val) for val in values]
     if target is not None:
         try_wrapper(
-            target.send_keys,
-            *tuple(secrets_dict.get(value, value)),
+            fill_in,
+            target=target,
+            value=secrets_dict.get(value, value),
+            fast=fast,
             msg_=f"fill {value} in element with {by}={identifier}",
             verbose_=verbose,
         )
 
 
+@traced()
 def try_find_element_click(
     driver: WebDriver,
     by: Optional[str] = None,
@@ -155,6 +894,7 @@ def try_find_element_click(
     timeout: int = 3,
     secrets_dict: Dict[str, str] = {},
     verbose: bool = True,
+    poll: PollSpec = None,
 ) -> None:
     """Find an element given a By strategy and locator, and Clicks the element.
 
@@ -166,6 +906,7 @@ def try_find_element_click(
         timeout (int)                 : Number of seconds before timing out. Defaults to ``3``.
         secrets_dict (Dict[str, str]) : Key and value pairs defined in github secrets. It is used because the password etc. is not output as it is. Defaults to ``{}``.
         verbose (bool)                : Whether you want to print output or not. Defaults to ``True``.
+        poll (PollSpec)               : How to wait for the element. (See :meth:`WaitPolicy.from_spec`) Defaults to ``None``.
     """
     if target is None:
         target = try_find_element(
@@ -174,9 +915,12 @@ def try_find_element_click(
             by=by,
             timeout=timeout,
             verbose=verbose,
+            poll=poll,
         )
     if target is not None:
 
+        from selenium.common.exceptions import StaleElementReferenceException
+
         def element_click(driver, target):
             try:
                 driver.execute_script("arguments[0].click();", target)
@@ -192,6 +936,110 @@ def try_find_element_click(
         )
 
 
+SETTLE_SCRIPT: str = """
+var selector = arguments[0], quiet = arguments[1], timeout = arguments[2];
+var callback = arguments[arguments.length - 1];
+var target = document.querySelector(selector) || document.body;
+var timer = null, deadline = null;
+var observer = new MutationObserver(function () {
+    clearTimeout(timer);
+    timer = setTimeout(function () { finish(true); }, quiet);
+});
+function finish(settled) {
+    observer.disconnect();
+    clearTimeout(timer);
+    clearTimeout(deadline);
+    callback(settled);
+}
+observer.observe(target, {childList: true, subtree: true, attributes: true, characterData: true});
+timer = setTimeout(function () { finish(true); }, quiet);
+deadline = setTimeout(function () { finish(false); }, timeout);
+"""
+
+
+@traced(arg_keys=("selector",))
+def wait_until_settled(
+    driver: WebDriver,
+    selector: str = "body",
+    quiet: float = 0.1,
+    timeout: float = 10,
+    verbose: bool = False,
+) -> bool:
+    """Wait until the DOM under ``selector`` has not been mutated for ``quiet`` seconds.
+
+    A ``MutationObserver`` is injected with ``execute_async_script``, so this function returns as soon as the page is quiet instead of polling it at a fixed interval.
+
+    Args:
+        driver (WebDriver)        : Selenium WebDriver.
+        selector (str, optional)  : A CSS selector of the element to observe. If it is not found, ``document.body`` is observed. Defaults to ``"body"``.
+        quiet (float, optional)   : Number of seconds without any mutation to regard the DOM as settled. Defaults to ``0.1``.
+        timeout (float, optional) : Number of seconds before giving up. Defaults to ``10``.
+        verbose (bool, optional)  : Whether you want to print output or not. Defaults to ``False``.
+
+    Returns:
+        bool: Whether the DOM has settled or not. ``False`` is also returned when the observer could not be injected, so callers can fall back to polling.
+    """
+
+    def settle(driver: WebDriver) -> bool:
+        driver.set_script_timeout(timeout + 1)
+        return driver.execute_async_script(
+            SETTLE_SCRIPT, selector, int(quiet * 1000), int(timeout * 1000)
+        )
+
+    return bool(
+        try_wrapper(
+            func=settle,
+            driver=driver,
+            ret_=False,
+            msg_=f"wait until the element with css selector={selector} settles",
+            verbose_=verbose,
+        )
+    )
+
+
+def wait_until_left(
+    driver: WebDriver,
+    element: WebElement,
+    url: Optional[str] = None,
+    timeout: float = 10,
+    poll: PollSpec = None,
+) -> bool:
+    """Wait until ``element`` of the current page is detached from the DOM, or the URL changes from ``url``.
+
+    A click done by a script returns before the navigation (or the XHR which renders the next section) completes, and the old page may look settled meanwhile, so it is awaited after clicking "next" not to answer the old page again.
+
+    Args:
+        driver (WebDriver)            : Selenium WebDriver.
+        element (WebElement)          : An element of the current page. (ex. a question)
+        url (Optional[str], optional) : The URL of the current page. Defaults to ``None``. (Not compared)
+        timeout (float, optional)     : Number of seconds before giving up. Defaults to ``10``.
+        poll (PollSpec, optional)     : How often to check it. (See :meth:`WaitPolicy.from_spec`) Defaults to ``None``.
+
+    Returns:
+        bool: Whether the page has been left in ``timeout`` seconds.
+    """
+    from selenium.common.exceptions import StaleElementReferenceException, WebDriverException
+
+    policy: WaitPolicy = WaitPolicy.from_spec(poll)
+    deadline: float = time.monotonic() + timeout
+    for interval in policy.intervals():
+        try:
+            if not driver.execute_script("return arguments[0].isConnected;", element):
+                return True
+            if url is not None and driver.current_url != url:
+                return True
+        except StaleElementReferenceException:
+            return True
+        except WebDriverException:
+            # ex. The document is being unloaded.
+            pass
+        remaining: float = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        time.sleep(min(interval, remaining))
+    return False
+
+
 def try_find_element_func(
     driver: WebDriver,
     funcname: str = "send_keys",
@@ -1,9 +1,11 @@
 # coding: utf-8
 import json
 import os
+import shutil
 import subprocess
+import tempfile
 from pathlib import Path
-from typing import Any, Callable, Dict, Optional, Union
+from typing import Any, Awaitable, Callable, Dict, Optional, Union
 
 from ._colorings import _toCOLOR_create, toBLUE, toGREEN, toRED
 from ._data import EXAMPLE_JSON_BASE_URL, EXAMPLE_JSON_DATA
@@ -54,6 +56,31 @@ def load_data(path: Union[str, Path]) -> Dict[str, Any]:
     return data
 
 
+def save_data(data: Any, path: Union[str, Path], mode: int = 0o644) -> None:
+    """Save data to JSON file at ``path`` atomically.
+
+    The data is written to a temporary file in the same directory and then renamed, so concurrent readers never see a partially written file.
+
+    Args:
+        data (Any)                     : JSON serializable data.
+        path (Union[str, Path])        : Path to json file.
+        mode (int, optional)           : Permission bits of the file (ex. ``0o600`` for credentials). Defaults to ``0o644``.
+    """
+    path = str(path)
+    dirname = os.path.dirname(os.path.abspath(path))
+    os.makedirs(dirname, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=dirname, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, mode="w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
 def try_wrapper(
     func: callable,
     *args,
@@ -96,6 +123,32 @@ def try_wrapper(
     return ret_
 
 
+async def async_try_wrapper(
+    func: Callable[..., Awaitable[Any]],
+    *args,
+    ret_: Optional[Any] = None,
+    msg_: str = "",
+    verbose_: bool = True,
+    **kwargs,
+) -> Any:
+    """Coroutine version of :func:`try_wrapper`. Wrap ``await func(*args, **kwargs)`` with ``try`` and ``except`` blocks.
+
+    Args:
+        func (Callable[..., Awaitable[Any]]) : coroutine functions.
+        ret_ (Optional[Any], optional)       : default ret val. Defaults to ``None``.
+        msg_ (str, optional)                 : message to print. Defaults to ``""``.
+        verbose_ (bool, optional)            : Whether to print message or not. Defaults to ``True``.
+    """
+    try:
+        ret_ = await func(*args, **kwargs)
+        prefix = toGREEN("Succeeded to ")
+    except Exception as e:
+        prefix = toRED(f"[{e.__class__.__name__}] Failed to ")
+    if verbose_:
+        print(prefix + msg_)
+    return ret_
+
+
 def openf(file_path: str, timeout: Optional[int] = None) -> None:
     """Open a file in Finder.
 
@@ -106,14 +159,35 @@ def openf(file_path: str, timeout: Optional[int] = None) -> None:
     subprocess.call(f"open '{file_path}'", timeout=timeout, shell=True)
 
 
-def prepare_example_json(to: str, timeout: Optional[int] = None) -> None:
+def prepare_example_json(
+    to: str, timeout: Optional[int] = None, download: bool = False, overwrite: bool = True
+) -> None:
+    """Prepare the example form data json at ``to``.
+
+    Args:
+        to (str)                          : Path to the directory.
+        timeout (Optional[int], optional) : Timeout of downloading. Defaults to ``None``.
+        download (bool, optional)         : Whether to download the latest ones from ``EXAMPLE_JSON_BASE_URL`` instead of copying the ones bundled in the package. Defaults to ``False``.
+        overwrite (bool, optional)        : Whether to replace the ones which already exist at ``to``. Defaults to ``True``.
+    """
+    templates_dir: str = os.path.join(os.path.dirname(os.path.dirname(__file__)), "templates")
     for fn in EXAMPLE_JSON_DATA:
-        subprocess.call(
-            ["wget", EXAMPLE_JSON_BASE_URL + fn, "-O", os.path.join(to, fn)],
-            timeout=timeout,
-            shell=False,
-        )
-        print(f"Downloaded {toGREEN(fn)}")
+        if not overwrite and os.path.exists(os.path.join(to, fn)):
+            continue
+        if download:
+            subprocess.call(
+                ["wget", EXAMPLE_JSON_BASE_URL + fn, "-O", os.path.join(to, fn)],
+                timeout=timeout,
+                shell=False,
+            )
+            print(f"Downloaded {toGREEN(fn)}")
+        else:
+            fd, tmp_path = tempfile.mkstemp(dir=to, prefix=".", suffix=".tmp")
+            os.close(fd)
+            shutil.copyfile(os.path.join(templates_dir, fn), tmp_path)
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, os.path.join(to, fn))
+            print(f"Copied {toGREEN(fn)}")
 
 
 def wrap_start(string: str, color: str = "GREEN", indent: int = 0) -> str:
@@ -0,0 +1,244 @@
+# coding: utf-8
+"""A persistent metadata index of the form data json at ``FORM_AUTO_FILL_IN_DIR``.
+
+The index is a SQLite database keyed by the path, and each row is refreshed only when the modification time or size of the file changes, so listing and searching don't have to parse all files.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from ._path import FORM_AUTO_FILL_IN_DIR
+
+FORM_INDEX_PATH: str = os.path.join(FORM_AUTO_FILL_IN_DIR, ".index.sqlite3")
+#: The version of the rows. Indexes of the other versions are rebuilt.
+INDEX_VERSION: int = 2
+#: Directories at ``FORM_AUTO_FILL_IN_DIR`` which don't contain form data json.
+INDEX_EXCLUDED_DIRS: List[str] = ["sessions", "plans", "checkpoints", "schemas", "drivers"]
+INDEX_COLUMNS: List[str] = [
+    "path",
+    "mtime",
+    "size",
+    "name",
+    "form",
+    "host",
+    "pages",
+    "sha256",
+    "error",
+]
+INDEX_SORT_KEYS: List[str] = ["path", "name", "form", "host", "pages", "mtime"]
+
+_SCHEMA: str = """
+CREATE TABLE IF NOT EXISTS forms (
+    path TEXT PRIMARY KEY,
+    mtime INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    name TEXT,
+    form TEXT,
+    host TEXT,
+    pages INTEGER,
+    sha256 TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS forms_name ON forms (name);
+CREATE INDEX IF NOT EXISTS forms_form ON forms (form);
+CREATE INDEX IF NOT EXISTS forms_host ON forms (host);
+"""
+
+
+def iter_form_files(root: str = FORM_AUTO_FILL_IN_DIR) -> Iterator[Tuple[str, os.stat_result]]:
+    """Walk ``root`` and yield json files with their stats. Hidden entries and ``INDEX_EXCLUDED_DIRS`` are skipped.
+
+    Args:
+        root (str, optional) : Path to the directory. Defaults to ``FORM_AUTO_FILL_IN_DIR``.
+
+    Yields:
+        Iterator[Tuple[str, os.stat_result]]: The path relative to ``root`` and its stat.
+    """
+    stack: List[str] = [root]
+    while len(stack) > 0:
+        dirname = stack.pop()
+        try:
+            entries = list(os.scandir(dirname))
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.name.startswith("."):
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                if dirname != root or entry.name not in INDEX_EXCLUDED_DIRS:
+                    stack.append(entry.path)
+            elif entry.name.endswith(".json") and entry.is_file():
+                yield os.path.relpath(entry.path, root), entry.stat()
+
+
+def read_form_metadata(path: str) -> Dict[str, Any]:
+    """Read the metadata of the form data json at ``path``.
+
+    Args:
+        path (str) : Path to the form data json.
+
+    Returns:
+        Dict[str, Any]: ``"name"``, ``"form"`` (estimated from ``"URL"`` if it is not given), ``"host"``, ``"pages"``, ``"sha256"`` and ``"error"`` (when the file can't be parsed).
+    """
+    from .. import forms
+
+    with open(path, mode="rb") as f:
+        content: bytes = f.read()
+    metadata: Dict[str, Any] = {
+        "name": None,
+        "form": None,
+        "host": None,
+        "pages": None,
+        "sha256": hashlib.sha256(content).hexdigest(),
+        "error": None,
+    }
+    try:
+        data = json.loads(content.decode("utf-8"))
+        if not isinstance(data, dict):
+            raise ValueError("The form data must be an object.")
+    except ValueError as e:
+        metadata["error"] = f"[{e.__class__.__name__}] {e}"
+        return metadata
+    form: Optional[str] = data.get("form")
+    if form is None:
+        try:
+            form = forms.url2form(url=str(data.get("URL", "")))
+        except (KeyError, ValueError):
+            pass
+    metadata.update(
+        {
+            "name": data.get("name"),
+            "form": form,
+            "host": urlparse(str(data.get("URL", ""))).hostname,
+            "pages": len(data.get("answer", [])),
+        }
+    )
+    return metadata
+
+
+class FormIndex:
+    """A metadata index of the form data json at ``root``.
+
+    Args:
+        root (str, optional)           : Path to the directory of the form data json. Defaults to ``FORM_AUTO_FILL_IN_DIR``.
+        path (Optional[str], optional) : Path to the database. Defaults to ``.index.sqlite3`` at ``root``.
+
+    Examples:
+        >>> from form_auto_fill_in.utils.index_utils import FormIndex
+        >>> with FormIndex() as index:
+        ...     index.update()
+        ...     for row in index.search(form="google", sort="name"):
+        ...         print(row["path"], row["name"])
+    """
+
+    def __init__(self, root: str = FORM_AUTO_FILL_IN_DIR, path: Optional[str] = None):
+        self.root: str = root
+        self.path: str = path or os.path.join(root, os.path.basename(FORM_INDEX_PATH))
+        self.connection: sqlite3.Connection = sqlite3.connect(self.path, timeout=30)
+        self.connection.row_factory = sqlite3.Row
+        try:
+            self.connection.executescript(_SCHEMA)
+        except sqlite3.DatabaseError:
+            # A broken database is rebuilt from scratch.
+            self.connection.close()
+            os.remove(self.path)
+            self.connection = sqlite3.connect(self.path, timeout=30)
+            self.connection.row_factory = sqlite3.Row
+            self.connection.executescript(_SCHEMA)
+        if self.connection.execute("PRAGMA user_version").fetchone()[0] != INDEX_VERSION:
+            with self.connection:
+                self.connection.execute("DELETE FROM forms")
+                self.connection.execute(f"PRAGMA user_version = {INDEX_VERSION}")
+
+    def update(self, rebuild: bool = False) -> Tuple[int, int]:
+        """Refresh the rows of the files which are added, modified or removed since the last update.
+
+        Args:
+            rebuild (bool, optional) : Whether to parse all files again. Defaults to ``False``.
+
+        Returns:
+            Tuple[int, int]: The number of refreshed rows and removed rows.
+        """
+        with self.connection:
+            if rebuild:
+                self.connection.execute("DELETE FROM forms")
+            indexed: Dict[str, Tuple[int, int]] = {
+                row["path"]: (row["mtime"], row["size"])
+                for row in self.connection.execute("SELECT path, mtime, size FROM forms")
+            }
+            rows: List[Dict[str, Any]] = []
+            for path, stat in iter_form_files(self.root):
+                key = (stat.st_mtime_ns, stat.st_size)
+                if indexed.pop(path, None) == key:
+                    continue
+                try:
+                    metadata = read_form_metadata(os.path.join(self.root, path))
+                except OSError:
+                    continue
+                rows.append(dict(metadata, path=path, mtime=key[0], size=key[1]))
+            self.connection.executemany(
+                f"INSERT OR REPLACE INTO forms ({', '.join(INDEX_COLUMNS)}) "
+                f"VALUES ({', '.join([':' + c for c in INDEX_COLUMNS])})",
+                rows,
+            )
+            self.connection.executemany(
+                "DELETE FROM forms WHERE path = ?", [(path,) for path in indexed]
+            )
+        return len(rows), len(indexed)
+
+    def search(
+        self,
+        name: Optional[str] = None,
+        form: Optional[str] = None,
+        host: Optional[str] = None,
+        sort: str = "path",
+        reverse: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """Search the indexed forms.
+
+        Args:
+            name (Optional[str], optional) : A substring of the form name. Defaults to ``None``.
+            form (Optional[str], optional) : The form type (ex. ``"google"``). It is also estimated from the URL of the forms which don't have ``"form"``. Defaults to ``None``.
+            host (Optional[str], optional) : A substring of the host of the form URL. Defaults to ``None``.
+            sort (str, optional)           : A key to sort. (One of ``INDEX_SORT_KEYS``) Defaults to ``"path"``.
+            reverse (bool, optional)       : Whether to sort in descending order. Defaults to ``False``.
+
+        Returns:
+            List[Dict[str, Any]]: The matched rows.
+        """
+        if sort not in INDEX_SORT_KEYS:
+            raise ValueError(f"sort must be one of {INDEX_SORT_KEYS}, got sort='{sort}'")
+        conditions: List[str] = []
+        params: List[str] = []
+        for column, value, exact in [
+            ("name", name, False),
+            ("form", form, True),
+            ("host", host, False),
+        ]:
+            if value is None:
+                continue
+            if exact:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+            else:
+                conditions.append(f"{column} LIKE ? ESCAPE '\\'")
+                escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+                params.append(f"%{escaped}%")
+        query: str = "SELECT * FROM forms"
+        if len(conditions) > 0:
+            query += " WHERE " + " AND ".join(conditions)
+        query += f" ORDER BY {sort} {'DESC' if reverse else 'ASC'}, path ASC"
+        return [dict(row) for row in self.connection.execute(query, params)]
+
+    def close(self) -> None:
+        """Close the database."""
+        self.connection.close()
+
+    def __enter__(self) -> "FormIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
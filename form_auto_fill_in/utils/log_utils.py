@@ -0,0 +1,213 @@
+# coding: utf-8
+"""Lazily evaluated logging for form models.
+
+Messages can be callables which are called only when the level is enabled, so messages which need WebDriver commands (ex. label texts) cost nothing in quiet runs. Callables are evaluated in the calling thread (WebDriver is not thread-safe), and only the evaluated records are passed to the sink, which can write them in a background thread.
+
+.. code-block:: python
+
+    >>> from form_auto_fill_in.utils.log_utils import Logger
+    >>> logger = Logger(level="quiet")
+    >>> logger(lambda: f"[TITLE] {driver.title}")  # driver.title is not called.
+"""
+import atexit
+import json
+import queue
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import IO, Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Union
+
+LOG_LEVELS: Dict[str, int] = {"debug": 10, "info": 20, "warning": 30, "error": 40, "quiet": 100}
+ANSI_PATTERN: re.Pattern = re.compile(r"\x1b\[[0-9;]*m")
+
+#: A message, or a callable which returns it.
+Message = Union[Any, Callable[[], Any]]
+
+
+class LogRecord(NamedTuple):
+    """A log record passed to the sink.
+
+    Attributes:
+        time (float)            : Unix time.
+        level (str)             : One of ``LOG_LEVELS``.
+        message (str)           : The evaluated message.
+        fields (Dict[str, Any]) : Structured fields given to :meth:`Logger.log`.
+    """
+
+    time: float
+    level: str
+    message: str
+    fields: Dict[str, Any]
+
+
+Sink = Callable[[LogRecord], None]
+
+
+def stream_sink(stream: Optional[IO[str]] = None) -> Sink:
+    """A sink which prints the messages to ``stream``. (Defaults to ``sys.stdout`` at the time of writing.)"""
+
+    def sink(record: LogRecord) -> None:
+        print(record.message, file=stream or sys.stdout)
+
+    return sink
+
+
+def jsonl_sink(path: str) -> Sink:
+    """A sink which appends the records to the JSONL file at ``path`` without colors. Each record is written with a single ``write``, so several processes can share the file."""
+
+    def sink(record: LogRecord) -> None:
+        line: str = json.dumps(
+            {
+                "time": record.time,
+                "level": record.level,
+                "message": ANSI_PATTERN.sub("", record.message),
+                **record.fields,
+            },
+            ensure_ascii=False,
+            default=str,
+        )
+        with open(path, mode="a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+    return sink
+
+
+class BackgroundSink:
+    """Pass the records to ``sink`` in a daemon thread, so that the caller doesn't wait for slow streams.
+
+    Args:
+        sink (Sink)             : A sink called in the thread.
+        maxsize (int, optional) : The maximum number of queued records. The caller waits when it is full. Defaults to ``10000``.
+
+    Examples:
+        >>> from form_auto_fill_in.utils.log_utils import BackgroundSink, Logger, jsonl_sink
+        >>> logger = Logger(level="debug", sink=BackgroundSink(jsonl_sink("log.jsonl")))
+        >>> logger.info("Visit Form", url="https://forms.gle/...")
+        >>> logger.flush()
+    """
+
+    def __init__(self, sink: Sink, maxsize: int = 10000):
+        self.sink: Sink = sink
+        self.queue: queue.Queue = queue.Queue(maxsize=maxsize)
+        self.thread: Optional[threading.Thread] = None
+        self.lock: threading.Lock = threading.Lock()
+        atexit.register(self.flush)
+
+    def _work(self) -> None:
+        while True:
+            record: LogRecord = self.queue.get()
+            try:
+                self.sink(record)
+            except Exception:
+                pass
+            finally:
+                self.queue.task_done()
+
+    def __call__(self, record: LogRecord) -> None:
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                # Started lazily (and again in forked processes, where the thread doesn't exist).
+                self.thread = threading.Thread(target=self._work, name="log-sink", daemon=True)
+                self.thread.start()
+        self.queue.put(record)
+
+    def flush(self) -> None:
+        """Wait until all queued records are written."""
+        if self.thread is not None and self.thread.is_alive():
+            self.queue.join()
+
+
+class Logger:
+    """A levelled logger whose messages are evaluated only when they are written.
+
+    It can be called like ``print`` (at ``"info"`` level), so it is used as ``BaseForm.print``.
+
+    Args:
+        level (str, optional)  : The minimum level to write. One of ``LOG_LEVELS``. Defaults to ``"info"``.
+        sink (Sink, optional)  : Where the records go. Defaults to :func:`stream_sink`.
+        fields (Any, optional) : Structured fields added to every record.
+    """
+
+    def __init__(self, level: str = "info", sink: Optional[Sink] = None, **fields):
+        self.level: str = level
+        self.sink: Sink = sink or stream_sink()
+        self.fields: Dict[str, Any] = fields
+
+    @property
+    def level(self) -> str:
+        return self._level
+
+    @level.setter
+    def level(self, level: str) -> None:
+        if level not in LOG_LEVELS:
+            raise ValueError(f"level must be one of {list(LOG_LEVELS.keys())}, got {level!r}")
+        self._level: str = level
+        self._threshold: int = LOG_LEVELS[level]
+
+    def enabled(self, level: str = "info") -> bool:
+        """Whether messages at ``level`` are written."""
+        return LOG_LEVELS[level] >= self._threshold
+
+    def log(self, level: str, *messages: Message, **fields) -> None:
+        """Write ``messages`` (joined with spaces like ``print``) at ``level``. Callable messages are called only if the level is enabled.
+
+        Args:
+            level (str)            : One of ``LOG_LEVELS``.
+            messages (Message)     : Messages, or callables which return them.
+            fields (Any, optional) : Structured fields of the record.
+        """
+        if LOG_LEVELS[level] < self._threshold:
+            return
+        texts: List[str] = [str(m() if callable(m) else m) for m in messages]
+        self.sink(LogRecord(time.time(), level, " ".join(texts), {**self.fields, **fields}))
+
+    def debug(self, *messages: Message, **fields) -> None:
+        self.log("debug", *messages, **fields)
+
+    def info(self, *messages: Message, **fields) -> None:
+        self.log("info", *messages, **fields)
+
+    def warning(self, *messages: Message, **fields) -> None:
+        self.log("warning", *messages, **fields)
+
+    def error(self, *messages: Message, **fields) -> None:
+        self.log("error", *messages, **fields)
+
+    __call__ = info
+
+    @contextmanager
+    def muted(self, enabled: bool = True) -> Iterator[None]:
+        """Don't write any messages in the ``with`` block if ``enabled``."""
+        level: str = self.level
+        if enabled:
+            self.level = "quiet"
+        try:
+            yield
+        finally:
+            self.level = level
+
+    def flush(self) -> None:
+        """Wait until the sink writes all records. (Only :class:`BackgroundSink` queues them.)"""
+        flush: Optional[Callable[[], None]] = getattr(self.sink, "flush", None)
+        if flush is not None:
+            flush()
+
+
+def get_logger(
+    verbose: bool = True, level: Optional[str] = None, log_file: Optional[str] = None, **fields
+) -> Logger:
+    """Get a logger for the options of the form models and CLI.
+
+    Args:
+        verbose (bool, optional)           : Whether to print messages. (``"quiet"`` level if ``False``) Defaults to ``True``.
+        level (Optional[str], optional)    : The level which overrides ``verbose``. Defaults to ``None``.
+        log_file (Optional[str], optional) : Path to the JSONL file which records are appended to in a background thread instead of printing. Defaults to ``None``.
+        fields (Any, optional)             : Structured fields added to every record.
+
+    Returns:
+        Logger: The logger.
+    """
+    sink: Optional[Sink] = None if log_file is None else BackgroundSink(jsonl_sink(log_file))
+    return Logger(level=level or ("info" if verbose else "quiet"), sink=sink, **fields)
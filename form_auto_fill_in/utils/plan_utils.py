@@ -0,0 +1,493 @@
+# coding: utf-8
+"""Compile the form data json into a validated and immutable :class:`FormPlan`.
+
+The compiled plan is cached at ``PLANS_DIR`` with the content hash of the json as a key (with ``PLAN_VERSION`` in it), and in the process, so a form data json is parsed and validated only once, and a broken one fails before the browser is launched.
+
+.. note::
+    Plans never contain the values of secrets. ``<SECRET>`` placeholders are kept as they are (also in :meth:`FormPlan.resolve`), and replaced with the values of ``secrets_dict`` only where they are used, so that they never appear in the logs.
+"""
+import hashlib
+import json
+import os
+import re
+from types import MappingProxyType
+from typing import Any, Dict, List, NamedTuple, Optional, Set, Tuple
+
+from ._colorings import toRED
+from ._path import FORM_AUTO_FILL_IN_DIR, canonicalize_path, ensure_form_dir
+from .driver_utils import DRIVER_PROFILES
+from .generic_utils import load_data, save_data
+
+#: Bump it when the normalization or the validation changes so that the old plans at ``PLANS_DIR`` are not used.
+PLAN_VERSION: int = 3
+PLANS_DIR: str = os.path.join(FORM_AUTO_FILL_IN_DIR, "plans")
+
+SECRET_PATTERN: re.Pattern = re.compile(r"^<[A-Za-z0-9_]+>$")
+DEFINITION_KEYS: List[str] = [
+    "name",
+    "URL",
+    "form",
+    "login",
+    "answer",
+    "fast_fill",
+    "session",
+    "driver",
+]
+STEP_FUNCS: List[str] = ["click", "send_keys"]
+STEP_KEYS: List[str] = ["func", "by", "identifier", "value", "timeout", "poll", "fast"]
+POLL_KEYS: List[str] = ["initial", "factor", "maximum", "observe"]
+DRIVER_KEYS: List[str] = ["profile", "blocked_urls", "remote", "session_retries"]
+#: Values of ``selenium.webdriver.common.by.By``
+LOCATOR_STRATEGIES: List[str] = [
+    "id",
+    "xpath",
+    "link text",
+    "partial link text",
+    "name",
+    "tag name",
+    "class name",
+    "css selector",
+]
+
+_PLANS: Dict[str, "FormPlan"] = {}
+
+
+class FormPlanError(ValueError):
+    """Raised when the form data json is invalid, or secrets required by it are not given.
+
+    Args:
+        path (str)          : Path to the form data json.
+        errors (List[str])  : Error messages.
+    """
+
+    def __init__(self, path: str, errors: List[str]):
+        self.path: str = path
+        self.errors: List[str] = errors
+        super().__init__(f"Invalid form data at {path}\n" + "\n".join(["  - " + e for e in errors]))
+
+
+def freeze(obj: Any) -> Any:
+    """Convert ``dict`` and ``list`` in ``obj`` into ``MappingProxyType`` and ``tuple`` recursively."""
+    if isinstance(obj, dict):
+        return MappingProxyType({k: freeze(v) for k, v in obj.items()})
+    if isinstance(obj, (list, tuple)):
+        return tuple([freeze(e) for e in obj])
+    return obj
+
+
+def thaw(obj: Any) -> Any:
+    """Inverse of :func:`freeze`."""
+    if isinstance(obj, MappingProxyType) or isinstance(obj, dict):
+        return {k: thaw(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [thaw(e) for e in obj]
+    return obj
+
+
+def find_placeholders(obj: Any) -> Set[str]:
+    """Find all ``<SECRET>`` placeholders in ``obj``.
+
+    Args:
+        obj (Any) : The form data.
+
+    Returns:
+        Set[str]: Placeholders. (ex. ``{"<UTOKYO_ACCOUNT_PASSWORD>"}``)
+    """
+    if isinstance(obj, (dict, MappingProxyType)):
+        return set().union(*[find_placeholders(v) for v in obj.values()])
+    if isinstance(obj, (list, tuple)):
+        return set().union(*[find_placeholders(e) for e in obj])
+    if isinstance(obj, str) and SECRET_PATTERN.match(obj):
+        return {obj}
+    return set()
+
+
+def validate_poll(poll: Any, where: str) -> List[str]:
+    """Validate ``"poll"`` of a step. (See :meth:`WaitPolicy.from_spec <form_auto_fill_in.utils.driver_utils.WaitPolicy.from_spec>`)
+
+    Args:
+        poll (Any)  : A wait policy.
+        where (str) : Where the policy is. (Used in the error messages.)
+
+    Returns:
+        List[str]: Error messages.
+    """
+    if poll is None or poll == "observe":
+        return []
+    if isinstance(poll, dict):
+        return [
+            f"{where}.{key}: must be a {'boolean' if key == 'observe' else 'positive number'}"
+            for key, val in poll.items()
+            if key not in POLL_KEYS
+            or (key == "observe" and not isinstance(val, bool))
+            or (
+                key != "observe"
+                and (not isinstance(val, (int, float)) or isinstance(val, bool) or val <= 0)
+            )
+        ]
+    if isinstance(poll, (int, float)) and not isinstance(poll, bool) and poll > 0:
+        return []
+    return [f'{where}: must be a positive number, "observe" or an object with {POLL_KEYS}']
+
+
+def validate_step(step: Any, where: str) -> List[str]:
+    """Validate a step of ``"login"`` or ``"next"`` which is passed to :func:`try_find_element_func <form_auto_fill_in.utils.driver_utils.try_find_element_func>`.
+
+    Args:
+        step (Any)  : A step.
+        where (str) : Where the step is. (Used in the error messages.)
+
+    Returns:
+        List[str]: Error messages.
+    """
+    if not isinstance(step, dict):
+        return [f"{where}: must be an object, got {type(step).__name__}"]
+    errors: List[str] = [
+        f"{where}.{key}: unknown key (must be one of {STEP_KEYS})"
+        for key in step.keys()
+        if key not in STEP_KEYS
+    ]
+    if step.get("func") not in STEP_FUNCS:
+        errors.append(f"{where}.func: must be one of {STEP_FUNCS}, got {step.get('func')!r}")
+    if step.get("by") not in LOCATOR_STRATEGIES:
+        errors.append(f"{where}.by: must be one of {LOCATOR_STRATEGIES}, got {step.get('by')!r}")
+    if not isinstance(step.get("identifier"), str) or len(step["identifier"]) == 0:
+        errors.append(f"{where}.identifier: must be a non-empty string")
+    if step.get("func") == "send_keys":
+        value = step.get("value")
+        if not (
+            isinstance(value, str)
+            or (isinstance(value, list) and all([isinstance(e, str) for e in value]))
+        ):
+            errors.append(f"{where}.value: must be a string or a list of strings")
+    if "timeout" in step and (
+        not isinstance(step["timeout"], (int, float))
+        or isinstance(step["timeout"], bool)
+        or step["timeout"] < 0
+    ):
+        errors.append(f"{where}.timeout: must be a non-negative number")
+    if "poll" in step:
+        errors.extend(validate_poll(step["poll"], where=f"{where}.poll"))
+    if "fast" in step and not isinstance(step["fast"], bool):
+        errors.append(f"{where}.fast: must be a boolean")
+    return errors
+
+
+def validate_driver(driver: Any) -> List[str]:
+    """Validate ``"driver"`` of the form data. (See :func:`get_driver_profile <form_auto_fill_in.utils.driver_utils.get_driver_profile>`)
+
+    Args:
+        driver (Any) : A driver profile.
+
+    Returns:
+        List[str]: Error messages.
+    """
+    if isinstance(driver, str):
+        driver = {"profile": driver}
+    if not isinstance(driver, dict):
+        return [
+            f"driver: must be one of {list(DRIVER_PROFILES.keys())} or an object with {DRIVER_KEYS}"
+        ]
+    errors: List[str] = [
+        f"driver.{key}: unknown key (must be one of {DRIVER_KEYS})"
+        for key in driver.keys()
+        if key not in DRIVER_KEYS
+    ]
+    if driver.get("profile", "default") not in DRIVER_PROFILES:
+        errors.append(f"driver.profile: must be one of {list(DRIVER_PROFILES.keys())}")
+    blocked_urls = driver.get("blocked_urls", [])
+    if not isinstance(blocked_urls, list) or not all([isinstance(e, str) for e in blocked_urls]):
+        errors.append("driver.blocked_urls: must be a list of URL patterns")
+    remote = driver.get("remote")
+    if remote is not None and not (
+        isinstance(remote, str) and remote.startswith(("http://", "https://"))
+    ):
+        errors.append(f"driver.remote: must be a http(s) URL, got {remote!r}")
+    retries = driver.get("session_retries", 0)
+    if not isinstance(retries, int) or isinstance(retries, bool) or retries < 0:
+        errors.append(f"driver.session_retries: must be a non-negative integer, got {retries!r}")
+    return errors
+
+
+def validate_definition(data: Any, warnings: Optional[List[str]] = None) -> List[str]:
+    """Validate the form data.
+
+    Unknown top-level keys are not errors (they may be read by other tools, or by newer versions), so they are appended to ``warnings`` instead.
+
+    Args:
+        data (Any)                               : The form data loaded from json.
+        warnings (Optional[List[str]], optional) : A list to which warning messages are appended. Defaults to ``None``.
+
+    Returns:
+        List[str]: Error messages. (Empty if valid.)
+    """
+    if not isinstance(data, dict):
+        return [f"must be an object, got {type(data).__name__}"]
+    if warnings is not None:
+        warnings.extend(
+            [
+                f"{key}: unknown key is ignored (must be one of {DEFINITION_KEYS})"
+                for key in data.keys()
+                if key not in DEFINITION_KEYS
+            ]
+        )
+    errors: List[str] = []
+    for key in ["name", "URL", "form"]:
+        if key in data and not isinstance(data[key], str):
+            errors.append(f"{key}: must be a string")
+    if isinstance(data.get("URL"), str) and re.match(r"https?://", data["URL"]) is None:
+        errors.append(f"URL: must start with http:// or https://, got {data['URL']!r}")
+    if "fast_fill" in data and not isinstance(data["fast_fill"], bool):
+        errors.append("fast_fill: must be a boolean")
+    if "driver" in data:
+        errors.extend(validate_driver(data["driver"]))
+
+    session = data.get("session", False)
+    if isinstance(session, dict):
+        if "account" in session and not isinstance(session["account"], str):
+            errors.append("session.account: must be a string")
+        locator = session.get("authenticated")
+        if locator is not None and (
+            not isinstance(locator, dict)
+            or locator.get("by") not in LOCATOR_STRATEGIES
+            or not isinstance(locator.get("identifier"), str)
+        ):
+            errors.append(
+                f"session.authenticated: must be an object with 'by' (one of {LOCATOR_STRATEGIES}) and 'identifier'"
+            )
+    elif not isinstance(session, bool):
+        errors.append("session: must be a boolean or an object")
+
+    login = data.get("login", [])
+    if not isinstance(login, list):
+        errors.append("login: must be a list of steps")
+    else:
+        for i, step in enumerate(login):
+            errors.extend(validate_step(step, where=f"login[{i}]"))
+
+    answer = data.get("answer", [{}])
+    if not isinstance(answer, list):
+        errors.append("answer: must be a list of pages")
+    else:
+        for i, page in enumerate(answer):
+            if not isinstance(page, dict):
+                errors.append(f"answer[{i}]: must be an object")
+                continue
+            for key, val in page.items():
+                if key == "next":
+                    if val != {}:
+                        errors.extend(validate_step(val, where=f"answer[{i}].next"))
+                elif not isinstance(val, dict):
+                    errors.append(f"answer[{i}].{key}: must be an object")
+    return errors
+
+
+class FormPlan(NamedTuple):
+    """A compiled form data json. (See :func:`load_plan`)
+
+    Attributes:
+        key (str)                          : Content hash of the json. (See :func:`plan_key`)
+        form (str)                         : An identifier for the Form Model.
+        definition (MappingProxyType)      : Normalized and immutable form data.
+        secrets (Tuple[str, ...])          : ``<SECRET>`` placeholders used in the form data.
+        inferred (bool)                    : Whether ``form`` is estimated from the URL. (Then it is estimated again if the registered URL patterns change.)
+    """
+
+    key: str
+    form: str
+    definition: MappingProxyType
+    secrets: Tuple[str, ...]
+    inferred: bool = False
+
+    def missing_secrets(self, secrets_dict: Dict[str, str] = {}) -> List[str]:
+        """Get the placeholders which are not in ``secrets_dict``."""
+        return [e for e in self.secrets if e not in secrets_dict]
+
+    def resolve(
+        self,
+        secrets_dict: Dict[str, str] = {},
+        path: str = "",
+        overrides: Optional[Dict[str, Dict[str, Dict[str, Any]]]] = None,
+    ) -> Dict[str, Any]:
+        """Get a mutable copy of the form data updated with ``overrides``, and check that all placeholders in them are in ``secrets_dict``.
+
+        The placeholders are kept as they are, and replaced with the secrets where they are used (ex. :func:`try_find_element_send_keys <form_auto_fill_in.utils.driver_utils.try_find_element_send_keys>` and :meth:`BaseForm.decode_secrets <form_auto_fill_in.forms.base.BaseForm.decode_secrets>`), so that the values are not logged.
+
+        Args:
+            secrets_dict (Dict[str, str], optional)                              : Key and value pairs defined in github secrets. Defaults to ``{}``.
+            path (str, optional)                                                 : Path to the form data json. (Used in the error messages.)
+            overrides (Optional[Dict[str, Dict[str, Dict[str, Any]]]], optional) : Answers which update ``"answer"`` for each page index and question identifier. (ex. ``{"0": {"3": {"no": 2}}}``) Defaults to ``None``.
+
+        Raises:
+            FormPlanError: When some placeholders are not in ``secrets_dict``.
+
+        Returns:
+            Dict[str, Any]: The form data.
+        """
+        missing: List[str] = self.missing_secrets(secrets_dict) + [
+            e for e in sorted(find_placeholders(overrides or {})) if e not in secrets_dict
+        ]
+        if len(missing) > 0:
+            raise FormPlanError(
+                path=path,
+                errors=[f"secret {e} is not given. (ex. -P {e[1:-1]}=...)" for e in missing],
+            )
+        data: Dict[str, Any] = thaw(self.definition)
+        for page, answers in thaw(overrides or {}).items():
+            while len(data["answer"]) <= int(page):
+                data["answer"].append({})
+            for identifier, answer in answers.items():
+                data["answer"][int(page)].setdefault(identifier, {}).update(answer)
+        return data
+
+
+def compile_plan(data: Any, key: str, path: str = "") -> FormPlan:
+    """Validate and normalize the form data into a :class:`FormPlan`.
+
+    Args:
+        data (Any)           : The form data loaded from json.
+        key (str)            : Content hash of the json.
+        path (str, optional) : Path to the form data json. (Used in the error messages.)
+
+    Raises:
+        FormPlanError: When the form data is invalid.
+
+    Returns:
+        FormPlan: The compiled plan.
+    """
+    from .. import forms
+
+    warnings: List[str] = []
+    errors: List[str] = validate_definition(data, warnings=warnings)
+    for warning in warnings:
+        print(f"{toRED('[WARNING]')} {path}: {warning}")
+    form: Optional[str] = None
+    if len(errors) == 0:
+        form = data.get("form")
+        if form is None:
+            try:
+                form = forms.url2form(url=data.get("URL", ""))
+            except (KeyError, ValueError):
+                errors.append("form: is not given and can not be estimated from URL")
+        elif form not in forms.all:
+            errors.append(f"form: must be one of {list(forms.all.keys())}, got {form!r}")
+    if len(errors) > 0:
+        raise FormPlanError(path=path, errors=errors)
+    definition: Dict[str, Any] = dict(data)
+    definition.update(
+        {
+            "form": form,
+            "login": data.get("login", []),
+            "answer": data.get("answer", [{}]),
+            "fast_fill": data.get("fast_fill", False),
+        }
+    )
+    return FormPlan(
+        key=key,
+        form=form,
+        definition=freeze(definition),
+        secrets=tuple(sorted(find_placeholders(definition))),
+        inferred=data.get("form") is None,
+    )
+
+
+def plan_key(content: bytes) -> str:
+    """Get the key of the plan compiled from ``content``. It is the content hash of the json, so checkpoints and crawled schemas keyed by it stay valid as long as the json is not modified.
+
+    Args:
+        content (bytes) : The form data json.
+
+    Returns:
+        str: SHA-256 hex digest.
+    """
+    return hashlib.sha256(content).hexdigest()
+
+
+def is_current(plan: FormPlan) -> bool:
+    """Whether the form model of ``plan`` is still registered, and the URL is still estimated as it if ``plan.inferred``. (It doesn't import the form model.)"""
+    from .. import forms
+
+    if not plan.inferred:
+        return plan.form in forms.all
+    try:
+        return forms.url2form(url=plan.definition.get("URL", "")) == plan.form
+    except (KeyError, ValueError):
+        return False
+
+
+def load_cached_plan(plan_path: str, key: str) -> Optional[FormPlan]:
+    """Load the plan cached at ``plan_path``, or ``None`` if it can't be read, or it was compiled with another ``PLAN_VERSION``. (It is trusted without the validation, as the key is the content hash of the json.)"""
+    try:
+        cached: Dict[str, Any] = load_data(plan_path)
+        if cached.get("version") != PLAN_VERSION:
+            return None
+        return FormPlan(
+            key=key,
+            form=cached["form"],
+            definition=freeze(cached["definition"]),
+            secrets=tuple(cached["secrets"]),
+            inferred=bool(cached.get("inferred", False)),
+        )
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return None
+
+
+def load_plan(path: str, cache: bool = True) -> FormPlan:
+    """Load the compiled plan of the form data json at ``path``.
+
+    Plans are looked up in the process, then in ``PLANS_DIR``, and compiled only when the json is new or modified, ``PLAN_VERSION`` is bumped, or the form model is not registered (or estimated from the URL) any more.
+
+    Args:
+        path (str)             : Path to the form data json.
+        cache (bool, optional) : Whether to read and write the plan at ``PLANS_DIR``. Defaults to ``True``.
+
+    Raises:
+        FormPlanError: When the form data is invalid.
+
+    Returns:
+        FormPlan: The compiled plan.
+
+    Examples:
+        >>> from form_auto_fill_in.utils.plan_utils import load_plan
+        >>> plan = load_plan("UHMRF-1st.json")
+        >>> plan.form, plan.secrets
+        ('office', ('<UTOKYO_ACCOUNT_MAIL_ADDRESS>', '<UTOKYO_ACCOUNT_PASSWORD>'))
+    """
+    path = canonicalize_path(str(path))
+    with open(path, mode="rb") as f:
+        content: bytes = f.read()
+    key: str = plan_key(content)
+    plan: Optional[FormPlan] = _PLANS.get(key)
+    if plan is not None and is_current(plan):
+        return plan
+
+    plan_path: str = os.path.join(PLANS_DIR, key + ".json")
+    plan = None
+    if cache and os.path.exists(plan_path):
+        plan = load_cached_plan(plan_path, key=key)
+        if plan is not None and not is_current(plan):
+            plan = None
+    if plan is None:
+        try:
+            data = json.loads(content.decode("utf-8"))
+        except ValueError as e:
+            raise FormPlanError(path=path, errors=[f"[{e.__class__.__name__}] {e}"])
+        plan = compile_plan(data=data, key=key, path=path)
+        if cache:
+            try:
+                ensure_form_dir()
+                save_data(
+                    {
+                        "version": PLAN_VERSION,
+                        "form": plan.form,
+                        "inferred": plan.inferred,
+                        "definition": thaw(plan.definition),
+                        "secrets": list(plan.secrets),
+                    },
+                    plan_path,
+                    mode=0o600,
+                )
+            except OSError:
+                pass
+    _PLANS[key] = plan
+    return plan
@@ -0,0 +1,283 @@
+# coding: utf-8
+"""Memory usage and cleanup of the chromedriver and Chrome processes.
+
+The memory usage of a driver is the sum of the RSS of chromedriver and all its descendants (Chrome, renderers, GPU process, ...). Shared pages are counted once for each process, so it is an upper bound, but its changes track the growth well. It is read from ``/proc`` (Linux), or with `psutil <https://pypi.org/project/psutil/>`_ if it is installed (other platforms). Without either, it is always ``0``.
+
+Each launched chromedriver is recorded at ``DRIVERS_DIR`` with the process which launched it, so that drivers left by crashed processes (and their Chrome processes) are found and killed later by :func:`reap_orphans`.
+"""
+import json
+import os
+import signal
+import time
+from typing import Any, Dict, List, Optional
+
+from ._path import FORM_AUTO_FILL_IN_DIR
+
+DRIVERS_DIR: str = os.path.join(FORM_AUTO_FILL_IN_DIR, "drivers")
+PROC_DIR: str = "/proc"
+#: Names of the processes which may be killed by :func:`reap_orphans`.
+BROWSER_PROCESS_NAMES: List[str] = ["chromedriver", "chrome", "chromium", "Google Chrome"]
+
+
+def _psutil() -> Any:
+    """Get ``psutil`` if it is installed, otherwise ``None``."""
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil
+
+
+def has_procfs() -> bool:
+    return os.path.isdir(os.path.join(PROC_DIR, "self"))
+
+
+def read_stat(pid: int) -> Optional[Dict[str, Any]]:
+    """Read ``/proc/<pid>/stat``.
+
+    Args:
+        pid (int) : Process ID.
+
+    Returns:
+        Optional[Dict[str, Any]]: ``"name"``, ``"state"``, ``"ppid"`` and ``"started"`` (clock ticks after boot) of the process, or ``None`` if it doesn't exist.
+    """
+    try:
+        with open(os.path.join(PROC_DIR, str(pid), "stat"), mode="r") as f:
+            stat: str = f.read()
+    except OSError:
+        return None
+    # The name is in parentheses, and may contain spaces and parentheses.
+    name: str = stat[stat.find("(") + 1 : stat.rfind(")")]
+    fields: List[str] = stat[stat.rfind(")") + 2 :].split()
+    return {"name": name, "state": fields[0], "ppid": int(fields[1]), "started": int(fields[19])}
+
+
+def process_info(pid: int) -> Optional[Dict[str, Any]]:
+    """Get ``"name"``, ``"state"``, ``"ppid"`` and ``"started"`` of the process ``pid``, or ``None`` if it doesn't exist. (``"started"`` only identifies the process, and its unit depends on the platform.)"""
+    if has_procfs():
+        return read_stat(pid)
+    psutil = _psutil()
+    if psutil is None:
+        return None
+    try:
+        process = psutil.Process(pid)
+        with process.oneshot():
+            return {
+                "name": process.name(),
+                "state": "Z" if process.status() == psutil.STATUS_ZOMBIE else "R",
+                "ppid": process.ppid(),
+                "started": process.create_time(),
+            }
+    except psutil.Error:
+        return None
+
+
+def get_descendants(pid: int) -> List[int]:
+    """Get the process IDs of all descendants of the process ``pid``."""
+    if not has_procfs():
+        psutil = _psutil()
+        if psutil is None:
+            return []
+        try:
+            return [p.pid for p in psutil.Process(pid).children(recursive=True)]
+        except psutil.Error:
+            return []
+    children: Dict[int, List[int]] = {}
+    for entry in os.listdir(PROC_DIR):
+        if entry.isdigit():
+            stat = read_stat(int(entry))
+            if stat is not None:
+                children.setdefault(stat["ppid"], []).append(int(entry))
+    descendants: List[int] = []
+    stack: List[int] = [pid]
+    while len(stack) > 0:
+        for child in children.get(stack.pop(), []):
+            descendants.append(child)
+            stack.append(child)
+    return descendants
+
+
+def get_rss(pid: int) -> int:
+    """Get the RSS of the process ``pid`` in bytes. (``0`` if it doesn't exist, or can't be measured.)"""
+    if has_procfs():
+        try:
+            with open(os.path.join(PROC_DIR, str(pid), "statm"), mode="r") as f:
+                return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, IndexError, ValueError):
+            return 0
+    psutil = _psutil()
+    if psutil is None:
+        return 0
+    try:
+        return psutil.Process(pid).memory_info().rss
+    except psutil.Error:
+        return 0
+
+
+def get_tree_rss(pid: int) -> int:
+    """Get the total RSS of the process ``pid`` and all its descendants in bytes."""
+    return sum([get_rss(p) for p in [pid] + get_descendants(pid)])
+
+
+def get_driver_pid(driver: Any) -> Optional[int]:
+    """Get the process ID of chromedriver of ``driver``, or ``None`` if it isn't launched locally (ex. a remote driver)."""
+    process = getattr(getattr(driver, "service", None), "process", None)
+    return getattr(process, "pid", None)
+
+
+def snapshot_tree(pid: int) -> Dict[int, Any]:
+    """Get the process IDs and start times of the process ``pid`` and all its descendants, so that they are killed later by :func:`kill_processes` even after they are orphaned."""
+    snapshot: Dict[int, Any] = {}
+    for p in [pid] + get_descendants(pid):
+        info = process_info(p)
+        if info is not None:
+            snapshot[p] = info["started"]
+    return snapshot
+
+
+def kill_processes(snapshot: Dict[int, Any], timeout: float = 3.0) -> List[int]:
+    """Terminate the processes in ``snapshot`` (See :func:`snapshot_tree`) which are still running, and kill them if they don't exit in ``timeout`` seconds. Processes whose start times differ (their IDs are reused) are not signaled.
+
+    Args:
+        snapshot (Dict[int, Any]) : Process IDs and start times.
+        timeout (float, optional) : Number of seconds to wait for the processes after ``SIGTERM``. Defaults to ``3.0``.
+
+    Returns:
+        List[int]: Process IDs which are signaled.
+    """
+
+    def is_running(pid: int) -> bool:
+        info = process_info(pid)
+        return info is not None and info["started"] == snapshot[pid] and info["state"] != "Z"
+
+    signaled: List[int] = []
+    for pid in snapshot.keys():
+        if not is_running(pid):
+            continue
+        try:
+            os.kill(pid, signal.SIGTERM)
+            signaled.append(pid)
+        except OSError:
+            pass
+    deadline: float = time.monotonic() + timeout
+    while time.monotonic() < deadline and any([is_running(p) for p in signaled]):
+        reap_zombies()
+        time.sleep(0.1)
+    for pid in signaled:
+        if is_running(pid):
+            try:
+                os.kill(pid, getattr(signal, "SIGKILL", signal.SIGTERM))
+            except OSError:
+                pass
+    reap_zombies()
+    return signaled
+
+
+def kill_tree(pid: int, timeout: float = 3.0) -> List[int]:
+    """Terminate the process ``pid`` and all its descendants. (See :func:`kill_processes`)"""
+    return kill_processes(snapshot_tree(pid), timeout=timeout)
+
+
+def reap_zombies() -> List[int]:
+    """Wait for the zombie browser processes which are children of this process, so that they don't remain in the process table. (ex. Chrome processes adopted by this process running as ``PID 1`` in a container)
+
+    Returns:
+        List[int]: Process IDs which are reaped.
+    """
+    if not has_procfs():
+        return []
+    reaped: List[int] = []
+    for pid in get_descendants(os.getpid()):
+        info = read_stat(pid)
+        if (
+            info is not None
+            and info["state"] == "Z"
+            and info["ppid"] == os.getpid()
+            and is_browser_process(info["name"])
+        ):
+            try:
+                os.waitpid(pid, os.WNOHANG)
+                reaped.append(pid)
+            except ChildProcessError:
+                pass
+    return reaped
+
+
+def is_browser_process(name: str) -> bool:
+    return any([name.startswith(e[:15]) for e in BROWSER_PROCESS_NAMES])
+
+
+def record_driver(pid: int) -> Optional[str]:
+    """Record that this process launched chromedriver ``pid``.
+
+    Args:
+        pid (int) : Process ID of chromedriver.
+
+    Returns:
+        Optional[str]: Path to the record, or ``None`` if the process doesn't exist.
+    """
+    info = process_info(pid)
+    if info is None:
+        return None
+    owner = process_info(os.getpid()) or {}
+    os.makedirs(DRIVERS_DIR, exist_ok=True)
+    path: str = os.path.join(DRIVERS_DIR, f"{pid}.json")
+    with open(path, mode="w") as f:
+        json.dump(
+            {
+                "pid": pid,
+                "started": info["started"],
+                "owner": os.getpid(),
+                "owner_started": owner.get("started"),
+            },
+            f,
+        )
+    return path
+
+
+def forget_driver(pid: Optional[int]) -> None:
+    """Delete the record of chromedriver ``pid``. (ex. after it is quit)"""
+    if pid is not None:
+        try:
+            os.remove(os.path.join(DRIVERS_DIR, f"{pid}.json"))
+        except OSError:
+            pass
+
+
+def reap_orphans(timeout: float = 3.0) -> List[int]:
+    """Kill the recorded chromedrivers (and their Chrome processes) whose launchers are not running any more, and delete the stale records.
+
+    A record is trusted only if the process still has the same name and start time, so that a reused process ID is never killed. Drivers of the running processes (including this one) are kept.
+
+    Args:
+        timeout (float, optional) : Number of seconds to wait for each driver after ``SIGTERM``. Defaults to ``3.0``.
+
+    Returns:
+        List[int]: Process IDs which are signaled.
+    """
+    reaped: List[int] = reap_zombies()
+    if not os.path.isdir(DRIVERS_DIR):
+        return reaped
+    for fn in os.listdir(DRIVERS_DIR):
+        path: str = os.path.join(DRIVERS_DIR, fn)
+        try:
+            with open(path, mode="r") as f:
+                record: Dict[str, Any] = json.load(f)
+            pid: int = int(record["pid"])
+        except (OSError, ValueError, KeyError, TypeError):
+            forget_driver(int(fn[:-5]) if fn[:-5].isdigit() else None)
+            continue
+        owner = process_info(int(record.get("owner", 0)))
+        if owner is not None and owner["state"] != "Z":
+            if record.get("owner_started") in [None, owner["started"]]:
+                # The launcher is still running.
+                continue
+        info = process_info(pid)
+        if (
+            info is not None
+            and info["started"] == record.get("started")
+            and is_browser_process(info["name"])
+        ):
+            reaped.extend(kill_tree(pid, timeout=timeout))
+        forget_driver(pid)
+    return reaped
@@ -0,0 +1,246 @@
+# coding: utf-8
+"""Building blocks of the scheduler: cron expressions, token buckets and backoff of retries."""
+import datetime
+import threading
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+#: ``(name, minimum, maximum)`` of each field of cron expressions.
+CRON_FIELDS: List[Tuple[str, int, int]] = [
+    ("minute", 0, 59),
+    ("hour", 0, 23),
+    ("day", 1, 31),
+    ("month", 1, 12),
+    ("weekday", 0, 7),
+]
+CRON_ALIASES: Dict[str, str] = {
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+    "@monthly": "0 0 1 * *",
+    "@weekly": "0 0 * * 0",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@hourly": "0 * * * *",
+}
+CRON_NAMES: Dict[str, Dict[str, int]] = {
+    "month": {
+        name: i
+        for i, name in enumerate(
+            ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"],
+            start=1,
+        )
+    },
+    "weekday": {
+        name: i for i, name in enumerate(["sun", "mon", "tue", "wed", "thu", "fri", "sat"])
+    },
+}
+
+
+def parse_cron_field(field: str, name: str, minimum: int, maximum: int) -> Set[int]:
+    """Parse a field of cron expressions. (``*``, ``*/n``, ``a``, ``a-b``, ``a-b/n`` and their comma-separated lists.)
+
+    Args:
+        field (str)   : A field. (ex. ``"1-5"``, ``"*/15"``, ``"mon,wed,fri"``)
+        name (str)    : The name of the field. (Used in the error messages and for the names of months and weekdays.)
+        minimum (int) : The minimum value.
+        maximum (int) : The maximum value.
+
+    Raises:
+        ValueError: When ``field`` is invalid.
+
+    Returns:
+        Set[int]: Matched values.
+    """
+    names: Dict[str, int] = CRON_NAMES.get(name, {})
+
+    def to_int(value: str) -> int:
+        number = names.get(value.lower()) if value.lower() in names else int(value)
+        if not minimum <= number <= maximum:
+            raise ValueError(f"{name} must be in [{minimum}, {maximum}], got {value}")
+        return number
+
+    values: Set[int] = set()
+    for part in field.split(","):
+        try:
+            body, step = part.split("/") if "/" in part else (part, "1")
+            step = int(step)
+            if step < 1:
+                raise ValueError(f"step must be positive, got {step}")
+            if body == "*":
+                start, stop = minimum, maximum
+            elif "-" in body:
+                start, stop = [to_int(e) for e in body.split("-")]
+                if start > stop:
+                    raise ValueError(f"range must be ascending, got {body}")
+            else:
+                start = to_int(body)
+                stop = maximum if "/" in part else start
+        except ValueError as e:
+            raise ValueError(f"Invalid {name} field {field!r}: {e}")
+        values.update(range(start, stop + 1, step))
+    return values
+
+
+class CronSchedule:
+    """A cron expression (``minute hour day month weekday``) in the local time.
+
+    As with cron, a time matches when both the day and the weekday match, or either matches if both of them are restricted. A field starting with ``*`` (ex. ``*/2``) is not restricted, so ``"0 0 */2 * mon"`` matches Mondays of odd days only. ``7`` is also Sunday.
+
+    Args:
+        expression (str) : A cron expression, or one of ``CRON_ALIASES``. (ex. ``"0 5 * * mon-fri"``, ``"@daily"``)
+
+    Raises:
+        ValueError: When ``expression`` is invalid.
+
+    Examples:
+        >>> import datetime
+        >>> from form_auto_fill_in.utils.schedule_utils import CronSchedule
+        >>> schedule = CronSchedule("30 8 * * mon-fri")
+        >>> schedule.next_after(datetime.datetime(2021, 6, 5, 12, 0))  # Saturday
+        datetime.datetime(2021, 6, 7, 8, 30)
+    """
+
+    def __init__(self, expression: str):
+        self.expression: str = expression
+        fields: List[str] = CRON_ALIASES.get(expression.strip(), expression).split()
+        if len(fields) != len(CRON_FIELDS):
+            raise ValueError(
+                f"A cron expression must have {len(CRON_FIELDS)} fields, got {expression!r}"
+            )
+        self.minutes, self.hours, self.days, self.months, self.weekdays = [
+            parse_cron_field(field, *spec) for field, spec in zip(fields, CRON_FIELDS)
+        ]
+        if 7 in self.weekdays:
+            self.weekdays = (self.weekdays - {7}) | {0}
+        self.any_day: bool = fields[2].startswith("*")
+        self.any_weekday: bool = fields[4].startswith("*")
+
+    def match_date(self, date: datetime.date) -> bool:
+        """Whether ``date`` matches the day, month and weekday fields."""
+        if date.month not in self.months:
+            return False
+        day: bool = date.day in self.days
+        weekday: bool = (date.weekday() + 1) % 7 in self.weekdays
+        if self.any_day or self.any_weekday:
+            return day and weekday
+        return day or weekday
+
+    def next_after(self, after: datetime.datetime) -> datetime.datetime:
+        """Get the first matched time after ``after``.
+
+        Args:
+            after (datetime.datetime) : A naive local time.
+
+        Raises:
+            ValueError: When no time matches in 5 years. (ex. ``"0 0 31 2 *"``)
+
+        Returns:
+            datetime.datetime: The next time.
+        """
+        t: datetime.datetime = after.replace(second=0, microsecond=0) + datetime.timedelta(
+            minutes=1
+        )
+        limit: datetime.datetime = t + datetime.timedelta(days=366 * 5)
+        while t < limit:
+            if not self.match_date(t.date()):
+                t = datetime.datetime.combine(t.date(), datetime.time()) + datetime.timedelta(
+                    days=1
+                )
+            elif t.hour not in self.hours:
+                t = t.replace(minute=0) + datetime.timedelta(hours=1)
+            elif t.minute not in self.minutes:
+                t += datetime.timedelta(minutes=1)
+            else:
+                return t
+        raise ValueError(f"No time matches {self.expression!r}")
+
+    def __repr__(self) -> str:
+        return f"CronSchedule({self.expression!r})"
+
+
+class TokenBucket:
+    """A thread-safe token bucket which allows ``burst`` requests at once, and ``rate`` requests per second on average.
+
+    Args:
+        rate (float)            : Tokens added per second.
+        burst (float, optional) : The capacity of the bucket. Defaults to ``1``.
+
+    Examples:
+        >>> from form_auto_fill_in.utils.schedule_utils import TokenBucket
+        >>> bucket = TokenBucket(rate=1 / 60, burst=2)  # 2 forms at once, then 1 form per minute.
+        >>> bucket.try_acquire(), bucket.try_acquire(), bucket.try_acquire()
+        (True, True, False)
+        >>> bucket.wait_time()
+        59.99...
+    """
+
+    def __init__(self, rate: float, burst: float = 1):
+        if rate <= 0 or burst < 1:
+            raise ValueError(f"rate must be positive and burst >= 1, got {rate=}, {burst=}")
+        self.rate: float = rate
+        self.burst: float = burst
+        self.tokens: float = burst
+        self.updated: float = time.monotonic()
+        self.lock: threading.Lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now: float = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self, tokens: float = 1) -> bool:
+        """Take ``tokens`` if available.
+
+        Args:
+            tokens (float, optional) : The number of tokens. Defaults to ``1``.
+
+        Returns:
+            bool: Whether the tokens are taken.
+        """
+        with self.lock:
+            self._refill()
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                return True
+            return False
+
+    def wait_time(self, tokens: float = 1) -> float:
+        """Number of seconds until ``tokens`` become available."""
+        with self.lock:
+            self._refill()
+            return max(0.0, (tokens - self.tokens) / self.rate)
+
+    def acquire(self, tokens: float = 1, timeout: Optional[float] = None) -> bool:
+        """Wait until ``tokens`` are taken.
+
+        Args:
+            tokens (float, optional)            : The number of tokens. Defaults to ``1``.
+            timeout (Optional[float], optional) : Number of seconds to wait. Defaults to ``None``. (Wait forever)
+
+        Returns:
+            bool: Whether the tokens are taken before ``timeout``.
+        """
+        deadline: Optional[float] = None if timeout is None else time.monotonic() + timeout
+        while not self.try_acquire(tokens):
+            wait: float = self.wait_time(tokens)
+            if deadline is not None and time.monotonic() + wait > deadline:
+                return False
+            time.sleep(wait)
+        return True
+
+
+def backoff_delay(
+    attempt: int, initial: float = 30.0, factor: float = 2.0, maximum: float = 900.0
+) -> float:
+    """Number of seconds to wait before the ``attempt`` th retry. (``initial * factor ** (attempt - 1)``, up to ``maximum``)
+
+    Args:
+        attempt (int)             : The number of the retry. (Starting from ``1``)
+        initial (float, optional) : The delay of the first retry. Defaults to ``30.0``.
+        factor (float, optional)  : The factor of the delay for each retry. Defaults to ``2.0``.
+        maximum (float, optional) : The maximum delay. Defaults to ``900.0``.
+
+    Returns:
+        float: The delay.
+    """
+    return min(maximum, initial * factor ** max(0, attempt - 1))
@@ -0,0 +1,119 @@
+# coding: utf-8
+"""Cached schemas of forms (questions, input types and options of each page) recorded by ``crawl-form``, so that the answer json can be checked without browser, and each page is finished as soon as the expected questions are answered.
+
+.. code-block:: json
+
+    {
+        "version": 1,
+        "URL": "https://forms.office.com/Pages/ResponsePage.aspx?id=...",
+        "form": "office",
+        "key": "5f0c...",
+        "title": "UTokyo Health Management Report Form",
+        "fingerprint": "9a1e...",
+        "pages": [
+            {
+                "questions": [
+                    {"identifier": "1", "title": "...", "type": "radio", "options": ["[radio] Yes", "[radio] No"]}
+                ],
+                "next": {"by": "css selector", "identifier": ".section-next-button"}
+            }
+        ]
+    }
+
+``"key"`` is the key of the plan (See :class:`FormPlan <form_auto_fill_in.utils.plan_utils.FormPlan>`) crawled with, and ``"fingerprint"`` is the hash of the structure (identifiers, types and numbers of options) of each page, which changes when the form is modified. Each question has ``"identifier"``, ``"title"``, ``"type"`` and ``"options"`` (the same as the snapshots of :meth:`BaseForm.find_question_snapshots <form_auto_fill_in.forms.base.BaseForm.find_question_snapshots>`), and optionally ``"entries"``, ``"other"`` (whether the last option is "Other") and ``"required"``.
+"""
+import hashlib
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+from ._path import FORM_AUTO_FILL_IN_DIR
+from .generic_utils import load_data, save_data
+
+#: Bump it when the format changes so that the old schemas are not used.
+SCHEMA_VERSION: int = 1
+SCHEMAS_DIR: str = os.path.join(FORM_AUTO_FILL_IN_DIR, "schemas")
+
+
+def schema_path(url: str) -> str:
+    """Get the path of the cached schema of the form ``url``.
+
+    Args:
+        url (str) : Form URL.
+
+    Returns:
+        str: Path to the schema file.
+    """
+    return os.path.join(SCHEMAS_DIR, hashlib.sha256(url.encode("utf-8")).hexdigest() + ".json")
+
+
+def schema_fingerprint(pages: List[Dict[str, Any]]) -> str:
+    """Get the hash of the structure of ``pages``. Titles and option labels are not included, as they may be changed slightly (ex. whitespaces) without changing the form.
+
+    Args:
+        pages (List[Dict[str, Any]]) : Pages in the schema.
+
+    Returns:
+        str: The fingerprint.
+    """
+    structure: List[List[List[Any]]] = [
+        [[e["identifier"], e["type"], len(e["options"])] for e in page["questions"]]
+        for page in pages
+    ]
+    return hashlib.sha256(json.dumps(structure).encode("utf-8")).hexdigest()
+
+
+def load_schema(url: Optional[str] = None, path: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Load the cached schema of the form ``url`` (or at ``path``).
+
+    Args:
+        url (Optional[str], optional)  : Form URL. Defaults to ``None``.
+        path (Optional[str], optional) : Path to the schema file. Defaults to ``schema_path(url)``.
+
+    Returns:
+        Optional[Dict[str, Any]]: The schema, or ``None`` if it is not cached, broken, or of an old version.
+    """
+    try:
+        schema: Dict[str, Any] = load_data(path or schema_path(url))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(schema, dict) or schema.get("version") != SCHEMA_VERSION:
+        return None
+    return schema
+
+
+def save_schema(schema: Dict[str, Any], path: Optional[str] = None) -> str:
+    """Save ``schema`` with ``SCHEMA_VERSION`` and its fingerprint. (See :func:`schema_fingerprint`)
+
+    Args:
+        schema (Dict[str, Any])        : The schema. (``"URL"`` is required if ``path`` is not given.)
+        path (Optional[str], optional) : Path to the schema file. Defaults to ``schema_path(schema["URL"])``.
+
+    Returns:
+        str: Path to the schema file.
+    """
+    path = path or schema_path(schema["URL"])
+    save_data(
+        dict(schema, version=SCHEMA_VERSION, fingerprint=schema_fingerprint(schema["pages"])),
+        path,
+    )
+    return path
+
+
+def find_schema_question(
+    questions: List[Dict[str, Any]], identifier: str
+) -> Optional[Dict[str, Any]]:
+    """Find the question whose identifier (or entry identifier) is ``identifier``."""
+    for question in questions:
+        if question["identifier"] == identifier or identifier in question.get("entries", []):
+            return question
+    return None
+
+
+def as_numbers(val: Any) -> Optional[List[int]]:
+    """Convert ``val`` (ex. ``2``, ``"2"``, ``[1, "3"]``) into option numbers, or ``None`` if it isn't numbers."""
+    if not isinstance(val, (list, tuple)):
+        val = [val]
+    if not all([isinstance(e, int) or (isinstance(e, str) and e.isdigit()) for e in val]):
+        return None
+    return [int(e) for e in val if not isinstance(e, bool)]
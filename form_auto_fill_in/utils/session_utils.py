@@ -0,0 +1,118 @@
+# coding: utf-8
+"""Persist authenticated sessions (cookies and ``localStorage``) so that the login steps can be skipped."""
+from __future__ import annotations
+
+import hashlib
+import os
+from typing import TYPE_CHECKING, Any, Dict, List
+from urllib.parse import urlparse
+
+from ._path import FORM_AUTO_FILL_IN_DIR
+from .generic_utils import load_data, save_data, try_wrapper
+
+if TYPE_CHECKING:
+    from selenium.webdriver.remote.webdriver import WebDriver
+
+SESSIONS_DIR: str = os.path.join(FORM_AUTO_FILL_IN_DIR, "sessions")
+
+#: Keys of the cookie which are accepted by ``Network.setCookies``.
+COOKIE_PARAM_KEYS: List[str] = [
+    "name",
+    "value",
+    "domain",
+    "path",
+    "secure",
+    "httpOnly",
+    "sameSite",
+    "expires",
+]
+
+
+def session_path(url: str, account: str = "") -> str:
+    """Get the path of the session file for the form ``url`` and ``account``.
+
+    The file name is a hash of them, so that the account (ex. mail address) doesn't appear in it.
+
+    Args:
+        url (str)               : Form URL.
+        account (str, optional) : An identifier of the account. Defaults to ``""``.
+
+    Returns:
+        str: Path to the session file.
+
+    Examples:
+        >>> from form_auto_fill_in.utils.session_utils import session_path
+        >>> session_path(url="https://forms.office.com/Pages/ResponsePage.aspx", account="XXX@utac.u-tokyo.ac.jp")
+        '/Users/iwasakishuto/.FormAutoFillIn/sessions/1f6c....json'
+    """
+    key: str = f"{urlparse(url).netloc}\n{account}"
+    return os.path.join(SESSIONS_DIR, hashlib.sha256(key.encode("utf-8")).hexdigest() + ".json")
+
+
+def save_session(driver: WebDriver, path: str) -> None:
+    """Save cookies of all domains and ``localStorage`` of the current page.
+
+    Args:
+        driver (WebDriver) : Selenium WebDriver.
+        path (str)         : Path to the session file.
+    """
+    if hasattr(driver, "execute_cdp_cmd"):
+        cookies = driver.execute_cdp_cmd("Network.getAllCookies", {})["cookies"]
+    else:
+        cookies = driver.get_cookies()
+    session: Dict[str, Any] = {
+        "cookies": cookies,
+        "origin": driver.execute_script("return window.location.origin;"),
+        "localStorage": driver.execute_script("return Object.assign({}, window.localStorage);"),
+    }
+    save_data(session, path, mode=0o600)
+
+
+def restore_session(driver: WebDriver, path: str) -> bool:
+    """Restore cookies and ``localStorage`` saved by :func:`save_session`.
+
+    Call it after visiting the form, and reload the page to use the session.
+
+    Args:
+        driver (WebDriver) : Selenium WebDriver.
+        path (str)         : Path to the session file.
+
+    Returns:
+        bool: Whether the session is restored or not.
+    """
+    if not os.path.exists(path):
+        return False
+    session: Dict[str, Any] = load_data(path)
+    cookies: List[Dict[str, Any]] = [
+        {k: v for k, v in cookie.items() if k in COOKIE_PARAM_KEYS}
+        for cookie in session.get("cookies", [])
+    ]
+    if hasattr(driver, "execute_cdp_cmd"):
+        for cookie in cookies:
+            # Session cookies have "expires": -1.
+            if cookie.get("expires", -1) < 0:
+                cookie.pop("expires", None)
+        driver.execute_cdp_cmd("Network.setCookies", {"cookies": cookies})
+    else:
+        # Without CDP, only the cookies of the current domain can be restored.
+        host: str = urlparse(driver.current_url).hostname or ""
+        for cookie in cookies:
+            if host.endswith(cookie.get("domain", "").lstrip(".")):
+                try_wrapper(driver.add_cookie, cookie, verbose_=False)
+    if driver.execute_script("return window.location.origin;") == session.get("origin"):
+        driver.execute_script(
+            "var items = arguments[0];"
+            "Object.keys(items).forEach(function (k) { window.localStorage.setItem(k, items[k]); });",
+            session.get("localStorage", {}),
+        )
+    return True
+
+
+def delete_session(path: str) -> None:
+    """Delete the session file (ex. when the session has expired).
+
+    Args:
+        path (str) : Path to the session file.
+    """
+    if os.path.exists(path):
+        os.remove(path)
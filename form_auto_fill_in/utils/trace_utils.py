@@ -0,0 +1,169 @@
+# coding: utf-8
+"""A lightweight span tracer to see where the time of a run is spent.
+
+Spans are recorded only while the tracer is enabled, and can be exported as the `Trace Event Format <https://docs.google.com/document/d/1CvAClvFfyA5R-PhYUmn5OOQtYMH4h6I0nSsKchNAySU>`_ (open it with ``chrome://tracing`` or `Perfetto <https://ui.perfetto.dev>`_) or printed as a summary table.
+
+.. code-block:: python
+
+    >>> from form_auto_fill_in.utils.trace_utils import TRACER, span
+    >>> TRACER.enable()
+    >>> with span("login"):
+    ...     with span("login.step", func="click"):
+    ...         pass
+    >>> TRACER.print_summary()
+    >>> TRACER.export("trace.json")
+"""
+import functools
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from ._colorings import toACCENT
+from .generic_utils import save_data
+
+
+class Tracer:
+    """Record nested spans per thread.
+
+    Args:
+        enabled (bool, optional) : Whether to record spans. Defaults to ``False``.
+
+    Attributes:
+        events (List[Dict[str, Any]]) : Recorded spans as complete events (``"ph": "X"``) of the Trace Event Format. Timestamps are in microseconds since the epoch, so events of several processes can be merged.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled: bool = enabled
+        self.events: List[Dict[str, Any]] = []
+        self._lock: threading.Lock = threading.Lock()
+        self._local: threading.local = threading.local()
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def clear(self) -> None:
+        with self._lock:
+            self.events = []
+
+    def extend(self, events: List[Dict[str, Any]]) -> None:
+        """Add events recorded elsewhere (ex. in worker processes)."""
+        with self._lock:
+            self.events.extend(events)
+
+    @contextmanager
+    def span(self, name: str, **args) -> Iterator[None]:
+        """Record the time spent in the ``with`` block as a span named ``name``.
+
+        Args:
+            name (str) : The name of the span. Spans with the same name and parents are aggregated in :meth:`summary`, so put the details (ex. indices) into ``args``.
+            args       : Details of the span shown in the trace viewer.
+        """
+        if not self.enabled:
+            yield
+            return
+        stack: List[str] = self._local.__dict__.setdefault("stack", [])
+        stack.append(name)
+        path: str = "/".join(stack)
+        ts: int = time.time_ns() // 1000
+        start: float = time.perf_counter()
+        try:
+            yield
+        finally:
+            dur: float = (time.perf_counter() - start) * 1e6
+            stack.pop()
+            event: Dict[str, Any] = {
+                "name": name,
+                "cat": path,
+                "ph": "X",
+                "ts": ts,
+                "dur": dur,
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+                "args": {k: str(v) for k, v in args.items()},
+            }
+            with self._lock:
+                self.events.append(event)
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Aggregate the spans by their names and parents.
+
+        Returns:
+            List[Dict[str, Any]]: Rows with ``"path"`` (``"/"``-joined names of the span and its parents), ``"depth"``, ``"count"``, ``"total"``, ``"mean"`` and ``"max"`` (in seconds), and ``"ratio"`` (to the total of the root spans). Rows are in the order they first started.
+        """
+        rows: Dict[str, Dict[str, Any]] = {}
+        for event in sorted(self.events, key=lambda e: e["ts"]):
+            path: str = event["cat"]
+            row = rows.setdefault(
+                path,
+                {"path": path, "depth": path.count("/"), "count": 0, "total": 0.0, "max": 0.0},
+            )
+            row["count"] += 1
+            row["total"] += event["dur"] / 1e6
+            row["max"] = max(row["max"], event["dur"] / 1e6)
+        root_total: float = sum([r["total"] for r in rows.values() if r["depth"] == 0]) or 1.0
+        for row in rows.values():
+            row["mean"] = row["total"] / row["count"]
+            row["ratio"] = row["total"] / root_total
+        return list(rows.values())
+
+    def print_summary(self) -> None:
+        """Print :meth:`summary` as a table. Child spans are indented under their parents."""
+        rows = self.summary()
+        width: int = max([len(r["path"].split("/")[-1]) + 2 * r["depth"] for r in rows] + [4])
+        print(
+            toACCENT(
+                f"{'span':<{width}} {'count':>6} {'total[s]':>9} {'mean[s]':>9} {'max[s]':>9} {'ratio':>6}"
+            )
+        )
+        for row in rows:
+            name: str = "  " * row["depth"] + row["path"].split("/")[-1]
+            print(
+                f"{name:<{width}} {row['count']:>6} {row['total']:>9.3f} {row['mean']:>9.3f} {row['max']:>9.3f} {row['ratio']:>6.1%}"
+            )
+
+    def export(self, path: str) -> None:
+        """Export the spans as Trace Event Format json.
+
+        Args:
+            path (str) : Path to the json file.
+        """
+        save_data({"traceEvents": self.events, "displayTimeUnit": "ms"}, path)
+
+
+#: The tracer shared in the process.
+TRACER: Tracer = Tracer()
+
+
+def span(name: str, **args):
+    """Shortcut of ``TRACER.span``. (See :meth:`Tracer.span`)"""
+    return TRACER.span(name, **args)
+
+
+def traced(
+    name: Optional[str] = None, arg_keys: Tuple[str, ...] = ("by", "identifier")
+) -> Callable[[Callable], Callable]:
+    """Decorate a function to record each call as a span.
+
+    Args:
+        name (Optional[str], optional)     : The name of the span. Defaults to the name of the function.
+        arg_keys (Tuple[str, ...], optional) : Keyword arguments of the call to put into the span. Defaults to ``("by", "identifier")``.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not TRACER.enabled:
+                return func(*args, **kwargs)
+            with TRACER.span(
+                name or func.__name__, **{k: kwargs[k] for k in arg_keys if k in kwargs}
+            ):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
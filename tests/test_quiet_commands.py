@@ -0,0 +1,101 @@
+# coding: utf-8
+import collections
+
+import pytest
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.remote.webelement import WebElement
+
+from form_auto_fill_in.forms.google import GoogleForm
+from form_auto_fill_in.utils import checkpoint_utils, schema_utils
+from form_auto_fill_in.utils.generic_utils import save_data
+from form_auto_fill_in.utils.plan_utils import load_plan
+
+#: Commands sent only to build messages. (Label texts, the form title and the question titles.)
+MESSAGE_COMMANDS = [
+    Command.GET_ELEMENT_TEXT,
+    Command.GET_ELEMENT_ATTRIBUTE,
+    Command.FIND_ELEMENT,
+    Command.FIND_CHILD_ELEMENT,
+]
+NUM_LABELS = 3
+
+
+class StubDriver(WebDriver):
+    """A ``WebDriver`` which counts the commands, and answers them as a form with a checkbox question."""
+
+    def __init__(self):
+        self.w3c = False
+        self.session_id = "stub"
+        self.commands = collections.Counter()
+        self.question = WebElement(self, "question")
+        self.labels = [WebElement(self, f"label-{i}") for i in range(NUM_LABELS)]
+
+    def execute(self, driver_command, params=None):
+        self.commands[driver_command] += 1
+        params = params or {}
+        value = None
+        if driver_command == Command.EXECUTE_ASYNC_SCRIPT:
+            # The DOM has settled.
+            value = True
+        elif driver_command == Command.EXECUTE_SCRIPT:
+            if params["script"] == GoogleForm.snapshot_script:
+                value = [
+                    {
+                        "element": self.question,
+                        "identifier": "1",
+                        "title": None,
+                        "type": "checkbox",
+                        "options": [],
+                    }
+                ]
+        elif driver_command == Command.FIND_CHILD_ELEMENTS:
+            value = self.labels if params["value"] == "label" else []
+        elif driver_command in [Command.FIND_ELEMENT, Command.FIND_CHILD_ELEMENT]:
+            value = WebElement(self, "title")
+        elif driver_command == Command.GET_ELEMENT_TEXT:
+            value = "text"
+        elif driver_command == Command.GET_ELEMENT_ATTRIBUTE:
+            value = '%.@.[1,"title"'
+        return {"value": value}
+
+    def count_messages(self) -> int:
+        return sum([self.commands[command] for command in MESSAGE_COMMANDS])
+
+
+@pytest.fixture
+def form_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(checkpoint_utils, "CHECKPOINTS_DIR", str(tmp_path / "checkpoints"))
+    monkeypatch.setattr(schema_utils, "SCHEMAS_DIR", str(tmp_path / "schemas"))
+    path = str(tmp_path / "form.json")
+    save_data(
+        {
+            "form": "google",
+            "URL": "https://docs.google.com/forms/d/e/stub/viewform",
+            "answer": [{"1": {"val": [1, 3]}}],
+        },
+        path,
+    )
+    return path
+
+
+@pytest.mark.parametrize("verbose", [True, False])
+def test_check_labels(form_path, verbose):
+    driver = StubDriver()
+    model = GoogleForm(path=form_path, verbose=verbose, plan=load_plan(form_path, cache=False))
+    model.check_labels(labels=driver.labels, checks=[1, "3"])
+    assert driver.commands[Command.CLICK_ELEMENT] == 2
+    assert driver.commands[Command.GET_ELEMENT_TEXT] == (NUM_LABELS if verbose else 0)
+
+
+@pytest.mark.parametrize("verbose", [True, False])
+def test_answer_form(form_path, verbose, capsys):
+    driver = StubDriver()
+    model = GoogleForm(path=form_path, verbose=verbose, plan=load_plan(form_path, cache=False))
+    model.answer_form(driver=driver)
+    assert driver.commands[Command.CLICK_ELEMENT] == 2
+    if verbose:
+        assert driver.count_messages() > 0
+    else:
+        assert driver.count_messages() == 0
+        assert capsys.readouterr().out == ""
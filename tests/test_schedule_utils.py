@@ -0,0 +1,150 @@
+# coding: utf-8
+import datetime
+
+import pytest
+
+from form_auto_fill_in.utils import schedule_utils
+from form_auto_fill_in.utils.schedule_utils import (
+    CronSchedule,
+    TokenBucket,
+    backoff_delay,
+    parse_cron_field,
+)
+
+
+@pytest.mark.parametrize(
+    "field, name, minimum, maximum, expected",
+    [
+        ("*", "hour", 0, 23, set(range(24))),
+        ("*/15", "minute", 0, 59, {0, 15, 30, 45}),
+        ("1-5", "weekday", 0, 7, {1, 2, 3, 4, 5}),
+        ("1-10/3", "day", 1, 31, {1, 4, 7, 10}),
+        ("20/5", "minute", 0, 59, {20, 25, 30, 35, 40, 45, 50, 55}),
+        ("mon,wed,FRI", "weekday", 0, 7, {1, 3, 5}),
+        ("jan-mar", "month", 1, 12, {1, 2, 3}),
+        ("3,3,1", "hour", 0, 23, {1, 3}),
+    ],
+)
+def test_parse_cron_field(field, name, minimum, maximum, expected):
+    assert parse_cron_field(field, name, minimum, maximum) == expected
+
+
+@pytest.mark.parametrize(
+    "field, name, minimum, maximum",
+    [
+        ("5-1", "weekday", 0, 7),
+        ("fri-mon", "weekday", 0, 7),
+        ("60", "minute", 0, 59),
+        ("0", "day", 1, 31),
+        ("*/0", "minute", 0, 59),
+        ("abc", "hour", 0, 23),
+        ("", "hour", 0, 23),
+    ],
+)
+def test_parse_cron_field_invalid(field, name, minimum, maximum):
+    with pytest.raises(ValueError):
+        parse_cron_field(field, name, minimum, maximum)
+
+
+@pytest.mark.parametrize(
+    "expression",
+    ["0 0 * *", "0 0 * * * *", "0 0 5-1 * *", "0 0 * * 5-1", "@never"],
+)
+def test_cron_schedule_invalid(expression):
+    with pytest.raises(ValueError):
+        CronSchedule(expression)
+
+
+@pytest.mark.parametrize(
+    "expression, after, expected",
+    [
+        ("30 8 * * mon-fri", (2021, 6, 5, 12, 0), (2021, 6, 7, 8, 30)),
+        ("@daily", (2021, 6, 5, 12, 0), (2021, 6, 6, 0, 0)),
+        ("@hourly", (2021, 6, 5, 12, 0), (2021, 6, 5, 13, 0)),
+        ("*/20 * * * *", (2021, 6, 5, 12, 45), (2021, 6, 5, 13, 0)),
+        ("0 0 1 1 *", (2021, 6, 5, 12, 0), (2022, 1, 1, 0, 0)),
+        # 7 is also Sunday.
+        ("0 0 * * 7", (2021, 6, 5, 12, 0), (2021, 6, 6, 0, 0)),
+        # Both the day and the weekday are restricted, so either of them matches.
+        ("0 0 13 * fri", (2021, 6, 5, 12, 0), (2021, 6, 11, 0, 0)),
+        # A field starting with "*" is not restricted, so both of them must match.
+        ("0 0 */2 * mon", (2021, 6, 8, 12, 0), (2021, 6, 21, 0, 0)),
+        ("0 0 13 * */1", (2021, 6, 5, 12, 0), (2021, 6, 13, 0, 0)),
+    ],
+)
+def test_cron_schedule_next_after(expression, after, expected):
+    schedule = CronSchedule(expression)
+    assert schedule.next_after(datetime.datetime(*after)) == datetime.datetime(*expected)
+
+
+def test_cron_schedule_odd_day_mondays():
+    schedule = CronSchedule("0 0 */2 * mon")
+    t = datetime.datetime(2021, 1, 1)
+    for _ in range(20):
+        t = schedule.next_after(t)
+        assert t.weekday() == 0 and t.day % 2 == 1
+
+
+def test_cron_schedule_no_match():
+    with pytest.raises(ValueError):
+        CronSchedule("0 0 31 2 *").next_after(datetime.datetime(2021, 1, 1))
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(schedule_utils.time, "monotonic", fake)
+    monkeypatch.setattr(
+        schedule_utils.time, "sleep", lambda secs: setattr(fake, "now", fake.now + secs)
+    )
+    return fake
+
+
+def test_token_bucket_burst_and_refill(clock):
+    bucket = TokenBucket(rate=1 / 60, burst=2)
+    assert [bucket.try_acquire() for _ in range(3)] == [True, True, False]
+    assert bucket.wait_time() == pytest.approx(60.0)
+    clock.now += 30
+    assert not bucket.try_acquire()
+    assert bucket.wait_time() == pytest.approx(30.0)
+    clock.now += 30
+    assert bucket.try_acquire()
+    # Tokens never exceed the burst.
+    clock.now += 3600
+    assert [bucket.try_acquire() for _ in range(3)] == [True, True, False]
+
+
+def test_token_bucket_acquire(clock):
+    bucket = TokenBucket(rate=1, burst=1)
+    assert bucket.acquire()
+    assert not bucket.acquire(timeout=0.5)
+    assert bucket.acquire(timeout=2)
+    assert clock.now == pytest.approx(1001.0)
+
+
+@pytest.mark.parametrize("rate, burst", [(0, 1), (-1, 1), (1, 0.5)])
+def test_token_bucket_invalid(rate, burst):
+    with pytest.raises(ValueError):
+        TokenBucket(rate=rate, burst=burst)
+
+
+@pytest.mark.parametrize(
+    "attempt, expected",
+    [(0, 30.0), (1, 30.0), (2, 60.0), (3, 120.0), (5, 480.0), (6, 900.0), (100, 900.0)],
+)
+def test_backoff_delay(attempt, expected):
+    assert backoff_delay(attempt) == expected
+
+
+def test_backoff_delay_options():
+    assert backoff_delay(3, initial=1, factor=3, maximum=100) == 9
+    assert backoff_delay(10, initial=1, factor=3, maximum=100) == 100
+    assert backoff_delay(4, initial=5, factor=1) == 5